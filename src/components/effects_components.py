@@ -5,28 +5,61 @@ This module defines components related to visual effects, such as particles,
 for the game's ECS architecture.
 
 Classes:
-    ParticleComponent: Represents a single particle with lifetime, velocity, and color.
+    ParticlePool: Fixed-capacity NumPy storage for every live particle.
+    TrailComponent: Ring buffer of an entity's recent positions, used to draw its motion trail.
 """
 
-import pygame
+import numpy as np
 
-class ParticleComponent:
+class ParticlePool:
     """
-    A component representing a single particle in the effects system.
+    Fixed-capacity, structure-of-arrays storage for particles.
+
+    Live particles are packed in the first `count` rows of every array, so systems
+    can integrate and cull all of them with vectorized NumPy operations instead of
+    one ECS entity per particle.
+
+    Attributes:
+        capacity (int): Maximum number of live particles.
+        count (int): Number of live particles.
+        position (np.ndarray): (capacity, 2) float32 positions in pixels.
+        velocity (np.ndarray): (capacity, 2) float32 velocities in pixels per second.
+        age (np.ndarray): (capacity,) float32 time alive, in seconds.
+        lifetime (np.ndarray): (capacity,) float32 lifetime, in seconds.
+        color (np.ndarray): (capacity,) uint8 index into the particle palette.
+
+    Args:
+        capacity (int): Maximum number of live particles.
+    """
+    def __init__(self, capacity=16384):
+        self.capacity = capacity
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+
+class TrailComponent:
+    """
+    Fixed-size ring buffer of an entity's recent positions, used to draw its motion trail.
+
+    The buffers are allocated once; recording a position overwrites the oldest slot,
+    so nothing is allocated per frame.
 
     Attributes:
-        born_time (int): The time when the particle was created (in milliseconds).
-        lifetime (int): The duration of the particle's life in milliseconds.
-        velocity (tuple): The initial velocity of the particle (dx, dy).
-        color (tuple): The RGB color of the particle.
+        length (int): Number of positions kept.
+        xs (list): X coordinates, indexed as a ring.
+        ys (list): Y coordinates, indexed as a ring.
+        head (int): Slot the next position is written to.
+        count (int): Number of valid positions (up to length).
 
     Args:
-        lifetime_ms (int): Lifetime of the particle in milliseconds.
-        initial_velocity (tuple): Initial velocity (dx, dy).
-        color (tuple): RGB color of the particle.
+        length (int): Number of positions kept.
     """
-    def __init__(self, lifetime_ms, initial_velocity, color):
-        self.born_time = pygame.time.get_ticks()
-        self.lifetime = lifetime_ms
-        self.velocity = initial_velocity
-        self.color = color
\ No newline at end of file
+    def __init__(self, length=8):
+        self.length = length
+        self.xs = [0.0] * length
+        self.ys = [0.0] * length
+        self.head = 0
+        self.count = 0
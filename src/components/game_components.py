@@ -9,7 +9,17 @@ Classes:
     BallComponent: Marks an entity as the ball.
     ScoreComponent: Stores the score for a player.
     AIControlledComponent: Marks an entity as AI-controlled.
+    ColliderComponent: Puts an entity in the collision broadphase, with a layer and a mask.
+
+Constants:
+    COLLIDE_BALL, COLLIDE_PADDLE, COLLIDE_POWERUP (int): Collision layer bits.
 """
+
+# Capas de colisión (bits): una entidad pertenece a una capa y su máscara dice con cuáles choca
+COLLIDE_BALL = 1
+COLLIDE_PADDLE = 2
+COLLIDE_POWERUP = 4
+
 class VelocityComponent:
     """
     Stores the velocity of an entity in pixels per second.
@@ -34,9 +44,13 @@ class PaddleComponent:
 
 class BallComponent:
     """
-    Marks an entity as the ball.
+    Marks an entity as a ball.
+
+    Attributes:
+        last_paddle_hit: Entity ID of the last paddle that hit this ball, or None.
     """
-    pass
+    def __init__(self):
+        self.last_paddle_hit = None
 
 class ScoreComponent:
     """
@@ -55,3 +69,15 @@ class AIControlledComponent:
     Marks an entity as controlled by AI.
     """
     pass
+
+class ColliderComponent:
+    """
+    Puts an entity (with position and dimensions) in the collision broadphase.
+
+    Attributes:
+        layer (int): Collision layer bit of the entity (COLLIDE_*).
+        mask (int): Bits of the layers it collides with.
+    """
+    def __init__(self, layer, mask):
+        self.layer = layer
+        self.mask = mask
@@ -8,14 +8,44 @@ Classes:
 """
 
 import pygame
+from utils.utils import SCREEN_WIDTH, SCREEN_HEIGHT
 
 class ConfigManager:
     """
     Stores and manages all game configuration options.
-    Currently, it handles player control key bindings.
+    It handles player control key bindings and graphics options.
 
     Attributes:
         controls (dict): Dictionary containing key bindings for player actions.
+        key_map (dict): Bindings compiled for lookups by key: {key: ((player number, action), ...)}.
+            A key bound to several actions keeps all of them.
+            Rebuilt by set_key; read by engine.input_sources.KeyboardInputSource.
+        gamepad (dict): Gamepad options (see engine.input_sources.GamepadInputSource):
+            'enabled' (bool): Let connected gamepads move the paddles (the n-th one drives player n).
+            'axis' (int): Index of the vertical stick axis.
+            'deadzone' (float): Stick values below this are ignored.
+        graphics (dict): Rendering options:
+            'dirty_rects' (bool): Only clear and present the areas that changed during gameplay.
+            'internal_resolution' (tuple): Resolution the game is drawn at.
+            'window_size' (tuple): Window size, or None to match the internal resolution.
+            'scale_mode' (str): 'scaled' (SDL, pygame.SCALED) or 'software' (pygame.transform.scale).
+            'fullscreen', 'doublebuf', 'vsync' (bool): Display flags passed to set_mode.
+        capture (dict): Gameplay recording options (see engine.frame_recorder):
+            'enabled' (bool): Start recording when the game starts.
+            'toggle_key' (int): Key that starts and stops a recording.
+            'output_dir' (str): Directory recordings are written to, one subdirectory each.
+            'format' (str): 'png' (image sequence) or 'raw' (RGB24 frames plus a JSON header).
+            'max_queue' (int): Frames that may wait for the encoder before new ones are dropped.
+            'every' (int): Record one frame out of this many.
+        ai (dict): Computer opponent options:
+            'difficulty' (str): Preset of utils.AI_DIFFICULTY ('easy', 'normal', 'hard', 'expert' or 'master').
+        input (dict): Input timing options:
+            'late_sampling' (bool): Read the event queue after the frame limiter's sleep instead of before it,
+                so the frame simulates input up to one frame newer.
+            'measure_latency' (bool): Time each input event to the flip that shows it (see engine.latency_probe).
+        debug (dict): Diagnostics (see engine.alloc_counter):
+            'allocations' (bool): Count the memory blocks each gameplay frame leaves allocated.
+            'trace_allocations' (bool): Also record temporary peaks and allocation sites with tracemalloc (slow).
 
     Methods:
         get_p1_key(action: str) -> int:
@@ -25,7 +55,7 @@ class ConfigManager:
             Returns the key binding for a given action of Player 2.
 
         set_key(player: str, action: str, new_key: int):
-            Updates the key binding for a specific player and action.
+            Updates the key binding for a specific player and action and recompiles key_map.
     """
     def __init__(self):
         # Valores por defecto de las teclas
@@ -39,8 +69,51 @@ class ConfigManager:
                 'down': pygame.K_DOWN
             }
         }
+        self.key_map = {}
+        self._compile_key_map()
+        self.gamepad = {
+            'enabled': True,
+            'axis': 1,
+            'deadzone': 0.3
+        }
+        self.graphics = {
+            'dirty_rects': False,
+            'internal_resolution': (SCREEN_WIDTH, SCREEN_HEIGHT),
+            'window_size': None,
+            'scale_mode': 'scaled',
+            'fullscreen': False,
+            'doublebuf': False,
+            'vsync': False
+        }
+        self.capture = {
+            'enabled': False,
+            'toggle_key': pygame.K_F9,
+            'output_dir': 'captures',
+            'format': 'png',
+            'max_queue': 8,
+            'every': 1
+        }
+        self.ai = {
+            'difficulty': 'normal'
+        }
+        self.input = {
+            'late_sampling': False,
+            'measure_latency': False
+        }
+        self.debug = {
+            'allocations': False,
+            'trace_allocations': False
+        }
         print("ConfigManager inicializado con controles por defecto.")
 
+    def _compile_key_map(self):
+        # 'player1' -> 1: la entrada no vuelve a buscar por nombre de jugador ni de acción
+        key_map = {}
+        for player, actions in self.controls.items():
+            for action, key in actions.items():
+                key_map[key] = key_map.get(key, ()) + ((int(player[len('player'):]), action),)
+        self.key_map = key_map
+
     def get_p1_key(self, action: str) -> int:
         """Returns the key binding for a given action of Player 1."""
         return self.controls['player1'].get(action)
@@ -51,7 +124,8 @@ class ConfigManager:
 
     def set_key(self, player: str, action: str, new_key: int):
         """
-        Updates the key binding for a specific player and action.
+        Updates the key binding for a specific player and action. key_map is rebuilt,
+        so the new key works from the next key event.
 
         Args:
             player (str): The player identifier ('player1' or 'player2').
@@ -63,4 +137,5 @@ class ConfigManager:
         """
         if player in self.controls and action in self.controls[player]:
             self.controls[player][action] = new_key
+            self._compile_key_map()
             print(f"Tecla para {player} '{action}' cambiada a {pygame.key.name(new_key)}")
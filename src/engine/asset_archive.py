@@ -0,0 +1,195 @@
+"""
+asset_archive.py
+----------------
+Single-file, indexed archive of the game assets, read through a memory map.
+
+Layout: an 8-byte magic, the offset and size of the index (two little-endian uint64),
+the raw file contents one after another, and a JSON index mapping each file's path
+(relative to the assets directory, with '/' separators) to its [offset, size, mtime_ns],
+the modification time of the loose file when it was packed.
+
+Classes:
+    AssetArchive: Memory-maps an archive and hands out zero-copy views of its entries.
+    ArchiveReader: Read-only file object over an entry, for decoders that expect a file.
+
+Functions:
+    pack_assets(root, output, extensions): Writes every asset under root into an archive.
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b'PONGPAK1'
+_HEADER = struct.Struct('<8sQQ')
+_ALIGNMENT = 16
+
+def pack_assets(root, output, extensions=('.png', '.jpg', '.ttf')):
+    """
+    Writes every asset under root into a single archive file.
+
+    Args:
+        root (str): Assets directory.
+        output (str): Path of the archive to write.
+        extensions (tuple): File extensions to include (compared case-insensitively).
+
+    Returns:
+        dict: The written index, name -> [offset, size, mtime_ns].
+    """
+    names = []
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            if filename.lower().endswith(extensions):
+                names.append(os.path.relpath(os.path.join(directory, filename), root).replace(os.sep, '/'))
+    index = {}
+    with open(output, 'wb') as archive:
+        archive.write(_HEADER.pack(MAGIC, 0, 0))
+        for name in sorted(names):
+            # Alinear cada entrada para que las vistas empiecen en un límite cómodo
+            archive.write(b'\0' * (-archive.tell() % _ALIGNMENT))
+            with open(os.path.join(root, name), 'rb') as source:
+                data = source.read()
+                mtime = os.fstat(source.fileno()).st_mtime_ns
+            index[name] = [archive.tell(), len(data), mtime]
+            archive.write(data)
+        index_offset = archive.tell()
+        encoded = json.dumps(index).encode('utf-8')
+        archive.write(encoded)
+        archive.seek(0)
+        archive.write(_HEADER.pack(MAGIC, index_offset, len(encoded)))
+    return index
+
+class ArchiveReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a memoryview, so decoders that expect a file
+    (pygame.image.load, pygame.font.Font) read straight from the memory map.
+
+    Args:
+        view (memoryview): Bytes of the entry.
+    """
+    def __init__(self, view):
+        self._view = view
+        self._pos = 0
+
+    def readable(self): return True
+    def seekable(self): return True
+    def tell(self): return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR: offset += self._pos
+        elif whence == io.SEEK_END: offset += len(self._view)
+        self._pos = max(0, min(offset, len(self._view)))
+        return self._pos
+
+    def readinto(self, buffer):
+        n = min(len(buffer), len(self._view) - self._pos)
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+class AssetArchive:
+    """
+    Memory-mapped asset archive. Opening it only reads the index; entries are paged in
+    by the OS when a decoder reads them.
+
+    The archive is a build product that is not versioned, so it can be older than the
+    assets. open() checks each entry against its loose file: if the file was modified
+    after packing (a newer mtime or a different size), the loose file is used and a
+    warning suggests running tools.pack_assets again.
+
+    Attributes:
+        path (str): Path of the archive file.
+        root (str): Assets directory the entry names are relative to.
+        index (dict): Maps entry names to [offset, size, mtime_ns].
+        stale (set): Entries skipped because their loose file is newer.
+
+    Methods:
+        view(name) -> memoryview:
+            Returns a zero-copy view of an entry.
+
+        open(path) -> ArchiveReader:
+            Returns a file object for the entry of an asset path, or None if it is not
+            packed or its packed copy is stale.
+
+        close():
+            Unmaps the archive; every view handed out must have been released.
+
+    Raises:
+        ValueError: If the file is not an asset archive.
+    """
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        with open(path, 'rb') as archive:
+            self._map = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an asset archive")
+        self.index = json.loads(self._map[index_offset:index_offset + index_size])
+        self.stale = set()
+        self._view = memoryview(self._map)
+
+    @classmethod
+    def open_if_exists(cls, path, root):
+        """
+        Opens the archive if the file exists.
+
+        Returns:
+            AssetArchive or None: None when the assets have not been packed.
+        """
+        return cls(path, root) if os.path.exists(path) else None
+
+    def name_for(self, path):
+        """Returns the entry name of an asset path (relative to root, '/' separators)."""
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def view(self, name):
+        """
+        Returns a zero-copy view of an entry.
+
+        Args:
+            name (str): Entry name, relative to the assets directory.
+
+        Raises:
+            KeyError: If the entry is not in the archive.
+        """
+        offset, size = self.index[name][:2]
+        return self._view[offset:offset + size]
+
+    def _is_stale(self, path, entry):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False  # sin archivo suelto, la copia empaquetada es la única
+        # Los archivos empaquetados por versiones anteriores no guardan la fecha: solo se compara el tamaño
+        return stat.st_size != entry[1] or (len(entry) > 2 and stat.st_mtime_ns > entry[2])
+
+    def open(self, path):
+        """
+        Returns a file object reading the packed copy of an asset.
+
+        Args:
+            path (str): Path of the asset in the assets directory.
+
+        Returns:
+            ArchiveReader or None: None if the asset is not in the archive, or if its loose
+                file changed after the archive was built.
+        """
+        name = self.name_for(path) if path else None
+        entry = self.index.get(name)
+        if entry is None: return None
+        if self._is_stale(path, entry):
+            if name not in self.stale:
+                self.stale.add(name)
+                print(f"AssetArchive: {name} ha cambiado desde que se empaquetó {self.path}; se usa el archivo suelto "
+                      f"(vuelve a ejecutar tools.pack_assets)")
+            return None
+        return ArchiveReader(self.view(name))
+
+    def close(self):
+        """Unmaps the archive; every view handed out must have been released."""
+        self._view.release()
+        self._map.close()
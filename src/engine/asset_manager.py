@@ -0,0 +1,207 @@
+"""
+asset_manager.py
+----------------
+Central cache for images and fonts, loaded once and shared by every scene and system.
+
+Classes:
+    AssetManager: Loads, converts and reference-counts assets; decodes images on a thread pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from engine.text_cache import get_font
+
+class AssetManager:
+    """
+    Loads images and fonts once and shares them by key.
+
+    Images are decoded from disk on a thread pool (pygame releases the GIL while it decodes)
+    and converted to the display format on the main thread, with convert_alpha() or convert(),
+    so every later blit is a straight copy. Fonts are opened on the main thread through the
+    shared font cache of engine.text_cache, since they are cheap to open. Images loaded
+    with the trim option also have their flat background made transparent and cropped
+    away in the worker, so that cost never lands on a frame.
+
+    If an AssetArchive is given, assets packed in it are decoded from its memory map
+    instead of opening the loose files; assets missing from the archive still load from disk.
+
+    Every asset is reference counted: preload() and acquire() take a reference, release()
+    drops one, and an asset whose count reaches zero is unloaded.
+
+    Attributes:
+        archive (AssetArchive): Packed assets, or None to always read the loose files.
+        pending (dict): Maps keys still being decoded to their futures.
+        total_requested (int): Number of assets requested through preload() since the last reset.
+
+    Methods:
+        preload(manifest):
+            Starts decoding the assets of a manifest in the background.
+
+        poll() -> float:
+            Converts the assets that finished decoding and returns the loading progress.
+
+        load(key, kind, path, **options):
+            Loads an asset synchronously (if not loaded yet) and takes a reference to it.
+
+        get(key):
+            Returns a loaded asset without changing its reference count.
+
+        acquire(key) / release(key):
+            Takes or drops a reference to a loaded asset.
+
+        shutdown():
+            Stops the worker threads.
+    """
+    def __init__(self, max_workers=4, archive=None):
+        self.archive = archive
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='assets')
+        self._assets = {}
+        self._refcounts = {}
+        self._options = {}
+        self.pending = {}
+        self.total_requested = 0
+
+    def preload(self, manifest):
+        """
+        Starts loading the assets of a manifest. Images are decoded on the thread pool and
+        become available once poll() has converted them; fonts are opened right away.
+        Each asset gets one reference, even if it was already loaded.
+
+        Args:
+            manifest (dict): Maps keys to (kind, path, options) tuples, where kind is 'image'
+                or 'font' (see ASSET_MANIFEST in utils.utils).
+        """
+        for key, (kind, path, options) in manifest.items():
+            self.total_requested += 1
+            if key in self._assets or key in self.pending:
+                self._refcounts[key] += 1
+                continue
+            self._refcounts[key] = 1
+            self._options[key] = (kind, path, options)
+            if kind == 'image': self.pending[key] = self._executor.submit(self._decode, path, options.get('trim', False))
+            else: self._assets[key] = self._finish(kind, path, options, None)
+
+    def poll(self):
+        """
+        Converts the images that finished decoding to the display format. Called once per
+        frame by the loading scene; conversion has to happen on the main thread.
+
+        Returns:
+            float: Fraction of the requested assets that are ready (1.0 when nothing is pending).
+        """
+        for key in [key for key, future in self.pending.items() if future.done()]:
+            kind, path, options = self._options[key]
+            self._assets[key] = self._finish(kind, path, options, self.pending.pop(key).result())
+        if not self.total_requested: return 1.0
+        if not self.pending: self.total_requested = 0; return 1.0
+        return 1.0 - len(self.pending) / self.total_requested
+
+    def load(self, key, kind, path, **options):
+        """
+        Loads an asset synchronously if it is not loaded yet, and takes a reference to it.
+
+        Args:
+            key (str): Key the asset is stored under.
+            kind (str): 'image' or 'font'.
+            path (str): File to load (None for pygame's default font).
+            **options: alpha (bool) and trim (bool) for images, size (int) for fonts.
+
+        Returns:
+            The loaded pygame.Surface or pygame.font.Font.
+        """
+        if key in self.pending:
+            self._assets[key] = self._finish(kind, path, options, self.pending.pop(key).result())
+        if key in self._assets:
+            self._refcounts[key] += 1
+            return self._assets[key]
+        self._options[key] = (kind, path, options)
+        self._refcounts[key] = 1
+        decoded = self._decode(path, options.get('trim', False)) if kind == 'image' else None
+        self._assets[key] = self._finish(kind, path, options, decoded)
+        return self._assets[key]
+
+    def _source(self, path):
+        """Returns a reader over the packed copy of an asset, or None to use the file."""
+        return self.archive.open(path) if self.archive else None
+
+    def _decode(self, path, trim=False):
+        """Decodes an image, from the archive when it is packed there."""
+        source = self._source(path)
+        image = pygame.image.load(source, path) if source else pygame.image.load(path)
+        return self._trim(image) if trim else image
+
+    @staticmethod
+    def _trim(image, tolerance=24):
+        """
+        Makes the flat background of an opaque image transparent (its colour is taken from
+        the top-left pixel) and crops the image to its largest connected shape.
+        """
+        content = pygame.mask.from_threshold(image, image.get_at((0, 0)), (tolerance, tolerance, tolerance, 255))
+        content.invert()
+        # Los rótulos o marcas sueltas no cuentan para el recorte, solo la figura principal
+        bounds = content.connected_component().get_bounding_rects()
+        if not bounds: return image
+        trimmed = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+        trimmed.blit(image, (0, 0))
+        trimmed.blit(content.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(255, 255, 255, 0)), (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return trimmed.subsurface(bounds[0]).copy()
+
+    def _finish(self, kind, path, options, decoded):
+        """Converts a decoded image to the display format, or opens a font."""
+        if kind == 'font': return get_font(options.get('size', 36), path, self._source(path))
+        if pygame.display.get_surface() is None: return decoded
+        return decoded.convert_alpha() if options.get('alpha', True) else decoded.convert()
+
+    def get(self, key):
+        """
+        Returns a loaded asset without changing its reference count.
+
+        Args:
+            key (str): Key of the asset.
+
+        Raises:
+            KeyError: If the asset is not loaded (or still decoding).
+        """
+        return self._assets[key]
+
+    def is_loaded(self, key):
+        """Returns True if the asset is loaded and converted."""
+        return key in self._assets
+
+    def acquire(self, key):
+        """
+        Takes a reference to a loaded asset.
+
+        Args:
+            key (str): Key of the asset.
+
+        Returns:
+            The asset.
+        """
+        asset = self._assets[key]
+        self._refcounts[key] += 1
+        return asset
+
+    def release(self, key):
+        """
+        Drops a reference to an asset, unloading it when no references remain.
+
+        Args:
+            key (str): Key of the asset.
+        """
+        if key not in self._refcounts: return
+        self._refcounts[key] -= 1
+        if self._refcounts[key] <= 0:
+            del self._refcounts[key]
+            self._assets.pop(key, None)
+            self._options.pop(key, None)
+            future = self.pending.pop(key, None)
+            if future: future.cancel()
+
+    def refcount(self, key):
+        """Returns the number of references held on an asset (0 if not loaded)."""
+        return self._refcounts.get(key, 0)
+
+    def shutdown(self):
+        """Stops the worker threads, cancelling the decodes that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,62 @@
+"""
+collision.py
+------------
+Narrow-phase tests for axis-aligned boxes given as (x, y, width, height).
+
+Functions:
+    overlaps(a, b) -> bool: Strict overlap test of two boxes.
+    sweep_aabb(box, dx, dy, target) -> tuple: Time of impact of a moving box against a static one.
+"""
+
+INFINITY = float('inf')
+
+def overlaps(a, b):
+    """
+    Returns True if two boxes overlap. Strict, like pygame.Rect.colliderect: boxes that
+    only touch along an edge do not overlap.
+    """
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+def _axis_times(start, size, delta, target_start, target_size):
+    """Entry and exit times (fractions of delta) of a segment moving along one axis."""
+    if delta > 0:
+        return (target_start - (start + size)) / delta, (target_start + target_size - start) / delta
+    if delta < 0:
+        return (target_start + target_size - start) / delta, (target_start - (start + size)) / delta
+    # Sin movimiento en este eje: o ya se solapan (siempre) o no se solaparán nunca
+    if start < target_start + target_size and target_start < start + size: return -INFINITY, INFINITY
+    return INFINITY, -INFINITY
+
+def sweep_aabb(box, dx, dy, target):
+    """
+    Swept AABB test: finds when a box moving by (dx, dy) first touches a static target.
+
+    Args:
+        box: Moving box (x, y, width, height) at the start of the motion.
+        dx, dy (float): Displacement over the motion.
+        target: Static box (x, y, width, height).
+
+    Returns:
+        tuple: (toi, nx, ny), where toi in [0, 1] is the fraction of the displacement
+            at which the boxes touch and (nx, ny) is the target's surface normal at the
+            contact (-1, 0 or 1 on each axis). None if they do not touch during the
+            motion, or if the box is moving away from the target. A box that already
+            overlaps the target returns toi 0, with the normal of the side it is closest to.
+    """
+    x_entry, x_exit = _axis_times(box[0], box[2], dx, target[0], target[2])
+    y_entry, y_exit = _axis_times(box[1], box[3], dy, target[1], target[3])
+    entry, exit_time = max(x_entry, y_entry), min(x_exit, y_exit)
+    if entry > exit_time or exit_time <= 0 or entry >= 1: return None
+    if entry < 0:
+        # Ya se solapan al empezar (la pala se movió o creció encima): se separan por el lado más cercano
+        if not overlaps(box, target): return None
+        push_left = box[0] + box[2] - target[0]
+        push_right = target[0] + target[2] - box[0]
+        push_up = box[1] + box[3] - target[1]
+        push_down = target[1] + target[3] - box[1]
+        smallest = min(push_left, push_right, push_up, push_down)
+        if smallest == push_left: return 0.0, -1, 0
+        if smallest == push_right: return 0.0, 1, 0
+        return (0.0, 0, -1) if smallest == push_up else (0.0, 0, 1)
+    if x_entry > y_entry: return entry, (-1 if dx > 0 else 1), 0
+    return entry, 0, (-1 if dy > 0 else 1)
@@ -0,0 +1,100 @@
+"""
+dirty_rect_renderer.py
+----------------------
+Optional rendering path that only clears and presents the regions that changed.
+
+Classes:
+    DirtyRectRenderer: Tracks the areas drawn each frame and updates only those on the display.
+"""
+
+class DirtyRectRenderer:
+    """
+    Dirty-rectangle renderer used by the Game loop.
+
+    Scenes that support it return the rects they drew from draw(). Next frame only those
+    areas are cleared with the background, and only the union of the previous and current
+    areas is pushed to the display (pygame.display.update(rects) through the render pipeline).
+    When a scene does not report its rects, or too many regions change, it falls back to a
+    full flip.
+
+    Attributes:
+        background (tuple): Colour used to clear the previously drawn areas.
+        present_frame (callable): Presents the frame; receives a list of rects or None for a full flip.
+        max_rects (int): Above this number of regions a full flip is used instead.
+        max_area_ratio (float): Above this fraction of the screen a full flip is used instead.
+        previous (list): Rects drawn in the last frame.
+        full_frames (int): Frames presented with a full flip.
+        partial_frames (int): Frames presented with display.update(rects).
+
+    Methods:
+        invalidate():
+            Forces the next frame to clear and present the whole screen.
+
+        clear(screen):
+            Clears the areas drawn in the previous frame (or the whole screen).
+
+        present(screen, rects):
+            Pushes the changed areas to the display, or flips if needed.
+    """
+    def __init__(self, background, present_frame, max_rects=48, max_area_ratio=0.4):
+        self.background = background
+        self.present_frame = present_frame
+        self.max_rects = max_rects
+        self.max_area_ratio = max_area_ratio
+        self.previous = []
+        self.full_frames = 0
+        self.partial_frames = 0
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Forces the next frame to clear and present the whole screen."""
+        self._full_redraw = True
+
+    def clear(self, screen):
+        """
+        Clears the areas drawn in the previous frame, or the whole screen after a full redraw.
+
+        Args:
+            screen (pygame.Surface): The render target.
+        """
+        if self._full_redraw:
+            screen.fill(self.background)
+        else:
+            for rect in self.previous: screen.fill(self.background, rect)
+
+    def present(self, screen, rects):
+        """
+        Pushes the changed areas to the display, or flips the whole screen if the scene did
+        not report its rects or the changed area is too large.
+
+        Args:
+            screen (pygame.Surface): The render target.
+            rects (list): Rects drawn this frame, or None if the whole screen was drawn.
+        """
+        if rects is None:
+            self.present_frame(None)
+            self.full_frames += 1
+            self._full_redraw = True
+            return
+        screen_rect = screen.get_rect()
+        changed = [r.clip(screen_rect) for r in self.previous + rects]
+        changed = [r for r in changed if r.width and r.height]
+        area = sum(r.width * r.height for r in changed)
+        if self._full_redraw or len(changed) > self.max_rects or area > screen_rect.width * screen_rect.height * self.max_area_ratio:
+            self.present_frame(None)
+            self.full_frames += 1
+        else:
+            self.present_frame(changed)
+            self.partial_frames += 1
+        # Toda la pantalla es correcta: el próximo frame solo borra lo dibujado en este
+        self.previous = list(rects)
+        self._full_redraw = False
+
+    def stats(self):
+        """
+        Returns how frames were presented.
+
+        Returns:
+            dict: full_frames and partial_frames.
+        """
+        return {'full_frames': self.full_frames, 'partial_frames': self.partial_frames}
@@ -19,6 +19,8 @@ class ECSWorld:
         _next_entity_id (int): Counter for assigning unique entity IDs.
         _entities (Dict[int, Dict[Type, Any]]): Maps entity IDs to their components.
         _components (Dict[Type, Set[int]]): Maps component types to sets of entity IDs.
+            A column is kept when it empties, so adding the component again reuses its set.
+        _queries (Dict[tuple, tuple]): Results of query(), dropped when one of their columns changes.
 
     Methods:
         create_entity() -> int:
@@ -38,11 +40,26 @@ class ECSWorld:
 
         get_entities_with_components(*component_classes: Type) -> Iterable[int]:
             Returns all entity IDs that have all specified component types.
+
+        query(*component_classes: Type) -> tuple:
+            Cached, read-only version of get_entities_with_components for per-frame systems.
+
+        fork(copied: Iterable[Type], shared: Iterable[Type]) -> ECSWorld:
+            Returns a lightweight copy of some component columns, for simulating ahead.
     """
     def __init__(self):
         self._next_entity_id: int = 0
         self._entities: Dict[int, Dict[Type, Any]] = {}
         self._components: Dict[Type, Set[int]] = {}
+        self._queries: Dict[tuple, tuple] = {}
+        self._queries_by_class: Dict[Type, Set[tuple]] = {}
+
+    def _column_changed(self, component_class: Type):
+        """Drops the cached queries that involve a component type whose entities changed."""
+        keys = self._queries_by_class.get(component_class)
+        if not keys: return
+        for key in keys: self._queries.pop(key, None)
+        keys.clear()
 
     def create_entity(self) -> int:
         """
@@ -64,6 +81,7 @@ class ECSWorld:
             for component_class in self._entities[entity_id]:
                 if component_class in self._components:
                     self._components[component_class].discard(entity_id)
+                    self._column_changed(component_class)
             del self._entities[entity_id]
 
     def add_component(self, entity_id: int, component_instance: Any):
@@ -75,10 +93,17 @@ class ECSWorld:
             component_instance (Any): The component instance to add.
         """
         component_class = type(component_instance)
-        if entity_id not in self._entities:
+        components = self._entities.get(entity_id)
+        if components is None:
             return
-        self._entities[entity_id][component_class] = component_instance
-        self._components.setdefault(component_class, set()).add(entity_id)
+        # Reemplazar un componente del mismo tipo no cambia qué entidades lo tienen
+        is_new = component_class not in components
+        components[component_class] = component_instance
+        if not is_new: return
+        column = self._components.get(component_class)
+        if column is None: self._components[component_class] = column = set()
+        column.add(entity_id)
+        self._column_changed(component_class)
     
     def remove_component(self, entity_id: int, component_class: Type):
         """
@@ -91,9 +116,9 @@ class ECSWorld:
         if entity_id in self._entities and component_class in self._entities[entity_id]:
             del self._entities[entity_id][component_class]
             if component_class in self._components:
+                # La columna se conserva aunque quede vacía: volver a añadir el componente no reserva memoria
                 self._components[component_class].discard(entity_id)
-                if not self._components[component_class]:
-                    del self._components[component_class]
+                self._column_changed(component_class)
 
     def get_component(self, entity_id: int, component_class: Type) -> Any:
         """
@@ -128,3 +153,63 @@ class ECSWorld:
             return result
         except KeyError:
             return []
+
+    def query(self, *component_classes: Type) -> tuple:
+        """
+        Returns the IDs of the entities that have all the given component types, like
+        get_entities_with_components, as a cached tuple. The tuple is rebuilt only after
+        an entity gains or loses one of those types, so systems that run every frame do
+        not copy a set each time. It is a snapshot: adding or removing components while
+        iterating it is safe, and the next call sees the change.
+
+        Args:
+            *component_classes (Type): Component classes to filter entities.
+
+        Returns:
+            tuple: Entity IDs, in the same order get_entities_with_components yields them.
+        """
+        result = self._queries.get(component_classes)
+        if result is None:
+            result = tuple(self.get_entities_with_components(*component_classes))
+            self._queries[component_classes] = result
+            for component_class in component_classes:
+                keys = self._queries_by_class.get(component_class)
+                if keys is None: self._queries_by_class[component_class] = keys = set()
+                keys.add(component_classes)
+        return result
+
+    def fork(self, copied: Iterable[Type], shared: Iterable[Type] = ()) -> 'ECSWorld':
+        """
+        Returns a new world holding only the given component columns, for simulations
+        (AI rollouts) that must not touch this world. Components of the copied types are
+        cloned (a shallow copy of their attributes, so they must only hold plain values);
+        components of the shared types are the same instances as in this world and must
+        be treated as read-only by whoever uses the fork. Other component types are left
+        out. Entity IDs are preserved, and entities created in the fork get IDs that do
+        not collide with this world's.
+
+        Args:
+            copied (Iterable[Type]): Component types the simulation modifies.
+            shared (Iterable[Type]): Component types it only reads.
+
+        Returns:
+            ECSWorld: The forked world.
+        """
+        world = ECSWorld()
+        world._next_entity_id = self._next_entity_id
+        entities = world._entities
+        for component_class, copy in [(c, True) for c in copied] + [(c, False) for c in shared]:
+            ids = self._components.get(component_class)
+            if not ids: continue
+            world._components[component_class] = set(ids)
+            for entity_id in ids:
+                component = self._entities[entity_id][component_class]
+                if copy:
+                    # Clon sin pasar por copy.copy: basta con duplicar el diccionario de atributos
+                    clone = object.__new__(component_class)
+                    clone.__dict__.update(component.__dict__)
+                    component = clone
+                components = entities.get(entity_id)
+                if components is None: entities[entity_id] = components = {}
+                components[component_class] = component
+        return world
@@ -0,0 +1,147 @@
+"""
+gc_policy.py
+------------
+Controls when Python's garbage collector is allowed to run during the game.
+
+Classes:
+    GCPolicy: Freezes long-lived objects, defers automatic collection during play,
+              runs collections at safe points and records every GC pause.
+"""
+
+import gc
+import time
+from collections import deque
+
+class GCPolicy:
+    """
+    Garbage-collector policy used by the Game loop.
+
+    While a rally is being played automatic collection is disabled, so the collector
+    never interrupts a frame at an unpredictable point. Collections are instead run at
+    safe points (scene changes, the pause after a goal) or, if too many allocations pile
+    up, as a cheap generation-0 pass at the end of a frame.
+
+    Attributes:
+        enabled (bool): If False the policy does nothing and Python's default GC behaviour is kept.
+        gen0_budget (int): Pending gen-0 allocations tolerated during play before a forced gen-0 pass.
+        in_gameplay (bool): True while automatic collection is deferred.
+        pauses (deque): Recent GC pauses as (generation, duration_ms, reason) tuples.
+
+    Methods:
+        scene_ready(gameplay: bool):
+            Collects, freezes the surviving objects and applies the gameplay/menu mode.
+
+        set_gameplay(gameplay: bool):
+            Disables automatic collection during play and re-enables it outside of it.
+
+        collect(generation: int, reason: str):
+            Runs a collection at a safe point and records its duration.
+
+        end_frame():
+            Runs a gen-0 pass if the allocation budget was exceeded during play.
+
+        stats() -> dict:
+            Returns a summary of the recorded GC pauses.
+
+        shutdown():
+            Restores the default collector behaviour.
+    """
+    def __init__(self, enabled=True, gen0_budget=20000, max_samples=512):
+        self.enabled = enabled
+        self.gen0_budget = gen0_budget
+        self.in_gameplay = False
+        self.pauses = deque(maxlen=max_samples)
+        self.total_pauses = 0
+        self.total_pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self._reason = 'automatic'
+        self._start_time = None
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        """Callback registered in gc.callbacks; measures every collection, manual or automatic."""
+        if phase == 'start':
+            self._start_time = time.perf_counter()
+        elif phase == 'stop' and self._start_time is not None:
+            duration_ms = (time.perf_counter() - self._start_time) * 1000.0
+            self._start_time = None
+            self.pauses.append((info['generation'], duration_ms, self._reason))
+            self.total_pauses += 1
+            self.total_pause_ms += duration_ms
+            self.max_pause_ms = max(self.max_pause_ms, duration_ms)
+
+    def scene_ready(self, gameplay):
+        """
+        Called after a scene has been set up. Cleans up what the previous scene left behind
+        and moves every surviving object to the permanent generation, so later collections
+        only have to scan what is allocated from now on.
+
+        Args:
+            gameplay (bool): True if the new scene is an active game scene.
+        """
+        if not self.enabled: return
+        gc.unfreeze()
+        self.collect(2, 'scene_change')
+        gc.freeze()
+        self.set_gameplay(gameplay)
+
+    def set_gameplay(self, gameplay):
+        """
+        Disables automatic collection while playing and restores it otherwise.
+
+        Args:
+            gameplay (bool): True if a rally is being played.
+        """
+        if not self.enabled or gameplay == self.in_gameplay: return
+        self.in_gameplay = gameplay
+        if gameplay: gc.disable()
+        else: gc.enable()
+
+    def collect(self, generation=2, reason='safe_point'):
+        """
+        Runs a collection at a point where a pause is not noticeable.
+
+        Args:
+            generation (int): Oldest generation to collect (0, 1 or 2).
+            reason (str): Label stored with the recorded pause.
+
+        Returns:
+            int: Number of unreachable objects found.
+        """
+        if not self.enabled: return 0
+        self._reason = reason
+        try:
+            return gc.collect(generation)
+        finally:
+            self._reason = 'automatic'
+
+    def end_frame(self):
+        """
+        Runs a cheap gen-0 pass if too many allocations piled up while collection was deferred.
+        """
+        if self.in_gameplay and gc.get_count()[0] > self.gen0_budget:
+            self.collect(0, 'frame_budget')
+
+    def stats(self):
+        """
+        Returns a summary of the recorded GC pauses.
+
+        Returns:
+            dict: count, total_ms, max_ms, mean_ms, and the most recent pauses.
+        """
+        return {
+            'count': self.total_pauses,
+            'total_ms': self.total_pause_ms,
+            'max_ms': self.max_pause_ms,
+            'mean_ms': self.total_pause_ms / self.total_pauses if self.total_pauses else 0.0,
+            'recent': list(self.pauses),
+        }
+
+    def shutdown(self):
+        """
+        Restores the default collector behaviour and stops recording pauses.
+        """
+        if self._on_gc in gc.callbacks: gc.callbacks.remove(self._on_gc)
+        gc.unfreeze()
+        gc.enable()
+        self.in_gameplay = False
@@ -0,0 +1,213 @@
+"""
+input_sources.py
+----------------
+Per-frame input snapshot and the sources that fill it.
+
+Classes:
+    InputSnapshot: Movement axis of every player for the current frame.
+    KeyboardInputSource: Tracks the bound keys from KEYDOWN/KEYUP events.
+    GamepadInputSource: Tracks the vertical stick and d-pad of connected gamepads.
+    ReplayInputSource: Plays back recorded axes, one frame at a time.
+"""
+
+from array import array
+import pygame
+
+class InputSnapshot:
+    """
+    The movement axis of every player for one frame, from -1.0 (full speed up) to 1.0
+    (full speed down). Every frame the snapshot is cleared and each input source adds
+    its contribution, so the keyboard, a gamepad and a replay can drive the same paddle
+    and the systems reading the snapshot do not know which one did.
+
+    Attributes:
+        players (int): Number of players (numbered from 1).
+        axes (array): Raw axis of each player, index player - 1 (sum of the sources).
+        frame (int): Frames begun.
+
+    Methods:
+        begin_frame():
+            Clears the axes for a new frame.
+
+        push(player, value):
+            Adds a source's contribution to a player's axis.
+
+        axis(player) -> float:
+            Returns a player's axis, limited to [-1, 1].
+    """
+    def __init__(self, players=2):
+        self.players = players
+        self.axes = array('d', bytes(8 * players))
+        self.frame = 0
+
+    def begin_frame(self):
+        """Clears the axes for a new frame."""
+        axes = self.axes
+        for index in range(self.players): axes[index] = 0.0
+        self.frame += 1
+
+    def push(self, player, value):
+        """Adds a source's contribution to a player's axis (ignored for unknown players)."""
+        if 1 <= player <= self.players: self.axes[player - 1] += value
+
+    def axis(self, player):
+        """Returns a player's axis, limited to [-1, 1] (0 for unknown players)."""
+        if not 1 <= player <= self.players: return 0.0
+        value = self.axes[player - 1]
+        return -1.0 if value < -1.0 else 1.0 if value > 1.0 else value
+
+class KeyboardInputSource:
+    """
+    Keyboard source: keeps which bound keys are held from KEYDOWN and KEYUP events,
+    looked up in the ConfigManager's compiled key map, so no frame scans the whole
+    keyboard. As with the original controls, 'up' wins when both keys are held.
+
+    Attributes:
+        config_manager (ConfigManager): Owner of the key map (rebuilt by set_key).
+
+    Methods:
+        poll(events, snapshot):
+            Applies the frame's key events and pushes the held keys to the snapshot.
+
+        resync():
+            Rebuilds the held keys from the keyboard state (after events were missed).
+    """
+    def __init__(self, config_manager, players=2):
+        self.config_manager = config_manager
+        self._up = [False] * (players + 1)    # índice = número de jugador
+        self._down = [False] * (players + 1)
+
+    def _set(self, bindings, held):
+        # Una tecla puede estar asignada a varias acciones (p. ej. la misma a los dos jugadores)
+        for player, action in bindings:
+            if player >= len(self._up): continue
+            if action == 'up': self._up[player] = held
+            elif action == 'down': self._down[player] = held
+
+    def poll(self, events, snapshot):
+        """
+        Applies the frame's KEYDOWN/KEYUP events and pushes the held keys.
+
+        Args:
+            events (list): The frame's pygame events.
+            snapshot (InputSnapshot): Snapshot being filled.
+        """
+        key_map = self.config_manager.key_map
+        for event in events:
+            if event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+                bindings = key_map.get(event.key)
+                if bindings is not None: self._set(bindings, event.type == pygame.KEYDOWN)
+        for player in range(1, len(self._up)):
+            if self._up[player]: snapshot.push(player, -1.0)
+            elif self._down[player]: snapshot.push(player, 1.0)
+
+    def resync(self):
+        """Rebuilds the held keys from pygame.key.get_pressed() (e.g. when leaving the pause menu)."""
+        pressed = pygame.key.get_pressed()
+        for player in range(1, len(self._up)): self._up[player] = self._down[player] = False
+        # El envoltorio de get_pressed() acepta códigos de tecla (K_UP...) además de scancodes
+        for key, bindings in self.config_manager.key_map.items():
+            if pressed[key]: self._set(bindings, True)
+
+class GamepadInputSource:
+    """
+    Gamepad source: opens the joysticks pygame reports as connected and gives the n-th
+    one to player n. The d-pad moves at full speed; the stick moves proportionally
+    outside its dead zone.
+
+    Attributes:
+        axis (int): Index of the vertical stick axis.
+        deadzone (float): Stick values below this are ignored.
+        players (int): Number of players that can get a gamepad.
+
+    Methods:
+        poll(events, snapshot):
+            Applies the frame's joystick events and pushes each gamepad's axis.
+
+        resync():
+            Centres every gamepad until its next event.
+    """
+    def __init__(self, axis=1, deadzone=0.3, players=2):
+        self.axis, self.deadzone, self.players = axis, deadzone, players
+        self._joysticks = {}   # instance_id -> pygame.joystick.Joystick
+        self._player = {}      # instance_id -> número de jugador
+        self._stick = {}       # instance_id -> valor del eje vertical
+        self._hat = {}         # instance_id -> -1, 0 o 1 (cruceta, hacia abajo positivo)
+        # Los mandos conectados al arrancar avisaron (JOYDEVICEADDED) antes de que existiera la partida
+        if pygame.joystick.get_init():
+            for device_index in range(pygame.joystick.get_count()): self._connect(device_index)
+
+    def _connect(self, device_index):
+        joystick = pygame.joystick.Joystick(device_index)
+        if joystick.get_instance_id() in self._player: return
+        used = set(self._player.values())
+        player = next((p for p in range(1, self.players + 1) if p not in used), None)
+        if player is None: return
+        instance = joystick.get_instance_id()
+        self._joysticks[instance], self._player[instance] = joystick, player
+        self._stick[instance], self._hat[instance] = 0.0, 0
+
+    def poll(self, events, snapshot):
+        """
+        Applies the frame's joystick events and pushes each gamepad's axis.
+
+        Args:
+            events (list): The frame's pygame events.
+            snapshot (InputSnapshot): Snapshot being filled.
+        """
+        for event in events:
+            kind = event.type
+            if kind == pygame.JOYAXISMOTION:
+                if event.axis == self.axis and event.instance_id in self._stick: self._stick[event.instance_id] = event.value
+            elif kind == pygame.JOYHATMOTION:
+                if event.instance_id in self._hat: self._hat[event.instance_id] = -event.value[1]
+            elif kind == pygame.JOYDEVICEADDED: self._connect(event.device_index)
+            elif kind == pygame.JOYDEVICEREMOVED:
+                for table in (self._joysticks, self._player, self._stick, self._hat): table.pop(event.instance_id, None)
+        for instance, player in self._player.items():
+            hat = self._hat[instance]
+            if hat: snapshot.push(player, hat)
+            else:
+                stick = self._stick[instance]
+                if stick > self.deadzone or stick < -self.deadzone: snapshot.push(player, stick)
+
+    def resync(self):
+        """Centres every gamepad; the next stick or d-pad event moves it again."""
+        for instance in self._player:
+            self._stick[instance], self._hat[instance] = 0.0, 0
+
+class ReplayInputSource:
+    """
+    Replay source: pushes recorded axes, one entry per frame, and then nothing. A
+    recording is the list of tuple(snapshot.axes) taken after every frame's sources ran.
+
+    Attributes:
+        frames (list): Recorded axes of each frame.
+        position (int): Next frame to play.
+
+    Methods:
+        poll(events, snapshot):
+            Pushes the next recorded frame.
+
+        finished() -> bool:
+            Returns True when every frame has been played.
+
+        resync():
+            Does nothing; a replay does not depend on the devices.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+        self.position = 0
+
+    def poll(self, events, snapshot):
+        """Pushes the axes of the next recorded frame (events are ignored)."""
+        if self.position >= len(self.frames): return
+        for index, value in enumerate(self.frames[self.position]): snapshot.push(index + 1, value)
+        self.position += 1
+
+    def finished(self):
+        """Returns True when every recorded frame has been played."""
+        return self.position >= len(self.frames)
+
+    def resync(self):
+        """Nothing to resync: a replay does not depend on the devices."""
@@ -0,0 +1,113 @@
+"""
+latency_probe.py
+----------------
+Measures the time from an input event to the display flip that first shows its effect.
+
+Classes:
+    InputLatencyProbe: Timestamps input events and reports their latency as percentiles.
+"""
+
+import time
+from array import array
+import pygame
+
+# Eventos que cuentan como entrada del jugador
+INPUT_EVENT_TYPES = frozenset((
+    pygame.KEYDOWN, pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+    pygame.JOYAXISMOTION, pygame.JOYHATMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP
+))
+
+def _percentile(values, p):
+    """Returns the p-th percentile of sorted values, in milliseconds."""
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] * 1000
+
+class InputLatencyProbe:
+    """
+    Timestamps the input events of every frame and, when the frame is presented, records
+    how long each one took to reach the screen. The events of a frame are simulated and
+    drawn in that same frame, so the flip that ends it is the first one reflecting them.
+
+    pygame events carry no arrival time, so it is estimated: an event read from the
+    queue arrived at some point since the previous read, and the midpoint of that interval
+    is used. That estimate is good for the median but understates the tail (an event
+    arriving just after a read waits a whole frame more). The latency from the read
+    itself (the part the loop controls: limiter sleep, simulation, drawing and flip) is
+    recorded too.
+
+    Attributes:
+        events (int): Input events measured.
+        latency (array): Estimated arrival-to-flip latency of the most recent events, in seconds.
+        from_read (array): Read-to-flip latency of the same events, in seconds.
+
+    Methods:
+        sample(events):
+            Timestamps the input events just read from the queue.
+
+        presented():
+            Records the latency of the pending events; call right after the flip.
+
+        stats() -> dict:
+            Returns the latency percentiles in milliseconds.
+    """
+    def __init__(self, max_samples=2048):
+        self.events = 0
+        self.latency = array('d', bytes(8 * max_samples))
+        self.from_read = array('d', bytes(8 * max_samples))
+        self._last_read = None
+        self._pending = 0
+        self._arrival = 0.0
+        self._read = 0.0
+
+    def sample(self, events):
+        """
+        Timestamps the input events just read from the queue.
+
+        Args:
+            events (list): Events returned by pygame.event.get().
+        """
+        now = time.perf_counter()
+        previous, self._last_read = self._last_read, now
+        count = 0
+        for event in events:
+            if event.type in INPUT_EVENT_TYPES: count += 1
+        if not count: return
+        # Si ya había eventos sin presentar (un frame sin flip) se conserva su marca, la más antigua
+        if not self._pending:
+            self._arrival = now if previous is None else (previous + now) / 2
+            self._read = now
+        self._pending += count
+
+    def presented(self):
+        """Records the latency of the events read since the last flip; call right after it."""
+        if not self._pending: return
+        now = time.perf_counter()
+        latency, from_read = now - self._arrival, now - self._read
+        size = len(self.latency)
+        for _ in range(self._pending):
+            slot = self.events % size
+            self.latency[slot], self.from_read[slot] = latency, from_read
+            self.events += 1
+        self._pending = 0
+
+    def stats(self):
+        """
+        Returns the latency percentiles of the most recent events.
+
+        Returns:
+            dict: events, p50_ms, p90_ms, p99_ms and max_ms of the estimated arrival-to-flip
+                latency, and read_p50_ms / read_p99_ms from the read of the queue.
+        """
+        samples = min(self.events, len(self.latency))
+        stats = {'events': self.events}
+        if not samples: return stats
+        latency, from_read = sorted(self.latency[:samples]), sorted(self.from_read[:samples])
+        stats.update({
+            'p50_ms': _percentile(latency, 50),
+            'p90_ms': _percentile(latency, 90),
+            'p99_ms': _percentile(latency, 99),
+            'max_ms': latency[-1] * 1000,
+            'read_p50_ms': _percentile(from_read, 50),
+            'read_p99_ms': _percentile(from_read, 99)
+        })
+        return stats
@@ -0,0 +1,111 @@
+"""
+quality_controller.py
+---------------------
+Adapts the amount of optional visual work to the time available per frame.
+
+Classes:
+    QualityController: Watches recent frame times against a budget and scales optional effects.
+"""
+
+from collections import deque
+
+class QualityController:
+    """
+    Adaptive quality controller driven by frame times.
+
+    Level 0 is full quality; each higher level scales optional work down
+    (confetti counts, particle draw fidelity, trails...). The level goes up when the
+    average work time of the recent frames gets close to the frame budget, and goes back
+    down once there is headroom again. A cooldown between changes prevents oscillation.
+
+    Attributes:
+        budget_ms (float): Time available per frame, in milliseconds.
+        scales (tuple): Work multiplier for each quality level (index = level).
+        samples (deque): Most recent frame work times in milliseconds.
+        level (int): Current quality level (0 = full quality).
+        level_changes (int): Number of times the level has changed.
+
+    Methods:
+        record_frame(frame_ms: float):
+            Adds a frame time sample and adjusts the quality level if needed.
+
+        scaled(count: int, minimum: int) -> int:
+            Scales an amount of optional work by the current quality.
+
+        stats() -> dict:
+            Returns the current quality state for telemetry.
+    """
+    def __init__(self, target_fps=60, window=30, scales=(1.0, 0.75, 0.5, 0.25),
+                 downgrade_ratio=0.85, upgrade_ratio=0.5, cooldown_frames=60):
+        self.budget_ms = 1000.0 / target_fps
+        self.scales = scales
+        self.samples = deque(maxlen=window)
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.cooldown_frames = cooldown_frames
+        self.level = 0
+        self.level_changes = 0
+        self._cooldown = 0
+
+    @property
+    def scale(self):
+        """float: Work multiplier for the current level (1.0 = full quality)."""
+        return self.scales[self.level]
+
+    @property
+    def average_ms(self):
+        """float: Average work time of the recent frames."""
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def record_frame(self, frame_ms):
+        """
+        Adds a frame time sample and adjusts the quality level if needed.
+
+        Args:
+            frame_ms (float): Time spent working on the last frame (excluding the frame limiter's sleep).
+        """
+        self.samples.append(frame_ms)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+        if len(self.samples) < self.samples.maxlen: return
+        average = self.average_ms
+        if average > self.budget_ms * self.downgrade_ratio and self.level < len(self.scales) - 1:
+            self._set_level(self.level + 1)
+        elif average < self.budget_ms * self.upgrade_ratio and self.level > 0:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.level_changes += 1
+        self._cooldown = self.cooldown_frames
+        # Las muestras anteriores ya no representan el nuevo nivel
+        self.samples.clear()
+
+    def scaled(self, count, minimum=1):
+        """
+        Scales an amount of optional work by the current quality.
+
+        Args:
+            count (int): Amount at full quality.
+            minimum (int): Lowest amount returned.
+
+        Returns:
+            int: The scaled amount.
+        """
+        return max(minimum, int(round(count * self.scale)))
+
+    def stats(self):
+        """
+        Returns the current quality state for telemetry.
+
+        Returns:
+            dict: level, scale, budget_ms, average_ms and level_changes.
+        """
+        return {
+            'level': self.level,
+            'scale': self.scale,
+            'budget_ms': self.budget_ms,
+            'average_ms': self.average_ms,
+            'level_changes': self.level_changes,
+        }
@@ -0,0 +1,131 @@
+"""
+render_pipeline.py
+------------------
+Owns the display window and the surface the game draws on.
+
+The game is rendered at an internal resolution, which can differ from the window size.
+The internal frame is presented either by SDL (pygame.SCALED, scaled on the GPU when
+available) or by a software pygame.transform.scale into the window.
+
+Classes:
+    RenderPipeline: Creates the window with the selected flags and presents the internal render target.
+
+Functions:
+    get_mouse_pos(): Mouse position in internal-resolution coordinates.
+"""
+
+import pygame
+
+_active_pipeline = None
+
+def get_mouse_pos():
+    """
+    Returns the mouse position in internal-resolution coordinates.
+    Systems use it instead of pygame.mouse.get_pos() so hit-testing works at any window size.
+
+    Returns:
+        tuple: (x, y) in render target coordinates.
+    """
+    if _active_pipeline is None: return pygame.mouse.get_pos()
+    return _active_pipeline.to_internal(pygame.mouse.get_pos())
+
+class RenderPipeline:
+    """
+    Creates the display window and the render target, and presents each frame.
+
+    Attributes:
+        internal_size (tuple): Resolution everything is drawn at.
+        window_size (tuple): Size of the window (ignored by SDL when fullscreen).
+        scale_mode (str): 'scaled' to let SDL scale (pygame.SCALED), 'software' to use pygame.transform.scale.
+        display (pygame.Surface): The display surface returned by set_mode.
+        target (pygame.Surface): Surface the game draws on (the display itself when no software scaling is needed).
+
+    Methods:
+        present(rects):
+            Shows the frame, updating only the given internal-resolution rects if provided.
+
+        to_internal(pos) -> tuple:
+            Converts a window position to internal-resolution coordinates.
+
+        map_event(event) -> pygame.event.Event:
+            Returns the event with its mouse position converted to internal coordinates.
+    """
+    def __init__(self, internal_size, window_size=None, scale_mode='scaled',
+                 fullscreen=False, doublebuf=False, vsync=False):
+        global _active_pipeline
+        self.internal_size = tuple(internal_size)
+        self.window_size = tuple(window_size) if window_size else self.internal_size
+        self.scale_mode = scale_mode
+
+        flags = 0
+        if fullscreen: flags |= pygame.FULLSCREEN
+        if doublebuf: flags |= pygame.DOUBLEBUF
+        needs_scaling = fullscreen or self.window_size != self.internal_size
+
+        if needs_scaling and scale_mode == 'scaled':
+            # SDL escala la superficie lógica al tamaño de la ventana/pantalla
+            self.display = pygame.display.set_mode(self.internal_size, flags | pygame.SCALED, vsync=int(vsync))
+            self.target = self.display
+        elif needs_scaling:
+            self.display = pygame.display.set_mode(self.window_size, flags, vsync=int(vsync))
+            self.target = pygame.Surface(self.internal_size).convert()
+        else:
+            self.display = pygame.display.set_mode(self.internal_size, flags, vsync=int(vsync))
+            self.target = self.display
+
+        if self.target is not self.display: self.window_size = self.display.get_size()
+        self._scale_x = self.window_size[0] / self.internal_size[0]
+        self._scale_y = self.window_size[1] / self.internal_size[1]
+        _active_pipeline = self
+
+    @property
+    def software_scaled(self):
+        """bool: True if the internal target is scaled into the window by pygame.transform."""
+        return self.target is not self.display
+
+    def present(self, rects=None):
+        """
+        Shows the frame.
+
+        Args:
+            rects (list): Internal-resolution rects that changed, or None to present the whole frame.
+        """
+        if self.software_scaled:
+            # Escala directamente sobre la superficie de la ventana, sin crear superficies nuevas
+            pygame.transform.scale(self.target, self.display.get_size(), self.display)
+            if rects is not None:
+                rects = [self._to_window_rect(r) for r in rects]
+        if rects is None: pygame.display.flip()
+        else: pygame.display.update(rects)
+
+    def _to_window_rect(self, rect):
+        x, y = int(rect.x * self._scale_x), int(rect.y * self._scale_y)
+        return pygame.Rect(x, y, int(rect.right * self._scale_x + 1) - x, int(rect.bottom * self._scale_y + 1) - y)
+
+    def to_internal(self, pos):
+        """
+        Converts a window position to internal-resolution coordinates.
+
+        Args:
+            pos (tuple): (x, y) in window coordinates.
+
+        Returns:
+            tuple: (x, y) in render target coordinates.
+        """
+        if not self.software_scaled: return pos
+        return int(pos[0] / self._scale_x), int(pos[1] / self._scale_y)
+
+    def map_event(self, event):
+        """
+        Returns the event with its mouse position converted to internal coordinates.
+
+        Args:
+            event (pygame.event.Event): Event as returned by pygame.event.get().
+
+        Returns:
+            pygame.event.Event: The same event, or a copy with a converted 'pos'.
+        """
+        if not self.software_scaled or not hasattr(event, 'pos'): return event
+        attributes = dict(event.dict)
+        attributes['pos'] = self.to_internal(event.pos)
+        return pygame.event.Event(event.type, attributes)
@@ -0,0 +1,173 @@
+"""
+render_queue.py
+---------------
+Per-frame queue of draw commands, flushed in batches.
+
+Systems submit rects, sprites and text while traversing the ECS world; nothing is drawn
+until flush(), which sorts the commands by layer and material and issues a single
+Surface.blits call per layer. Rects are turned into cached solid sprites, so every
+command can go through the same batched blit.
+
+Constants:
+    LAYER_WORLD (int): Paddles, ball and powerups.
+    LAYER_EFFECTS (int): Particles, trails and other effects drawn over the world.
+    LAYER_HUD (int): Scores and buttons.
+
+Classes:
+    RenderQueue: Collects draw commands and flushes them by layer.
+"""
+
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+import pygame
+from engine.text_cache import text_cache
+
+LAYER_WORLD = 10
+LAYER_EFFECTS = 20
+LAYER_HUD = 30
+
+class RenderQueue:
+    """
+    Collects draw commands for one frame and flushes them by layer.
+
+    Commands are (layer, material, surface, dest) tuples. The material groups commands
+    that use the same surface so they are blitted together; the order of commands within
+    a layer is otherwise not guaranteed, so anything that must be drawn on top goes on a
+    higher layer.
+
+    Attributes:
+        max_cached_surfaces (int): Maximum number of solid sprites kept for submit_rect().
+        commands (list): Commands submitted since the last flush.
+
+    Methods:
+        submit_sprite(layer, surface, dest):
+            Queues a blit of a surface.
+
+        submit_rect(layer, color, rect, border_radius):
+            Queues a filled (optionally rounded) rect.
+
+        submit_text(layer, text, size, color, center, path):
+            Queues text rendered through the shared text cache.
+
+        submit_batch(layer, blit_sequence):
+            Queues a prepared (surface, dest) sequence, e.g. thousands of particles.
+
+        flush(target, collect_rects) -> list:
+            Draws every queued command and empties the queue.
+    """
+    def __init__(self, max_cached_surfaces=128):
+        self.max_cached_surfaces = max_cached_surfaces
+        self.commands = []
+        self._solids = OrderedDict()
+        # Listas de trabajo de flush(), vaciadas y reutilizadas en cada capa
+        self._sequence, self._batches = [], []
+
+    def submit_sprite(self, layer, surface, dest):
+        """
+        Queues a blit of a surface.
+
+        Args:
+            layer (int): Drawing layer; lower layers are drawn first.
+            surface (pygame.Surface): Surface to draw.
+            dest (tuple): Top-left position.
+        """
+        self.commands.append((layer, id(surface), surface, dest))
+
+    def submit_rect(self, layer, color, rect, border_radius=0):
+        """
+        Queues a filled rect, drawn as a cached solid sprite of that colour and size.
+
+        Args:
+            layer (int): Drawing layer.
+            color (tuple): RGB colour.
+            rect (tuple): (x, y, width, height).
+            border_radius (int): Radius of the rounded corners.
+        """
+        x, y, width, height = rect
+        surface = self.solid_surface(color, (int(width), int(height)), border_radius)
+        self.commands.append((layer, id(surface), surface, (x, y)))
+
+    def submit_text(self, layer, text, size, color, center, path=None):
+        """
+        Queues text rendered through the shared text cache.
+
+        Args:
+            layer (int): Drawing layer.
+            text (str): Text to draw.
+            size (int): Font size.
+            color: Text colour.
+            center (tuple): (x, y) centre of the text.
+            path (str): Font file, or None for the default font.
+        """
+        surface = text_cache.render(text, size, color, path)
+        self.commands.append((layer, id(surface), surface, surface.get_rect(center=center)))
+
+    def submit_batch(self, layer, blit_sequence):
+        """
+        Queues a prepared (surface, dest) sequence as a single command. Used by systems
+        that already produce their blits in bulk, so they are not sorted one by one.
+        The sequence is passed to its own Surface.blits call, so it can be a lazy iterator.
+
+        Args:
+            layer (int): Drawing layer.
+            blit_sequence (iterable): (pygame.Surface, dest) pairs.
+        """
+        self.commands.append((layer, -1, None, blit_sequence))
+
+    def solid_surface(self, color, size, border_radius=0):
+        """
+        Returns a cached surface filled with a colour (rounded if border_radius > 0).
+
+        Args:
+            color (tuple): RGB colour.
+            size (tuple): (width, height).
+            border_radius (int): Radius of the rounded corners.
+
+        Returns:
+            pygame.Surface: The cached surface.
+        """
+        key = (tuple(color), size, border_radius)
+        surface = self._solids.get(key)
+        if surface is not None:
+            self._solids.move_to_end(key)
+            return surface
+        if border_radius:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(surface, color, surface.get_rect(), border_radius=border_radius)
+        else:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if border_radius else surface.convert()
+        self._solids[key] = surface
+        if len(self._solids) > self.max_cached_surfaces:
+            self._solids.popitem(last=False)
+        return surface
+
+    def flush(self, target, collect_rects=True):
+        """
+        Draws every queued command, one Surface.blits call per layer, and empties the queue.
+
+        Args:
+            target (pygame.Surface): Surface to draw on.
+            collect_rects (bool): If True the drawn rects are returned (for the dirty-rect renderer).
+
+        Returns:
+            list: Rects drawn, or an empty list if collect_rects is False.
+        """
+        self.commands.sort(key=itemgetter(0, 1))
+        rects = []
+        for _, layer_commands in groupby(self.commands, key=itemgetter(0)):
+            sequence, batches = self._sequence, self._batches
+            for _, _, surface, dest in layer_commands:
+                if surface is None: batches.append(dest)
+                else: sequence.append((surface, dest))
+            batches.insert(0, sequence)
+            for blit_sequence in batches:
+                if collect_rects: rects += target.blits(blit_sequence)
+                else: target.blits(blit_sequence, doreturn=False)
+            sequence.clear()
+            batches.clear()
+        self.commands.clear()
+        return rects
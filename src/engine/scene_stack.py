@@ -0,0 +1,90 @@
+"""
+scene_stack.py
+--------------
+Stack of active scenes with push/pop semantics for overlays such as the pause menu.
+
+Classes:
+    SceneStack: Keeps the active scenes; overlays get a frozen copy of the frame underneath.
+"""
+
+import pygame
+
+class SceneStack:
+    """
+    Stack of active scenes. Only the top scene receives events, updates and draws.
+
+    When a scene is pushed as an overlay, the frame currently on screen (the last frame
+    of the scene underneath) is captured once, optionally pre-dimmed, and handed to the
+    overlay as its `background`. The scene underneath is not rendered again until the
+    overlay is popped.
+
+    Attributes:
+        scenes (list): Active scenes, bottom to top.
+
+    Methods:
+        push(scene, screen, overlay, dim):
+            Activates a scene on top of the current one.
+
+        pop() -> scene:
+            Deactivates the top scene, resumes the one underneath and returns the removed one.
+
+        replace(scene):
+            Deactivates every scene and activates the given one.
+    """
+    def __init__(self):
+        self.scenes = []
+
+    @property
+    def top(self):
+        """The scene currently on top of the stack, or None."""
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene, screen=None, overlay=False, dim=0):
+        """
+        Activates a scene on top of the current one.
+
+        Args:
+            scene: Scene to activate (its setup() is called).
+            screen (pygame.Surface): Display surface holding the last frame; required for overlays.
+            overlay (bool): If True the current frame is captured as the scene's background.
+            dim (int): 0-255; how much the captured frame is darkened (as a black overlay of that alpha).
+        """
+        scene.background = self._capture(screen, dim) if overlay and screen is not None else None
+        self.scenes.append(scene)
+        scene.setup()
+
+    def pop(self):
+        """
+        Deactivates the top scene and returns it. The scene uncovered, if any, is resumed.
+
+        Returns:
+            The removed scene, or None if the stack was empty.
+        """
+        scene = self._remove()
+        if scene is not None and self.scenes: self.scenes[-1].resume()
+        return scene
+
+    def replace(self, scene):
+        """
+        Deactivates every scene in the stack and activates the given one.
+
+        Args:
+            scene: Scene to activate.
+        """
+        while self.scenes: self._remove()
+        self.push(scene)
+
+    def _remove(self):
+        if not self.scenes: return None
+        scene = self.scenes.pop()
+        scene.cleanup()
+        scene.background = None
+        return scene
+
+    def _capture(self, screen, dim):
+        frame = screen.copy()
+        if dim:
+            # Oscurecer una sola vez equivale a mezclar un negro con alfa 'dim' en cada frame
+            factor = 255 - dim
+            frame.fill((factor, factor, factor), special_flags=pygame.BLEND_RGB_MULT)
+        return frame
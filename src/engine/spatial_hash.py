@@ -0,0 +1,234 @@
+"""
+spatial_hash.py
+---------------
+Uniform grid of axis-aligned boxes, with optional collision layers and masks. It is the
+broadphase of the game systems and the hit-testing index of the UI (engine.ui).
+
+Classes:
+    SpatialHash: Buckets boxes into grid cells and returns the pairs that may overlap.
+"""
+
+from engine.collision import overlaps
+
+# Máscara que acepta todas las capas: el valor por defecto para quien no usa capas (la UI)
+ALL_LAYERS = -1
+
+class SpatialHash:
+    """
+    Uniform grid of square cells, keyed by (column, row) in a dict so the field needs no
+    fixed bounds. Each box is linked into every cell it touches.
+
+    Boxes are updated in place: update() only relinks a box when the span of cells it
+    touches changes, so a box moving inside its cells (or not moving at all, like a
+    powerup) costs one comparison. Queries only look at the cells around a box, so the
+    number of narrow-phase tests depends on how crowded those cells are, not on how many
+    boxes the grid holds.
+
+    Every box belongs to one collision layer (a bit) and has a mask of the layers it
+    collides with. Two boxes are a pair when each one's mask includes the other's layer.
+    Users without layers (the UI) leave both at their defaults and query every layer.
+
+    The grid does not allocate once it is warm: cells are kept when they empty, and
+    query() and pairs() fill buffers owned by the grid, so their results are only valid
+    until the next call of the same method.
+
+    Attributes:
+        cell_size (int): Side of a cell in pixels; about the size of the largest moving box.
+        tests (int): Box-box overlap tests done by the last pairs() call.
+
+    Methods:
+        update(key, x, y, width, height, layer, mask):
+            Inserts a box or moves it to its new position.
+
+        remove(key):
+            Removes a box.
+
+        retain(keys):
+            Removes every box whose key is not in keys.
+
+        clear():
+            Removes every box.
+
+        reserve(x, y, width, height):
+            Creates the cells covering an area ahead of time.
+
+        query(x, y, width, height, mask) -> list:
+            Returns the keys of the boxes in the mask's layers overlapping an area.
+
+        pairs(layer_a, layer_b) -> list:
+            Returns the (a, b) keys of overlapping boxes of two layers that collide.
+
+        bounds(key) -> list:
+            Returns the stored [x, y, width, height] of a box.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.tests = 0
+        self._cells = {}      # (columna, fila) -> set de claves
+        self._spans = {}      # clave -> (col0, fila0, col1, fila1)
+        self._bounds = {}     # clave -> [x, y, ancho, alto]
+        self._filters = {}    # clave -> (capa, máscara)
+        self._layers = {}     # capa -> set de claves
+        self._sorted = {}     # capa -> lista ordenada de sus claves (se rehace al cambiar la capa)
+        self._found = []      # buffers reutilizados por query() y pairs()
+        self._pairs = []
+        self._seen = set()
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, key):
+        return key in self._bounds
+
+    def _span(self, x, y, width, height):
+        size = self.cell_size
+        return (int(x // size), int(y // size), int((x + width) // size), int((y + height) // size))
+
+    def _link(self, key, span):
+        cells = self._cells
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                cell = cells.get((column, row))
+                if cell is None: cells[(column, row)] = cell = set()
+                cell.add(key)
+
+    def _unlink(self, key, span):
+        cells = self._cells
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                # Las celdas vacías se conservan: una pelota que vuelve a entrar no reserva memoria
+                cells[(column, row)].discard(key)
+
+    def update(self, key, x, y, width, height, layer=1, mask=ALL_LAYERS):
+        """
+        Inserts a box, or updates its position, size and filter.
+
+        Args:
+            key: Identifier of the box (the entity ID, or a widget).
+            x, y, width, height (float): Box in pixels.
+            layer (int): Collision layer bit of the box.
+            mask (int): Bits of the layers the box collides with (all by default).
+        """
+        bounds = self._bounds.get(key)
+        if bounds is None:
+            self._bounds[key] = [x, y, width, height]
+        else:
+            bounds[0], bounds[1], bounds[2], bounds[3] = x, y, width, height
+        previous = self._filters.get(key)
+        if previous is None or previous[0] != layer or previous[1] != mask:
+            if previous:
+                self._layers[previous[0]].discard(key)
+                self._sorted.pop(previous[0], None)
+            self._filters[key] = (layer, mask)
+            self._layers.setdefault(layer, set()).add(key)
+            self._sorted.pop(layer, None)
+        span = self._span(x, y, width, height)
+        old_span = self._spans.get(key)
+        if span == old_span: return
+        if old_span: self._unlink(key, old_span)
+        self._link(key, span)
+        self._spans[key] = span
+
+    def remove(self, key):
+        """Removes a box (no-op if it is not in the grid)."""
+        span = self._spans.pop(key, None)
+        if span is None: return
+        self._unlink(key, span)
+        del self._bounds[key]
+        layer = self._filters.pop(key)[0]
+        self._layers[layer].discard(key)
+        self._sorted.pop(layer, None)
+
+    def reserve(self, x, y, width, height):
+        """
+        Creates the (empty) cells covering an area, so boxes moving inside it never
+        allocate a cell during a frame.
+
+        Args:
+            x, y, width, height (float): Area in pixels, usually the field plus a margin.
+        """
+        span = self._span(x, y, width, height)
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                self._cells.setdefault((column, row), set())
+
+    def clear(self):
+        """Removes every box (the cells are kept)."""
+        for cell in self._cells.values(): cell.clear()
+        for table in (self._spans, self._bounds, self._filters, self._layers, self._sorted): table.clear()
+
+    def retain(self, keys):
+        """
+        Removes every box whose key is not in keys.
+
+        Args:
+            keys (set): Keys that are still alive.
+        """
+        for key in [key for key in self._bounds if key not in keys]: self.remove(key)
+
+    def bounds(self, key):
+        """Returns the stored [x, y, width, height] of a box."""
+        return self._bounds[key]
+
+    def query(self, x, y, width, height, mask=ALL_LAYERS):
+        """
+        Returns the keys of the boxes in the mask's layers that overlap an area.
+
+        Args:
+            x, y, width, height (float): Area in pixels (a 1x1 area at a point hit-tests it).
+            mask (int): Layers to look for (all by default).
+
+        Returns:
+            list: Matching keys, each once (the grid's buffer, valid until the next query).
+        """
+        size = self.cell_size
+        found, seen, cells, bounds, filters = self._found, self._seen, self._cells, self._bounds, self._filters
+        found.clear()
+        seen.clear()
+        area = (x, y, width, height)
+        for column in range(int(x // size), int((x + width) // size) + 1):
+            for row in range(int(y // size), int((y + height) // size) + 1):
+                cell = cells.get((column, row))
+                if not cell: continue
+                for key in cell:
+                    if key in seen: continue
+                    seen.add(key)
+                    if filters[key][0] & mask and overlaps(area, bounds[key]): found.append(key)
+        return found
+
+    def pairs(self, layer_a, layer_b):
+        """
+        Returns the overlapping pairs between two layers whose masks accept each other.
+        Only the cells touched by each box of layer_a are searched.
+
+        Args:
+            layer_a (int): Layer of the first key of each pair (e.g. the balls).
+            layer_b (int): Layer of the second key (e.g. the paddles).
+
+        Returns:
+            list: (a, b) tuples, each pair once, a sorted by key (the grid's buffer, valid
+                until the next call).
+        """
+        result, seen = self._pairs, self._seen
+        result.clear()
+        tests = 0
+        cells, bounds, filters = self._cells, self._bounds, self._filters
+        keys = self._sorted.get(layer_a)
+        if keys is None: self._sorted[layer_a] = keys = sorted(self._layers.get(layer_a, ()))
+        for a in keys:
+            mask_a = filters[a][1]
+            if not mask_a & layer_b: continue
+            box_a, span = bounds[a], self._spans[a]
+            seen.clear()
+            for column in range(span[0], span[2] + 1):
+                for row in range(span[1], span[3] + 1):
+                    for b in cells.get((column, row), ()):
+                        if b == a or b in seen: continue
+                        seen.add(b)
+                        layer, mask = filters[b]
+                        if layer != layer_b or not mask & layer_a: continue
+                        tests += 1
+                        # Estricto (engine.collision): tocarse en un borde no es colisión
+                        if overlaps(box_a, bounds[b]): result.append((a, b))
+        self.tests = tests
+        return result
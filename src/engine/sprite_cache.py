@@ -0,0 +1,125 @@
+"""
+sprite_cache.py
+---------------
+LRU cache of scaled and flipped copies of the AssetManager's images.
+
+Classes:
+    SpriteCache: Returns sprites of an asset at a (quantized) size and orientation, scaling each one only once.
+"""
+
+from collections import OrderedDict
+import pygame
+
+class SpriteCache:
+    """
+    Cache of transformed sprites keyed by (asset, size, flip).
+
+    Requested sizes are rounded to a multiple of `quantum`, so sizes that keep changing
+    (paddles growing with powerups or shrinking by 5 px per hit) reuse a handful of entries
+    instead of scaling a new sprite every time. Sources much larger than what is drawn are
+    first reduced once to a base of at most `base_size` pixels, so a cache miss only scales
+    a small image.
+
+    Attributes:
+        assets (AssetManager): Source of the images.
+        max_entries (int): Maximum number of sprites kept; the least recently used is evicted.
+        quantum (int): Sizes are rounded to a multiple of this many pixels.
+        base_size (int): Longest side of the reduced copy sprites are scaled from.
+        hits (int): Sprites served from the cache.
+        misses (int): Sprites that had to be scaled.
+        evictions (int): Sprites dropped to respect max_entries.
+
+    Methods:
+        quantize(width, height) -> tuple:
+            Returns the size a sprite is actually drawn at.
+
+        get(asset_key, width, height, flip_x, flip_y) -> pygame.Surface:
+            Returns the sprite for an asset at a size and orientation.
+
+        clear():
+            Drops every cached sprite.
+
+        stats() -> dict:
+            Returns the cache counters for telemetry.
+    """
+    def __init__(self, assets, max_entries=64, quantum=4, base_size=256):
+        self.assets = assets
+        self.max_entries = max_entries
+        self.quantum = quantum
+        self.base_size = base_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sprites = OrderedDict()
+        self._bases = {}
+
+    def quantize(self, width, height):
+        """
+        Returns the size a sprite is actually drawn at.
+
+        Args:
+            width (float): Requested width.
+            height (float): Requested height.
+
+        Returns:
+            tuple: (width, height) rounded to the nearest multiple of quantum.
+        """
+        q = self.quantum
+        return max(q, int(round(width / q)) * q), max(q, int(round(height / q)) * q)
+
+    def get(self, asset_key, width, height, flip_x=False, flip_y=False):
+        """
+        Returns the sprite for an asset at a size and orientation, scaling it on a miss.
+
+        Args:
+            asset_key (str): Key of a loaded image in the AssetManager.
+            width (float): Requested width.
+            height (float): Requested height.
+            flip_x (bool): Mirror horizontally.
+            flip_y (bool): Mirror vertically.
+
+        Returns:
+            pygame.Surface: The sprite, of size quantize(width, height). Callers must not modify it.
+        """
+        size = self.quantize(width, height)
+        key = (asset_key, size, flip_x, flip_y)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        source = self._source(asset_key, size)
+        sprite = pygame.transform.smoothscale(source, size)
+        if flip_x or flip_y: sprite = pygame.transform.flip(sprite, flip_x, flip_y)
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def _source(self, asset_key, size):
+        """Returns the reduced base of an asset, or the full image for sizes larger than the base."""
+        image = self.assets.get(asset_key)
+        if max(size) > self.base_size: return image
+        base = self._bases.get(asset_key)
+        if base is None or base[0] is not image:
+            width, height = image.get_size()
+            factor = min(1.0, self.base_size / max(width, height))
+            base = (image, pygame.transform.smoothscale(image, (max(1, round(width * factor)), max(1, round(height * factor)))))
+            self._bases[asset_key] = base
+        return base[1]
+
+    def clear(self):
+        """Drops every cached sprite."""
+        self._sprites.clear()
+        self._bases.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: entries, hits, misses and evictions.
+        """
+        return {'entries': len(self._sprites), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
@@ -0,0 +1,104 @@
+"""
+system_scheduler.py
+-------------------
+Runs ECS systems at their own update rates inside the frame loop.
+
+Classes:
+    ScheduledSystem: A system callback with its update interval and accumulated time.
+    SystemScheduler: Calls each registered system when its interval has elapsed.
+"""
+
+class ScheduledSystem:
+    """
+    A system callback registered in the SystemScheduler.
+
+    Attributes:
+        name (str): Identifier of the system.
+        callback (callable): Function called with the accumulated dt (in seconds).
+        interval (float): Seconds between updates, or 0 to run every frame.
+        condition (callable): Optional predicate; while it returns False the system is paused.
+        accumulated (float): Time elapsed since the last update.
+        runs (int): Number of times the system has been updated.
+    """
+    def __init__(self, name, callback, rate_hz=None, condition=None):
+        self.name = name
+        self.callback = callback
+        self.interval = 1.0 / rate_hz if rate_hz else 0.0
+        self.condition = condition
+        self.accumulated = 0.0
+        self.runs = 0
+
+class SystemScheduler:
+    """
+    Calls registered systems in order, each one at its own update rate.
+
+    Systems without a rate run every frame. A system with a rate accumulates the frame
+    dt while it is skipped and receives the whole accumulated time when it runs, so
+    time-based logic stays correct. While a system's condition is False its accumulated
+    time is discarded (the simulation it belongs to is frozen).
+
+    Attributes:
+        systems (list): Registered ScheduledSystem instances, in execution order.
+
+    Methods:
+        add(name, callback, rate_hz, condition) -> ScheduledSystem:
+            Registers a system.
+
+        update(dt):
+            Advances all systems by dt, running those whose interval has elapsed.
+
+        pending(name) -> float:
+            Returns the time accumulated by a system since its last update.
+    """
+    def __init__(self):
+        self.systems = []
+        self._by_name = {}
+
+    def add(self, name, callback, rate_hz=None, condition=None):
+        """
+        Registers a system.
+
+        Args:
+            name (str): Identifier of the system.
+            callback (callable): Function receiving the accumulated dt in seconds.
+            rate_hz (float): Updates per second, or None to run every frame.
+            condition (callable): Optional predicate that must be True for the system to run.
+
+        Returns:
+            ScheduledSystem: The registered entry.
+        """
+        entry = ScheduledSystem(name, callback, rate_hz, condition)
+        self.systems.append(entry)
+        self._by_name[name] = entry
+        return entry
+
+    def update(self, dt):
+        """
+        Advances all systems by dt, running those whose interval has elapsed.
+
+        Args:
+            dt (float): Delta time since last frame.
+        """
+        for entry in self.systems:
+            if entry.condition and not entry.condition():
+                entry.accumulated = 0.0
+                continue
+            entry.accumulated += dt
+            if entry.accumulated >= entry.interval:
+                step, entry.accumulated = entry.accumulated, 0.0
+                entry.callback(step)
+                entry.runs += 1
+
+    def pending(self, name):
+        """
+        Returns the time accumulated by a system since its last update.
+        Render code uses it to extrapolate state of systems running below the frame rate.
+
+        Args:
+            name (str): Identifier of the system.
+
+        Returns:
+            float: Seconds since the system last ran (0 if unknown).
+        """
+        entry = self._by_name.get(name)
+        return entry.accumulated if entry else 0.0
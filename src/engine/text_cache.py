@@ -0,0 +1,164 @@
+"""
+text_cache.py
+-------------
+Shared font and text surface caches, so text is only rasterized when it changes.
+
+Classes:
+    TextCache: LRU cache of rendered text surfaces keyed by (font, text, colour).
+    GlyphAtlas: Pre-rendered glyphs (digits by default) composed by blitting, without rasterizing.
+
+Functions:
+    get_font(size, path, source): Returns a shared pygame Font for the given file and size.
+
+Module attributes:
+    text_cache (TextCache): Shared instance used by the render systems.
+"""
+
+from collections import OrderedDict
+import pygame
+
+_fonts = {}
+
+def get_font(size, path=None, source=None):
+    """
+    Returns a shared pygame Font, creating it the first time it is requested.
+
+    Args:
+        size (int): Font size.
+        path (str): Path of a font file, or None for pygame's default font.
+        source: Optional file object with the font data (e.g. from the asset archive),
+            used instead of opening path. The font is still cached under path.
+
+    Returns:
+        pygame.font.Font: The cached font.
+    """
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(source if source is not None else path, size)
+    return font
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces.
+
+    Attributes:
+        max_entries (int): Maximum number of surfaces kept; the least recently used is evicted.
+        hits (int): Number of renders served from the cache.
+        misses (int): Number of renders that had to rasterize text.
+
+    Methods:
+        render(text, size, color, path) -> pygame.Surface:
+            Returns the surface for the text, rasterizing it only if it is not cached.
+
+        clear():
+            Drops every cached surface.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, text, size, color, path=None):
+        """
+        Returns the surface for the text, rasterizing it only if it is not cached.
+
+        Args:
+            text (str): Text to render.
+            size (int): Font size.
+            color: Text colour (RGB tuple or pygame colour name).
+            path (str): Font file, or None for pygame's default font.
+
+        Returns:
+            pygame.Surface: The rendered text. Callers must not modify it.
+        """
+        key = (path, size, text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = get_font(size, path).render(text, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        """Drops every cached surface."""
+        self._surfaces.clear()
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs for a font, size and colour. Strings made of those characters
+    (scores, counters) are drawn by blitting glyphs, so nothing is rasterized per frame.
+
+    Attributes:
+        glyphs (dict): Maps each character to its rendered surface.
+        height (int): Height of the glyphs.
+
+    Methods:
+        size(text) -> tuple:
+            Returns the (width, height) the text will occupy.
+
+        layout(text, center) -> list:
+            Returns the (glyph, position) blit sequence for the text.
+
+        draw(surface, text, center) -> pygame.Rect:
+            Draws the text centred on the given point.
+    """
+    def __init__(self, size, color, path=None, chars='0123456789'):
+        font = get_font(size, path)
+        self.glyphs = {c: font.render(c, True, color) for c in chars}
+        self.height = font.get_height()
+
+    def size(self, text):
+        """
+        Returns the (width, height) the text will occupy.
+
+        Args:
+            text (str): Text made of characters present in the atlas.
+        """
+        return sum(self.glyphs[c].get_width() for c in text), self.height
+
+    def layout(self, text, center):
+        """
+        Returns the (glyph, position) blit sequence for the text centred on the given point.
+
+        Args:
+            text (str): Text made of characters present in the atlas.
+            center (tuple): (x, y) centre of the text.
+
+        Returns:
+            list: (pygame.Surface, (x, y)) pairs, usable with Surface.blits or a RenderQueue.
+        """
+        width, height = self.size(text)
+        x, y = int(center[0] - width / 2), int(center[1] - height / 2)
+        blit_sequence = []
+        for c in text:
+            glyph = self.glyphs[c]
+            blit_sequence.append((glyph, (x, y)))
+            x += glyph.get_width()
+        return blit_sequence
+
+    def draw(self, surface, text, center):
+        """
+        Draws the text centred on the given point.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            text (str): Text made of characters present in the atlas.
+            center (tuple): (x, y) centre of the text.
+
+        Returns:
+            pygame.Rect: Area covered by the text.
+        """
+        width, height = self.size(text)
+        blit_sequence = self.layout(text, center)
+        surface.blits(blit_sequence, doreturn=False)
+        x, y = blit_sequence[0][1] if blit_sequence else (int(center[0]), int(center[1]))
+        return pygame.Rect(x, y, width, height)
+
+text_cache = TextCache()
@@ -0,0 +1,401 @@
+"""
+ui.py
+-----
+Retained-mode UI layer shared by the menus, the options and pause screens and the game HUD.
+
+Screens are built once as a tree of widgets. Widgets are indexed in a uniform grid (the
+same SpatialHash the collision broadphase uses, without layers), so hit-testing only
+looks at the few widgets in the cell under the cursor, and events are
+routed only to the widget they concern (the one under the cursor, the one being pressed,
+or the one with keyboard focus). A widget redraws only when its state changes: the root
+keeps the composed screen and repaints just the changed areas.
+
+Classes:
+    Widget: Base widget; a node of the tree with a rect, a state and event hooks.
+    Label: Static text.
+    Button: Clickable button with normal / hover / pressed colours.
+    UIRoot: Root of a widget tree; routes events and composes the screen.
+"""
+
+from operator import attrgetter
+import pygame
+from engine.render_pipeline import get_mouse_pos
+from engine.text_cache import text_cache
+from engine.spatial_hash import SpatialHash
+
+class Widget:
+    """
+    Base widget. Children are drawn after (on top of) their parent and receive events first.
+
+    Attributes:
+        rect (pygame.Rect): Area of the widget in screen coordinates.
+        children (list): Child widgets, in drawing order.
+        parent (Widget): Parent widget, or None.
+        root (UIRoot): Root of the tree the widget belongs to, or None.
+        state (str): Visual state ('normal', 'hover', 'pressed', or widget specific).
+        visible (bool): Hidden widgets are neither drawn nor hit.
+        interactive (bool): True if the widget receives mouse events.
+        order (int): Position in the drawing order, assigned by the root.
+
+    Methods:
+        add(child) -> Widget:
+            Appends a child widget and returns it.
+
+        set_state(state):
+            Changes the visual state, scheduling a redraw if it differs.
+
+        invalidate():
+            Schedules a redraw of the widget.
+
+        render(surface):
+            Draws the widget; overridden by subclasses.
+
+        on_hover(hovered), on_press(), on_release(), on_click(), on_key(event), on_blur():
+            Event hooks called by the root.
+    """
+    interactive = False
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.children = []
+        self.parent = None
+        self.root = None
+        self.state = 'normal'
+        self.visible = True
+        self.order = 0
+
+    def add(self, child):
+        """
+        Appends a child widget.
+
+        Args:
+            child (Widget): Widget to add.
+
+        Returns:
+            Widget: The child, for chaining.
+        """
+        child.parent = self
+        self.children.append(child)
+        if self.root: self.root.needs_layout = True
+        return child
+
+    def walk(self):
+        """Yields the widget and all its descendants in drawing order."""
+        yield self
+        for child in self.children: yield from child.walk()
+
+    def set_state(self, state):
+        """
+        Changes the visual state, scheduling a redraw if it differs.
+
+        Args:
+            state (str): New state.
+        """
+        if state != self.state:
+            self.state = state
+            self.invalidate()
+
+    def invalidate(self):
+        """Schedules a redraw of the widget's area."""
+        if self.root: self.root.mark_dirty(self.rect)
+
+    def render(self, surface):
+        """Draws the widget on the surface. Overridden by subclasses."""
+        pass
+
+    def on_hover(self, hovered):
+        """Called when the cursor enters (True) or leaves (False) the widget."""
+        if self.state != 'pressed' or not hovered: self.set_state('hover' if hovered else 'normal')
+
+    def on_press(self):
+        """Called when the left button is pressed on the widget."""
+        self.set_state('pressed')
+
+    def on_release(self, inside):
+        """Called when the left button is released after pressing the widget."""
+        self.set_state('hover' if inside else 'normal')
+
+    def on_click(self):
+        """Called when the left button is pressed and released on the widget."""
+        pass
+
+    def on_key(self, event):
+        """
+        Called with KEYDOWN events while the widget has keyboard focus.
+
+        Returns:
+            bool: True if the event was consumed.
+        """
+        return False
+
+    def on_blur(self):
+        """Called when the widget loses keyboard focus."""
+        pass
+
+class Label(Widget):
+    """
+    Static text. Its rect is the rendered text's rect, placed with pygame.Rect keyword
+    arguments (e.g. centerx=400, y=50 or center=(400, 300)).
+
+    Attributes:
+        text (str): Text displayed.
+        size (int): Font size.
+        color: Text colour.
+        path (str): Font file, or None for the default font.
+    """
+    def __init__(self, text, size, color, path=None, **position):
+        self.text, self.size, self.color, self.path = text, size, color, path
+        self._position = position
+        super().__init__(self._surface().get_rect(**position))
+
+    def _surface(self):
+        return text_cache.render(self.text, self.size, self.color, self.path)
+
+    def set_text(self, text):
+        """Changes the text, redrawing both the old and the new area."""
+        if text == self.text: return
+        self.invalidate()
+        self.text = text
+        self.rect = self._surface().get_rect(**self._position)
+        if self.root: self.root.needs_layout = True
+        self.invalidate()
+
+    def render(self, surface):
+        surface.blit(self._surface(), self.rect)
+
+class Button(Widget):
+    """
+    Clickable button with a text label.
+
+    Attributes:
+        text (str): Label text.
+        on_click_action (callable): Called without arguments when the button is clicked.
+        colors (tuple): Fill colours for the (normal, hover, pressed) states.
+        text_size (int): Font size of the label.
+        text_color: Colour of the label.
+        border_color: Colour of a 2 px outline, or None.
+        border_radius (int): Radius of the rounded corners.
+    """
+    interactive = True
+
+    def __init__(self, rect, text, on_click, colors=((41, 128, 185), (52, 152, 219), (35, 110, 155)),
+                 text_size=40, text_color=(236, 240, 241), border_color=None, border_radius=12):
+        super().__init__(rect)
+        self.text = text
+        self.on_click_action = on_click
+        self.colors = colors
+        self.text_size = text_size
+        self.text_color = text_color
+        self.border_color = border_color
+        self.border_radius = border_radius
+
+    def on_click(self):
+        if self.on_click_action: self.on_click_action()
+
+    def render(self, surface):
+        color = self.colors[('normal', 'hover', 'pressed').index(self.state)]
+        pygame.draw.rect(surface, color, self.rect, border_radius=self.border_radius)
+        if self.border_color: pygame.draw.rect(surface, self.border_color, self.rect, 2, border_radius=self.border_radius)
+        text_surf = text_cache.render(self.text, self.text_size, self.text_color)
+        text_rect = text_surf.get_rect(center=self.rect.center)
+        if self.state == 'pressed': text_rect.y += 2
+        surface.blit(text_surf, text_rect)
+
+class UIRoot(Widget):
+    """
+    Root of a widget tree. Keeps the spatial index, routes events and composes the screen.
+
+    In retained mode (menus) the root owns a surface holding the composed screen: it is
+    painted once, and afterwards only the areas of widgets whose state changed are
+    repainted (background plus the widgets overlapping the area, found through the index).
+    Each frame that surface is blitted to the target. In immediate mode (the game HUD)
+    the widgets are drawn straight onto the target every frame.
+
+    Attributes:
+        background: Colour (RGB, or RGBA for a translucent overlay), a pygame.Surface
+            (e.g. a frozen frame) or None for a transparent root.
+        retained (bool): True to keep and partially repaint a composed surface.
+        index (SpatialHash): Grid of every visible widget in the tree.
+        focus (Widget): Widget receiving KEYDOWN events, or None.
+        hovered (Widget): Interactive widget under the cursor, or None.
+        needs_layout (bool): True when the tree changed and the index must be rebuilt.
+        redraws (int): Number of partial repaints done (for telemetry and tests).
+
+    Methods:
+        layout():
+            Rebuilds the drawing order and the spatial index.
+
+        hit(pos) -> Widget:
+            Returns the topmost interactive widget at a point.
+
+        set_focus(widget):
+            Gives keyboard focus to a widget (or None).
+
+        handle_events(events) -> list:
+            Routes events to widgets and returns the ones they did not consume.
+
+        mark_dirty(rect):
+            Schedules a repaint of an area.
+
+        draw(target) -> list:
+            Draws the UI on the target and returns the rects repainted this frame.
+    """
+    def __init__(self, size, background=None, retained=True, cell_size=64):
+        super().__init__((0, 0) + tuple(size))
+        self.root = self
+        self.background = background
+        self.retained = retained
+        self.index = SpatialHash(cell_size)
+        self.focus = None
+        self.hovered = None
+        self.needs_layout = True
+        self.redraws = 0
+        self._pressed = None
+        self._surface = None
+        self._dirty = {}
+
+    def layout(self):
+        """Rebuilds the drawing order and the spatial index, and syncs the hovered widget."""
+        self.index.clear()
+        for order, widget in enumerate(self.walk()):
+            widget.root, widget.order = self, order
+            if widget is not self and widget.visible and widget.rect.width and widget.rect.height:
+                self.index.update(widget, *widget.rect)
+        self.needs_layout = False
+        self._set_hovered(self.hit(get_mouse_pos()))
+
+    def hit(self, pos):
+        """
+        Returns the topmost interactive widget at a point.
+
+        Args:
+            pos (tuple): (x, y) in screen coordinates.
+
+        Returns:
+            Widget or None.
+        """
+        best = None
+        # Un área de 1x1 solapa (estrictamente) los mismos widgets que collidepoint
+        for widget in self.index.query(pos[0], pos[1], 1, 1):
+            if widget.interactive and widget.visible and (best is None or widget.order > best.order):
+                best = widget
+        return best
+
+    def _set_hovered(self, widget):
+        if widget is self.hovered: return
+        if self.hovered: self.hovered.on_hover(False)
+        self.hovered = widget
+        if widget:
+            if widget is self._pressed: widget.set_state('pressed')
+            else: widget.on_hover(True)
+
+    def set_focus(self, widget):
+        """
+        Gives keyboard focus to a widget, taking it from the previous one.
+
+        Args:
+            widget (Widget): New focus, or None.
+        """
+        if widget is self.focus: return
+        if self.focus: self.focus.on_blur()
+        self.focus = widget
+
+    def handle_events(self, events):
+        """
+        Routes mouse events to the widget under the cursor (or the one being pressed) and
+        KEYDOWN events to the focused widget.
+
+        Args:
+            events (list): Pygame events, with positions in internal coordinates.
+
+        Returns:
+            list: Events no widget consumed (the scene handles them, e.g. ESC).
+        """
+        if self.needs_layout: self.layout()
+        unhandled = []
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                self._set_hovered(self.hit(event.pos))
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                target = self.hit(event.pos)
+                self._set_hovered(target)
+                if self.focus is not None and self.focus is not target: self.set_focus(None)
+                if target is None: unhandled.append(event); continue
+                self._pressed = target
+                target.on_press()
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                target = self.hit(event.pos)
+                pressed, self._pressed = self._pressed, None
+                if pressed is None: unhandled.append(event); continue
+                pressed.on_release(pressed is target)
+                if pressed is target: pressed.on_click()
+            elif event.type == pygame.KEYDOWN and self.focus is not None and self.focus.on_key(event):
+                continue
+            else:
+                unhandled.append(event)
+        return unhandled
+
+    def mark_dirty(self, rect):
+        """
+        Schedules a repaint of an area in retained mode.
+
+        Args:
+            rect (pygame.Rect): Area to repaint.
+        """
+        # Un widget que cambia varias veces en el mismo frame se repinta una sola vez
+        if self.retained: self._dirty.setdefault(tuple(rect), pygame.Rect(rect))
+
+    def _paint_background(self, surface, area=None):
+        if isinstance(self.background, pygame.Surface): surface.blit(self.background, area or (0, 0), area)
+        elif self.background is not None: surface.fill(self.background, area)
+        elif area is not None: surface.fill((0, 0, 0, 0), area)
+
+    def _compose(self, target):
+        translucent = self.background is None or (not isinstance(self.background, pygame.Surface) and len(self.background) == 4)
+        self._surface = pygame.Surface(target.get_size(), pygame.SRCALPHA if translucent else 0)
+        if pygame.display.get_surface() is not None:
+            self._surface = self._surface.convert_alpha() if translucent else self._surface.convert()
+        self._paint_background(self._surface)
+        for widget in self.walk():
+            if widget is not self and widget.visible: widget.render(self._surface)
+        self._dirty.clear()
+
+    def draw(self, target):
+        """
+        Draws the UI on the target.
+
+        Args:
+            target (pygame.Surface): Surface to draw on.
+
+        Returns:
+            list: Rects repainted this frame (retained mode), or drawn (immediate mode).
+        """
+        if self.needs_layout: self.layout()
+        if not self.retained:
+            drawn = []
+            for widget in self.walk():
+                if widget is not self and widget.visible:
+                    widget.render(target)
+                    drawn.append(widget.rect)
+            return drawn
+        if self._surface is None or self._surface.get_size() != target.get_size():
+            self._compose(target)
+            repainted = [self.rect]
+        else:
+            repainted = list(self._dirty.values())
+            self._dirty.clear()
+            surface = self._surface
+            for area in repainted:
+                # Solo se repinta el área que cambió: fondo más los widgets que la tocan
+                surface.set_clip(area)
+                self._paint_background(surface, area)
+                for widget in sorted(self.index.query(*area), key=attrgetter('order')):
+                    if widget.visible: widget.render(surface)
+                surface.set_clip(None)
+                self.redraws += 1
+        target.blit(self._surface, (0, 0))
+        return repainted
+
+    def invalidate(self):
+        """Forces the whole screen to be composed again on the next draw."""
+        self._surface = None
@@ -13,6 +13,8 @@ class BaseScene:
 
     Attributes:
         game: Reference to the main game object, providing access to screen, world, game_state_manager, etc.
+        covers_screen (bool): True if draw() paints every pixel, so the game loop can skip clearing the screen.
+        background (pygame.Surface): When pushed as an overlay, the frozen (pre-dimmed) frame of the scene underneath.
 
     Methods:
         setup():
@@ -21,6 +23,9 @@ class BaseScene:
         cleanup():
             Called once when the scene is deactivated. Clean up entities here.
 
+        resume():
+            Called when an overlay pushed on top of the scene is popped.
+
         handle_events(events):
             Handles the list of Pygame events each frame.
 
@@ -28,10 +33,13 @@ class BaseScene:
             Updates the scene logic each frame.
 
         draw(screen):
-            Draws the scene to the screen.
+            Draws the scene to the screen. May return the list of rects it drew.
     """
+    covers_screen = False
+
     def __init__(self, game):
         self.game = game # Proporciona acceso a screen, world, game_state_manager, etc.
+        self.background = None
     
     def setup(self):
         """Called once when the scene becomes active. Create entities and systems here."""
@@ -41,6 +49,10 @@ class BaseScene:
         """Called once when the scene is deactivated. Clean up entities here."""
         pass
 
+    def resume(self):
+        """Called when an overlay pushed on top of the scene is popped; the events it handled were not seen here."""
+        pass
+
     def handle_events(self, events):
         """Handles the list of Pygame events each frame."""
         pass
@@ -50,5 +62,11 @@ class BaseScene:
         pass
 
     def draw(self, screen):
-        """Draws the scene to the screen."""
-        pass
+        """
+        Draws the scene to the screen.
+
+        Returns:
+            list: Rects drawn this frame, used by the dirty-rect renderer. Returning
+            None (the default) means the whole screen was drawn.
+        """
+        return None
@@ -7,17 +7,39 @@ Classes:
     Game: Handles initialization, scene management, and the main game loop.
 """
 
+import os
+import time
 import pygame
 import sys
 from utils.game_state import GameState
 from engine.game_state_manager import GameStateManager
 from engine.ecs_world import ECSWorld
+from engine.gc_policy import GCPolicy
+from engine.quality_controller import QualityController
+from engine.dirty_rect_renderer import DirtyRectRenderer
+from engine.scene_stack import SceneStack
+from engine.render_pipeline import RenderPipeline
+from engine.asset_manager import AssetManager
+from engine.asset_archive import AssetArchive
+from engine.sprite_cache import SpriteCache
+from engine.frame_recorder import FrameRecorder
+from engine.alloc_counter import AllocationCounter
+from engine.latency_probe import InputLatencyProbe
 from config.config_manager import ConfigManager
+from scenes.loading_scene import LoadingScene
 from scenes.menu.main_menu_scene import MainMenuScene
 from scenes.game_scene import GameScene
 from scenes.options_escene import OptionsScene
 from scenes.pause_scene import PauseScene
-from utils.utils import SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_BACKGROUND
+from utils.utils import COLOR_BACKGROUND, TARGET_FPS, ASSETS_DIR, ASSET_ARCHIVE_PATH
+
+# Estados en los que se está jugando una partida (el GC automático queda diferido)
+GAMEPLAY_STATES = (
+    GameState.JUGANDO_SINGLE_PLAYER,
+    GameState.JUGANDO_TWO_PLAYERS,
+    GameState.JUGANDO_SHRINK_MODE,
+    GameState.JUGANDO_MULTI_BALL
+)
 
 class Game:
     """
@@ -25,50 +47,124 @@ class Game:
     and running the main game loop.
 
     Attributes:
-        screen_width (int): Width of the game window.
-        screen_height (int): Height of the game window.
-        screen (pygame.Surface): The main display surface.
+        screen_width (int): Width of the internal render resolution.
+        screen_height (int): Height of the internal render resolution.
+        pipeline (RenderPipeline): Owns the window and presents the internal render target.
+        screen (pygame.Surface): The render target every scene draws on.
         clock (pygame.time.Clock): Controls the frame rate.
         running (bool): Indicates if the game loop is running.
         world (ECSWorld): The ECS world instance.
         game_state_manager (GameStateManager): Manages current and previous game states.
+        assets (AssetManager): Shared images and fonts; the game starts on the loading scene.
+        sprites (SpriteCache): Scaled and flipped copies of the images, shared by every scene.
         config_manager (ConfigManager): Handles game configuration and controls.
-        current_scene: The currently active scene.
+        gc_policy (GCPolicy): Controls when the garbage collector runs and records its pauses.
+        quality (QualityController): Scales optional visual work to hold the frame budget.
+        dirty_renderer (DirtyRectRenderer): Partial screen updates, or None if disabled in the graphics config.
+        scene_stack (SceneStack): Active scenes; the pause menu is pushed as an overlay on the game scene.
+        recorder (FrameRecorder): Active gameplay recording, or None.
+        alloc_counter (AllocationCounter): Heap growth of each gameplay frame, or None if disabled in the debug config.
+        latency_probe (InputLatencyProbe): Input-to-flip latency, or None if disabled in the input config.
+        current_scene: The currently active scene (top of the scene stack).
         previous_game_state: Stores the previous game state for pause transitions.
         scenes (dict): Maps game states to scene instances.
 
     Methods:
         run():
             Main game loop. Handles scene transitions, events, updates, and rendering.
+
+        poll_events() -> list:
+            Reads the event queue and handles the global events (before or after the limiter's sleep).
+
+        start_recording() / stop_recording():
+            Starts or stops recording gameplay frames (also toggled with the capture key).
+
+        get_telemetry() -> dict:
+            Returns runtime statistics collected during the session.
     """
     def __init__(self):
         pygame.init()
-        # Usamos las constantes de utils.py
-        self.screen_width = SCREEN_WIDTH
-        self.screen_height = SCREEN_HEIGHT
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.config_manager = ConfigManager()
+        graphics = self.config_manager.graphics
+        self.pipeline = RenderPipeline(
+            graphics['internal_resolution'], graphics['window_size'], graphics['scale_mode'],
+            graphics['fullscreen'], graphics['doublebuf'], graphics['vsync']
+        )
+        # Los sistemas solo conocen la resolución interna, nunca el tamaño de la ventana
+        self.screen = self.pipeline.target
+        self.screen_width, self.screen_height = self.screen.get_size()
         pygame.display.set_caption("Mi Juego Modular")
         self.clock = pygame.time.Clock()
         self.running = True
 
         self.world = ECSWorld()
-        self.game_state_manager = GameStateManager()
-        self.config_manager = ConfigManager()
+        self.game_state_manager = GameStateManager(GameState.CARGANDO)
+        # Si los recursos están empaquetados se leen del archivo mapeado en memoria
+        self.assets = AssetManager(archive=AssetArchive.open_if_exists(ASSET_ARCHIVE_PATH, ASSETS_DIR))
+        self.sprites = SpriteCache(self.assets)
+        self.gc_policy = GCPolicy()
+        self.quality = QualityController(TARGET_FPS)
+        self.dirty_renderer = DirtyRectRenderer(COLOR_BACKGROUND, self.pipeline.present) if self.config_manager.graphics['dirty_rects'] else None
+        debug = self.config_manager.debug
+        self.alloc_counter = AllocationCounter(trace=debug['trace_allocations']) if debug['allocations'] else None
+        self.latency_probe = InputLatencyProbe() if self.config_manager.input['measure_latency'] else None
         
+        self.scene_stack = SceneStack()
+        self.recorder = None
+        self._recording_stats = None
         self.current_scene = None
         self.previous_game_state = None
 
         self.scenes = {
+            GameState.CARGANDO: LoadingScene(self),
             GameState.MENU_PRINCIPAL: MainMenuScene(self),
             GameState.JUGANDO_SINGLE_PLAYER: GameScene(self, num_players=1, mode='classic'),
             GameState.JUGANDO_TWO_PLAYERS: GameScene(self, num_players=2, mode='classic'),
             GameState.JUGANDO_SHRINK_MODE: GameScene(self, num_players=1, mode='shrink'),
+            GameState.JUGANDO_MULTI_BALL: GameScene(self, num_players=1, mode='multiball'),
             GameState.OPCIONES: OptionsScene(self),
             GameState.PAUSA: PauseScene(self)
         }
         
-        self.current_scene = self.scenes[self.game_state_manager.state]
-        self.current_scene.setup()
+        self.scene_stack.replace(self.scenes[self.game_state_manager.state])
+        self.current_scene = self.scene_stack.top
+        # La escena inicial ya está activa: el bucle no debe volver a prepararla
+        self.game_state_manager.previous_state = self.game_state_manager.state
+        self.gc_policy.scene_ready(self.game_state_manager.state in GAMEPLAY_STATES)
+        if self.config_manager.capture['enabled']: self.start_recording()
+
+    def start_recording(self):
+        """Starts recording gameplay frames into a new timestamped directory."""
+        if self.recorder: return
+        capture = self.config_manager.capture
+        output_dir = os.path.join(capture['output_dir'], time.strftime('%Y%m%d_%H%M%S'))
+        self.recorder = FrameRecorder(output_dir, self.screen.get_size(), capture['format'], capture['max_queue'], TARGET_FPS, capture['every'])
+        print(f"Grabando en {output_dir}")
+
+    def stop_recording(self):
+        """Stops the recording, waiting for the queued frames to be written."""
+        if not self.recorder: return
+        self.recorder.stop()
+        self._recording_stats = self.recorder.stats()
+        print(f"Grabación: {self._recording_stats['written']} frames escritos, {self._recording_stats['dropped']} descartados")
+        self.recorder = None
+
+    def poll_events(self):
+        """
+        Reads the event queue, handles the global events (quit, recording key) and
+        returns the events mapped to the internal resolution.
+
+        Returns:
+            list: The events for the current scene.
+        """
+        events = [self.pipeline.map_event(event) for event in pygame.event.get()]
+        if self.latency_probe: self.latency_probe.sample(events)
+        for event in events:
+            if event.type == pygame.QUIT: self.running = False
+            if event.type == pygame.KEYDOWN and event.key == self.config_manager.capture['toggle_key']:
+                if self.recorder: self.stop_recording()
+                else: self.start_recording()
+        return events
 
     def run(self):
         """
@@ -80,40 +176,77 @@ class Game:
 
             if current_state != previous_state:
                 if current_state == GameState.PAUSA:
+                    # La pausa se apila sobre la partida: el último frame se congela y oscurece una sola vez
                     self.previous_game_state = previous_state
-                    self.current_scene = self.scenes[GameState.PAUSA]
-                    self.current_scene.setup()
+                    self.scene_stack.push(self.scenes[GameState.PAUSA], self.screen, overlay=True, dim=180)
                 elif previous_state == GameState.PAUSA:
-                    self.scenes[GameState.PAUSA].cleanup()
+                    self.scene_stack.pop()
                     if current_state == GameState.MENU_PRINCIPAL:
-                        self.scenes[self.previous_game_state].cleanup()
-                        self.current_scene = self.scenes[GameState.MENU_PRINCIPAL]
-                        self.current_scene.setup()
-                    else:
-                        self.current_scene = self.scenes[current_state]
-                else:
-                    if previous_state is not None: self.scenes[previous_state].cleanup()
-                    self.current_scene = self.scenes[current_state]
-                    self.current_scene.setup()
+                        self.scene_stack.replace(self.scenes[GameState.MENU_PRINCIPAL])
+                elif current_state != GameState.SALIR:
+                    self.scene_stack.replace(self.scenes[current_state])
+                self.current_scene = self.scene_stack.top
+                # Cambio de escena: momento seguro para recolectar y congelar los objetos de larga vida
+                self.gc_policy.scene_ready(current_state in GAMEPLAY_STATES)
             
             self.game_state_manager.previous_state = current_state
             if current_state == GameState.SALIR: self.running = False; continue
             
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT: self.running = False
-
-            dt = self.clock.tick(60) / 1000.0
-            self.screen.fill(COLOR_BACKGROUND)
+            # Muestreo tardío: la cola se lee al despertar del limitador, justo antes de simular,
+            # y no antes de dormir; lo que se pulsa durante la espera entra en este frame
+            late_sampling = self.config_manager.input['late_sampling']
+            if not late_sampling: events = self.poll_events()
+            dt = self.clock.tick(TARGET_FPS) / 1000.0
+            if late_sampling: events = self.poll_events()
+            # get_rawtime() excluye la espera del limitador: es el trabajo real del frame anterior
+            self.quality.record_frame(self.clock.get_rawtime())
+            if self.dirty_renderer: self.dirty_renderer.clear(self.screen)
+            elif not self.current_scene.covers_screen: self.screen.fill(COLOR_BACKGROUND)
 
+            # Las escenas que lo soportan devuelven las áreas dibujadas; None = pantalla completa
+            dirty_rects = None
             if current_state == GameState.PAUSA:
-                self.scenes[self.previous_game_state].draw(self.screen)
                 self.current_scene.handle_events(events)
                 self.current_scene.draw(self.screen)
             elif self.current_scene:
+                # Solo se mide el trabajo de la escena: eventos, simulación y dibujo de la partida
+                measured = self.alloc_counter and current_state in GAMEPLAY_STATES
+                if measured: self.alloc_counter.begin_frame()
                 self.current_scene.handle_events(events)
                 self.current_scene.update(dt)
-                self.current_scene.draw(self.screen)
+                dirty_rects = self.current_scene.draw(self.screen)
+                if measured: self.alloc_counter.end_frame()
 
-            pygame.display.flip()
+            # La copia es inmediata; si el codificador va atrasado el frame se descarta, nunca se espera
+            if self.recorder and current_state in GAMEPLAY_STATES: self.recorder.capture(self.screen)
+            if self.dirty_renderer: self.dirty_renderer.present(self.screen, dirty_rects)
+            else: self.pipeline.present()
+            if self.latency_probe: self.latency_probe.presented()
+            self.gc_policy.end_frame()
+        self.gc_policy.shutdown()
+        self.assets.shutdown()
+        self.stop_recording()
+        gc_stats = self.gc_policy.stats()
+        print(f"GC: {gc_stats['count']} pausas, total {gc_stats['total_ms']:.2f} ms, máx {gc_stats['max_ms']:.2f} ms")
+        if self.latency_probe and self.latency_probe.events:
+            latency = self.latency_probe.stats()
+            print(f"Latencia de entrada: {latency['events']} eventos, p50 {latency['p50_ms']:.1f} ms, p99 {latency['p99_ms']:.1f} ms, máx {latency['max_ms']:.1f} ms")
+        if self.alloc_counter:
+            alloc_stats = self.alloc_counter.stats()
+            print(f"Memoria: {alloc_stats['frames']} frames, crecimiento total {alloc_stats['total_growth']} bloques, máx {alloc_stats['max_growth']} por frame")
+            self.alloc_counter.stop()
         pygame.quit(); sys.exit()
+
+    def get_telemetry(self):
+        """
+        Returns runtime statistics collected during the session.
+
+        Returns:
+            dict: Telemetry grouped by subsystem.
+        """
+        telemetry = {'gc': self.gc_policy.stats(), 'quality': self.quality.stats(), 'sprites': self.sprites.stats()}
+        if self.dirty_renderer: telemetry['dirty_rects'] = self.dirty_renderer.stats()
+        if self.recorder or self._recording_stats: telemetry['capture'] = self.recorder.stats() if self.recorder else self._recording_stats
+        if self.alloc_counter: telemetry['allocations'] = self.alloc_counter.stats()
+        if self.latency_probe: telemetry['input_latency'] = self.latency_probe.stats()
+        return telemetry
@@ -7,12 +7,20 @@ effects, and input.
 
 Classes:
     GameScene: Handles the creation and management of game entities and systems for gameplay.
+
+Functions:
+    create_paddle(world, x, y, *components) -> int: Creates a paddle entity.
+    create_ball(world, x, y, vx, vy, *components) -> int: Creates a ball entity.
 """
+import math
 import pygame
 from scenes.base_scene import BaseScene
 from systems.environment import BallBoundarySystem
 from systems.score import ScoringSystem
 from utils.game_state import GameState
+from engine.system_scheduler import SystemScheduler
+from engine.render_queue import RenderQueue
+from engine.ui import UIRoot, Widget
 
 # Importamos todos los componentes y sistemas que usaremos
 from components.menu_components import PositionComponent, DimensionsComponent
@@ -22,11 +30,74 @@ from components.effects_components import *
 from systems.game_systems import *
 from systems.powerup_systems import *
 from systems.effects_systems import *
+from systems.lookahead_ai import LookaheadAISystem
+from systems.policy_ai import TabularAISystem
+
+# Frecuencias de actualización (Hz) de los sistemas que no necesitan correr cada frame
+SYSTEM_RATES = {
+    'powerup_spawning': 4,
+    'particles': 30
+}
+
+# Modo multi-bola: muchas pelotas y poderes a la vez, resueltos con la broadphase
+MULTI_BALL = {
+    'balls': 24,
+    'max_powerups': 12,
+    'spawn_interval': 400
+}
+
+def create_paddle(world, x, y, *components):
+    """
+    Creates a still 15x100 paddle that collides with balls. Also used by the tools and
+    tests that simulate a match without a scene.
+
+    Args:
+        world (ECSWorld): World to create it in.
+        x, y (float): Top-left corner.
+        *components: Extra components, such as its controller (PaddleComponent or AIControlledComponent).
+
+    Returns:
+        int: The paddle entity.
+    """
+    paddle_id = world.create_entity()
+    for component in (PositionComponent(x, y), DimensionsComponent(15, 100), VelocityComponent(0, 0)) + components + (ColliderComponent(COLLIDE_PADDLE, COLLIDE_BALL),):
+        world.add_component(paddle_id, component)
+    return paddle_id
+
+def create_ball(world, x, y, vx, vy, *components):
+    """
+    Creates a 20x20 ball that collides with paddles and powerups.
+
+    Args:
+        world (ECSWorld): World to create it in.
+        x, y (float): Top-left corner.
+        vx, vy (float): Velocity in pixels per second.
+        *components: Extra components (the scene adds its TrailComponent).
+
+    Returns:
+        int: The ball entity.
+    """
+    ball_id = world.create_entity()
+    for component in (PositionComponent(x, y), DimensionsComponent(20, 20), VelocityComponent(vx, vy), BallComponent()) + components + (ColliderComponent(COLLIDE_BALL, COLLIDE_PADDLE | COLLIDE_POWERUP),):
+        world.add_component(ball_id, component)
+    return ball_id
+
+class PauseButtonWidget(Widget):
+    """Pause button of the game HUD: a rounded square with two bars, lighter when hovered."""
+    interactive = True
+
+    def __init__(self, rect, on_click):
+        super().__init__(rect)
+        self.on_click_action = on_click
 
-# Componente simple para el botón de pausa
-class PauseButtonComponent: 
-    """Simple marker component for the pause button entity."""
-    pass
+    def on_click(self):
+        self.on_click_action()
+
+    def render(self, surface):
+        color = (220, 220, 220) if self.state != 'normal' else (180, 180, 180)
+        pygame.draw.rect(surface, color, self.rect, border_radius=8)
+        pygame.draw.rect(surface, (20, 20, 20), (self.rect.x + 12, self.rect.y + 10, 8, 30), border_radius=2)
+        pygame.draw.rect(surface, (20, 20, 20), (self.rect.x + 30, self.rect.y + 10, 8, 30), border_radius=2)
 
 class GameScene(BaseScene):
     """
@@ -34,16 +105,22 @@ class GameScene(BaseScene):
 
     Attributes:
         num_players (int): Number of players (1 or 2).
-        mode (str): Game mode ('classic', 'shrink', etc.).
+        mode (str): Game mode ('classic', 'shrink' or 'multiball').
         game_entities (list): List of entity IDs created for this scene.
+        scheduler (SystemScheduler): Runs the game systems at their update rates (see SYSTEM_RATES).
+        render_queue (RenderQueue): Draw commands submitted by the render systems, flushed once per frame.
+        hud (UIRoot): Immediate-mode UI drawn over the game (the pause button).
 
     Methods:
         setup():
-            Initializes all ECS systems and creates game entities (paddles, ball, scores, pause button).
+            Initializes all ECS systems, the HUD and the game entities (paddles, ball, scores).
 
         cleanup():
             Removes all entities created by this scene and clears particles.
 
+        resume():
+            Resynchronizes the input sources when the pause menu closes.
+
         handle_events(events):
             Processes player input, pause button clicks, and ESC key for pausing.
 
@@ -67,51 +144,68 @@ class GameScene(BaseScene):
         
         # --- 1. Crear los sistemas del juego ---
         self.player_input_system = PlayerInputSystem(self.game.world, self.game.config_manager)
-        self.ai_system = AISystem(self.game.world, self.game.screen_height)
+        difficulty = self.game.config_manager.ai['difficulty']
+        # Con dos jugadores no hay palas de la IA: ni worker de simulación ni tabla que cargar
+        if self.num_players != 1: self.ai_system = AISystem(self.game.world, self.game.screen_height, difficulty)
+        elif AI_DIFFICULTY[difficulty].get('lookahead'): self.ai_system = LookaheadAISystem(self.game.world, self.game.screen_height, difficulty, screen_width=self.game.screen_width, game_mode=self.mode)
+        elif AI_DIFFICULTY[difficulty].get('policy'): self.ai_system = self._create_policy_ai(difficulty)
+        else: self.ai_system = AISystem(self.game.world, self.game.screen_height, difficulty)
         self.movement_system = MovementSystem(self.game.world, self.game.screen_height)
         self.ball_boundary_system = BallBoundarySystem(self.game.world, self.game.screen_height)
-        self.paddle_collision_system = PaddleCollisionSystem(self.game.world, self.mode)
-        self.scoring_system = ScoringSystem(self.game.world, self.game.screen_width, self.game.screen_height)
-        self.render_system = GameRenderSystem(self.game.world, self.game.screen)
-        
+        self.broadphase_system = BroadphaseSystem(self.game.world, field=(self.game.screen_width, self.game.screen_height))
+        self.paddle_collision_system = PaddleCollisionSystem(self.game.world, self.broadphase_system, self.mode)
+        self.ball_movement_system = BallMovementSystem(self.game.world, self.ball_boundary_system, self.paddle_collision_system)
         # CORRECCIÓN: Corregido el error de tipeo de 'particule_system' a 'particle_system'
-        self.particle_system = ParticleSystem(self.game.world)
+        self.particle_system = ParticleSystem(self.game.quality)
+        self.trail_system = TrailSystem(self.game.world, COLOR_BALL, self.game.quality)
+        multiball = self.mode == 'multiball'
+        self.scoring_system = ScoringSystem(self.game.world, self.game.screen_width, self.game.screen_height, self.game.gc_policy, self.game.quality, self.particle_system, pause_on_score=not multiball)
+        self.render_queue = RenderQueue()
+        self.render_system = GameRenderSystem(self.game.world, self.render_queue, self.game.sprites)
         
         # Sistemas de Poderes
-        self.powerup_spawning_system = PowerupSpawningSystem(self.game.world, self.game.screen_width, self.game.screen_height)
-        self.powerup_collision_system = PowerupCollisionSystem(self.game.world)
+        if multiball: self.powerup_spawning_system = PowerupSpawningSystem(self.game.world, self.game.screen_width, self.game.screen_height, MULTI_BALL['spawn_interval'], MULTI_BALL['max_powerups'])
+        else: self.powerup_spawning_system = PowerupSpawningSystem(self.game.world, self.game.screen_width, self.game.screen_height)
+        self.powerup_collision_system = PowerupCollisionSystem(self.game.world, self.broadphase_system)
         self.powerup_effect_system = PowerupEffectSystem(self.game.world)
 
+        # Orden de ejecución; los sistemas de juego se detienen mientras se espera el saque
+        playing = lambda: not self.scoring_system.waiting_to_reset
+        self.scheduler = SystemScheduler()
+        self.scheduler.add('particles', self.particle_system.update, SYSTEM_RATES['particles'])
+        # La IA consulta cada frame su intercepción cacheada: es barata y el movimiento queda suave
+        self.scheduler.add('ai', self.ai_system.process, condition=playing)
+        self.scheduler.add('movement', self.movement_system.process, condition=playing)
+        self.scheduler.add('broadphase', lambda dt: self.broadphase_system.process(), condition=playing)
+        # Las pelotas se mueven con colisión continua contra las palas ya movidas y las paredes
+        self.scheduler.add('ball_movement', lambda dt: self.ball_movement_system.process(dt, self.powerup_collision_system), condition=playing)
+        self.scheduler.add('trails', lambda dt: self.trail_system.record())
+        self.scheduler.add('powerup_spawning', lambda dt: self.powerup_spawning_system.process(), SYSTEM_RATES['powerup_spawning'], playing)
+        self.scheduler.add('powerup_collision', lambda dt: self.powerup_collision_system.process(), condition=playing)
+        self.scheduler.add('powerup_effect', lambda dt: self.powerup_effect_system.process(), condition=playing)
+        self.scheduler.add('scoring', lambda dt: self.scoring_system.process())
+
         # --- 2. Crear las entidades del juego ---
         # (El código de creación de entidades es el mismo y está correcto)
         # Botón de Pausa
-        pause_button_id = self.game.world.create_entity()
-        self.game_entities.append(pause_button_id)
-        self.game.world.add_component(pause_button_id, PositionComponent(self.game.screen_width - 60, 10))
-        self.game.world.add_component(pause_button_id, DimensionsComponent(50, 50))
-        self.game.world.add_component(pause_button_id, PauseButtonComponent())
+        self.hud = UIRoot((self.game.screen_width, self.game.screen_height), retained=False)
+        self.hud.add(PauseButtonWidget((self.game.screen_width - 60, 10, 50, 50), lambda: self.game.game_state_manager.set_state(GameState.PAUSA)))
         # Palas
-        paddle_dims = DimensionsComponent(15, 100)
-        p1_id = self.game.world.create_entity()
-        self.game.world.add_component(p1_id, PositionComponent(50, self.game.screen_height / 2 - paddle_dims.height / 2))
-        self.game.world.add_component(p1_id, paddle_dims)
-        self.game.world.add_component(p1_id, VelocityComponent(0, 0))
-        self.game.world.add_component(p1_id, PaddleComponent(player_number=1))
-        self.game_entities.append(p1_id)
-        p2_id = self.game.world.create_entity()
-        self.game.world.add_component(p2_id, PositionComponent(self.game.screen_width - 50 - paddle_dims.width, self.game.screen_height / 2 - paddle_dims.height / 2))
-        self.game.world.add_component(p2_id, DimensionsComponent(15, 100))
-        self.game.world.add_component(p2_id, VelocityComponent(0, 0))
-        if self.num_players == 2: self.game.world.add_component(p2_id, PaddleComponent(player_number=2))
-        else: self.game.world.add_component(p2_id, AIControlledComponent())
-        self.game_entities.append(p2_id)
-        # Pelota
-        ball_id = self.game.world.create_entity()
-        self.game.world.add_component(ball_id, PositionComponent(self.game.screen_width / 2 - 10, self.game.screen_height / 2 - 10))
-        self.game.world.add_component(ball_id, DimensionsComponent(20, 20))
-        self.game.world.add_component(ball_id, VelocityComponent(300, 300))
-        self.game.world.add_component(ball_id, BallComponent())
-        self.game_entities.append(ball_id)
+        paddle_y = self.game.screen_height / 2 - 50
+        self.game_entities.append(create_paddle(self.game.world, 50, paddle_y, PaddleComponent(player_number=1)))
+        p2_controller = PaddleComponent(player_number=2) if self.num_players == 2 else AIControlledComponent()
+        self.game_entities.append(create_paddle(self.game.world, self.game.screen_width - 50 - 15, paddle_y, p2_controller))
+        # Pelotas
+        center = (self.game.screen_width / 2 - 10, self.game.screen_height / 2 - 10)
+        if multiball:
+            for i in range(MULTI_BALL['balls']):
+                # Repartidas en abanico hacia ambos lados, con velocidades distintas
+                angle = math.radians(-60 + 120 * (i // 2) / max(1, MULTI_BALL['balls'] // 2 - 1))
+                speed = 220 + 160 * (i % 5) / 4
+                side = 1 if i % 2 else -1
+                self._create_ball(center[0], center[1], side * speed * math.cos(angle), speed * math.sin(angle))
+        else:
+            self._create_ball(center[0], center[1], 300, 300)
         # Puntuaciones
         score1_id = self.game.world.create_entity()
         self.game.world.add_component(score1_id, PositionComponent(self.game.screen_width / 4, 50))
@@ -121,6 +215,25 @@ class GameScene(BaseScene):
         self.game.world.add_component(score2_id, PositionComponent(self.game.screen_width * 3 / 4, 50))
         self.game.world.add_component(score2_id, ScoreComponent(player_number=2))
         self.game_entities.append(score2_id)
+        # Las teclas que ya estaban pulsadas al entrar (p. ej. desde el menú) no generan KEYDOWN
+        self.player_input_system.resync()
+
+    def _create_policy_ai(self, difficulty):
+        """
+        Creates the table-driven AI, or the predictive AI of the same preset when the table
+        cannot be used (it was built for another internal resolution, or it is missing).
+        """
+        try:
+            return TabularAISystem(self.game.world, self.game.screen_height, difficulty, screen_width=self.game.screen_width)
+        except (ValueError, OSError) as error:
+            print(f"GameScene: no se puede usar la tabla de la IA ({error}); se usa la IA predictiva")
+            return AISystem(self.game.world, self.game.screen_height, difficulty)
+
+    def _create_ball(self, x, y, vx, vy):
+        """Creates a ball entity with a trail and registers it as a scene entity."""
+        ball_id = create_ball(self.game.world, x, y, vx, vy, TrailComponent())
+        self.game_entities.append(ball_id)
+        return ball_id
 
     def cleanup(self):
         """
@@ -128,10 +241,20 @@ class GameScene(BaseScene):
         """
         for entity_id in self.game_entities:
             self.game.world.remove_entity(entity_id)
-        for entity_id in list(self.game.world.get_entities_with_components(ParticleComponent)):
+        # Los poderes los crea el sistema de aparición, no la escena
+        for entity_id in list(self.game.world.get_entities_with_components(PowerupComponent)):
             self.game.world.remove_entity(entity_id)
+        self.particle_system.clear()
+        self.ai_system.shutdown()
         self.game_entities.clear()
 
+    def resume(self):
+        """
+        Resynchronizes the input sources when the pause menu closes: the keys released
+        while it was open must not keep the paddles moving.
+        """
+        self.player_input_system.resync()
+
     def handle_events(self, events):
         """
         Processes player input, pause button clicks, and ESC key for pausing.
@@ -140,53 +263,37 @@ class GameScene(BaseScene):
             events (list): List of Pygame events.
         """
         self.player_input_system.process(events)
-        for event in events:
+        for event in self.hud.handle_events(events):
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 self.game.game_state_manager.set_state(GameState.PAUSA)
-            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                mx, my = event.pos
-                for e in self.game.world.get_entities_with_components(PauseButtonComponent, PositionComponent, DimensionsComponent):
-                    pos = self.game.world.get_component(e, PositionComponent)
-                    dim = self.game.world.get_component(e, DimensionsComponent)
-                    if pos.x <= mx <= pos.x + dim.width and pos.y <= my <= pos.y + dim.height:
-                        self.game.game_state_manager.set_state(GameState.PAUSA); return
 
     def update(self, dt):
         """
         Updates all game systems, including movement, AI, collisions, powerups, and scoring.
+        Each system runs at its own rate through the scheduler.
 
         Args:
             dt (float): Delta time since last frame.
         """
-        self.particle_system.update(dt)
-        if not self.scoring_system.waiting_to_reset:
-            self.ai_system.process()
-            self.movement_system.process(dt)
-            self.ball_boundary_system.process()
-            self.paddle_collision_system.process(self.powerup_collision_system)
-            self.powerup_spawning_system.process()
-            self.powerup_collision_system.process()
-            self.powerup_effect_system.process()
-        self.scoring_system.process()
+        self.scheduler.update(dt)
 
     def draw(self, screen):
         """
         Renders all game entities, particles, and draws the pause button.
+        Systems only submit draw commands; the render queue draws them in one batch per layer.
 
         Args:
             screen: The Pygame surface to draw on.
+
+        Returns:
+            list: Rects drawn this frame, for the dirty-rect renderer.
         """
         self.render_system.process()
+        self.trail_system.draw(self.render_queue)
         
         # CORRECCIÓN: Añadida la llamada para dibujar las partículas
-        self.particle_system.draw(screen)
-
-        # Dibujar el botón de pausa
-        for e in self.game.world.get_entities_with_components(PauseButtonComponent, PositionComponent, DimensionsComponent):
-            pos, dim = self.game.world.get_component(e, PositionComponent), self.game.world.get_component(e, DimensionsComponent)
-            rect = pygame.Rect(pos.x, pos.y, dim.width, dim.height)
-            mx, my = pygame.mouse.get_pos()
-            color = (220, 220, 220) if rect.collidepoint(mx, my) else (180, 180, 180)
-            pygame.draw.rect(screen, color, rect, border_radius=8)
-            pygame.draw.rect(screen, (20, 20, 20), (pos.x + 12, pos.y + 10, 8, 30), border_radius=2)
-            pygame.draw.rect(screen, (20, 20, 20), (pos.x + 30, pos.y + 10, 8, 30), border_radius=2)
+        self.particle_system.draw(self.render_queue, self.scheduler.pending('particles'))
+
+        rects = self.render_queue.flush(screen, collect_rects=self.game.dirty_renderer is not None)
+        # El HUD (botón de pausa) se dibuja encima de todo
+        return rects + self.hud.draw(screen)
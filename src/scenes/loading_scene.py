@@ -0,0 +1,68 @@
+"""
+loading_scene.py
+----------------
+Implements the loading scene shown while the AssetManager decodes the startup assets.
+
+Classes:
+    LoadingScene: Starts the background loading of a manifest and shows its progress.
+"""
+from scenes.base_scene import BaseScene
+from utils.game_state import GameState
+from utils.utils import ASSET_MANIFEST, COLOR_WHITE, COLOR_GRAY, COLOR_BUTTON_NORMAL
+from engine.text_cache import text_cache
+
+class LoadingScene(BaseScene):
+    """
+    Loading scene. Images are decoded on the AssetManager's thread pool while this scene
+    keeps the window responsive, converting each finished image and drawing a progress bar.
+
+    Attributes:
+        manifest (dict): Assets to load (see ASSET_MANIFEST).
+        next_state (GameState): State entered once every asset is ready.
+        progress (float): Fraction of the manifest that is ready.
+
+    Methods:
+        setup():
+            Starts loading the manifest in the background.
+
+        update(dt):
+            Converts the finished assets and moves on when everything is loaded.
+
+        draw(screen):
+            Draws the loading text and progress bar.
+    """
+    def __init__(self, game, manifest=ASSET_MANIFEST, next_state=GameState.MENU_PRINCIPAL):
+        super().__init__(game)
+        self.manifest = manifest
+        self.next_state = next_state
+        self.progress = 0.0
+
+    def setup(self):
+        """Starts loading the manifest in the background."""
+        print(f"LoadingScene: Cargando {len(self.manifest)} recursos.")
+        self.progress = 0.0
+        self.game.assets.preload(self.manifest)
+
+    def update(self, dt):
+        """
+        Converts the assets that finished decoding and moves on when everything is loaded.
+
+        Args:
+            dt (float): Delta time since last frame.
+        """
+        self.progress = self.game.assets.poll()
+        if self.progress >= 1.0: self.game.game_state_manager.set_state(self.next_state)
+
+    def draw(self, screen):
+        """
+        Draws the loading text and progress bar.
+
+        Args:
+            screen: The Pygame surface to draw on.
+        """
+        width, height = 400, 20
+        x, y = (self.game.screen_width - width) // 2, self.game.screen_height // 2
+        text = text_cache.render("Cargando...", 40, COLOR_WHITE)
+        screen.blit(text, text.get_rect(center=(self.game.screen_width // 2, y - 40)))
+        screen.fill(COLOR_GRAY, (x, y, width, height))
+        screen.fill(COLOR_BUTTON_NORMAL, (x, y, int(width * self.progress), height))
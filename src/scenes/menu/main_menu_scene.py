@@ -2,94 +2,85 @@
 main_menu_scene.py
 ------------------
 Implements the main menu scene for the game, including setup, cleanup,
-event handling, updating, and drawing using ECS systems.
+event handling, updating, and drawing with the retained UI layer.
 
 Classes:
-    MainMenuScene: Handles the creation and management of menu entities and systems.
+    MainMenuScene: Builds the main menu buttons and routes their input.
 """
 
 from scenes.base_scene import BaseScene
 from utils.game_state import GameState
-from systems.menu_systems import MenuInputSystem, MenuRenderSystem
-from components.menu_components import (
-    PositionComponent,
-    DimensionsComponent,
-    RenderComponent,
-    TextComponent,
-    ButtonComponent
-)
+from engine.ui import UIRoot, Button
+from utils.utils import COLOR_BACKGROUND, COLOR_BUTTON_NORMAL, COLOR_BUTTON_HOVER, COLOR_BUTTON_CLICKED, COLOR_WHITE
 
 class MainMenuScene(BaseScene):
     """
-    Main menu scene for the game.
+    Main menu scene for the game. Its retained UI paints the whole screen.
+
+    Attributes:
+        ui (UIRoot): Widget tree with the menu buttons.
 
     Methods:
         setup():
-            Initializes menu systems and creates menu button entities.
+            Builds the menu buttons.
 
         cleanup():
-            Removes menu entities when leaving the scene.
+            Drops the widget tree when leaving the scene.
 
         handle_events(events):
-            Processes input events for the menu.
+            Routes input events to the menu buttons.
 
         update(dt):
             Updates the menu scene (currently empty).
 
         draw(screen):
-            Renders the menu using the MenuRenderSystem.
+            Draws the menu; only buttons whose state changed are repainted.
     """
+    covers_screen = True
+
     def setup(self):
         """
-        Initializes menu systems and creates menu button entities.
+        Builds the menu buttons.
         """
-        print("MainMenuScene: Configurando sistemas y entidades del menú.")
-        self.input_system = MenuInputSystem(self.game.world, self.game.game_state_manager)
-        self.render_system = MenuRenderSystem(self.game.world, self.game.screen, self.game.game_state_manager)
-        
-        self.menu_entities = []
+        print("MainMenuScene: Configurando la interfaz del menú.")
+        self.ui = UIRoot((self.game.screen_width, self.game.screen_height), COLOR_BACKGROUND)
         
         button_width, button_height = 300, 60
         start_x = (self.game.screen_width - button_width) / 2
         button_spacing = 20
-        # Corregimos el cálculo para centrarlo perfectamente
-        num_buttons = 3
-        total_menu_height = (num_buttons * button_height) + ((num_buttons - 1) * button_spacing)
-        start_y = (self.game.screen_height / 2) - (total_menu_height / 2)
-        
         buttons_to_create = [
             ("Play", GameState.JUGANDO_SINGLE_PLAYER),
             ("Two players", GameState.JUGANDO_TWO_PLAYERS),
             ("Palas Encogidas", GameState.JUGANDO_SHRINK_MODE),
+            ("Multi Bola", GameState.JUGANDO_MULTI_BALL),
             ("Opciones", GameState.OPCIONES),
             ("Salir", GameState.SALIR)
         ]
+        # El menú se centra según el número real de botones
+        num_buttons = len(buttons_to_create)
+        total_menu_height = (num_buttons * button_height) + ((num_buttons - 1) * button_spacing)
+        start_y = (self.game.screen_height / 2) - (total_menu_height / 2)
         
+        colors = (COLOR_BUTTON_NORMAL, COLOR_BUTTON_HOVER, COLOR_BUTTON_CLICKED)
         for i, (text, action) in enumerate(buttons_to_create):
-            entity_id = self.game.world.create_entity()
-            self.menu_entities.append(entity_id)
-            
             y_pos = start_y + i * (button_height + button_spacing)
-            self.game.world.add_component(entity_id, PositionComponent(start_x, y_pos))
-            self.game.world.add_component(entity_id, DimensionsComponent(button_width, button_height))
-            self.game.world.add_component(entity_id, RenderComponent((41, 128, 185), (52, 152, 219), (35, 110, 155)))
-            self.game.world.add_component(entity_id, TextComponent(text, 40, (236, 240, 241)))
-            self.game.world.add_component(entity_id, ButtonComponent(action))
+            self.ui.add(Button((start_x, y_pos, button_width, button_height), text, self._go_to(action), colors, 40, COLOR_WHITE))
+
+    def _go_to(self, state):
+        return lambda: self.game.game_state_manager.set_state(state)
 
     def cleanup(self):
         """
-        Removes menu entities when leaving the scene to prevent persistence.
+        Drops the widget tree when leaving the scene.
         """
-        print(f"MainMenuScene: Limpiando {len(self.menu_entities)} entidades.")
-        for entity_id in self.menu_entities:
-            self.game.world.remove_entity(entity_id)
-        self.menu_entities.clear()
+        print(f"MainMenuScene: Limpiando {len(self.ui.children)} botones.")
+        self.ui = None
 
     def handle_events(self, events):
         """
-        Processes input events for the menu.
+        Routes input events to the menu buttons.
         """
-        self.input_system.process(events)
+        self.ui.handle_events(events)
 
     def update(self, dt):
         """
@@ -99,6 +90,6 @@ class MainMenuScene(BaseScene):
 
     def draw(self, screen):
         """
-        Renders the menu using the MenuRenderSystem.
+        Draws the menu; only buttons whose state changed are repainted.
         """
-        self.render_system.process()
+        self.ui.draw(screen)
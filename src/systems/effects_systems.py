@@ -4,63 +4,237 @@ effects_systems.py
 Implements ECS systems for visual effects, such as particle management.
 
 Classes:
-    ParticleSystem: Manages the lifecycle, movement, and rendering of particles.
+    ParticleSystem: Emits, simulates and renders particles stored in a NumPy ParticlePool.
+    TrailSystem: Records recent positions of entities with a TrailComponent and draws their trails.
 """
+import numpy as np
 import pygame
-from components.menu_components import PositionComponent
-from components.effects_components import ParticleComponent
+from components.effects_components import ParticlePool, TrailComponent
+from components.menu_components import PositionComponent, DimensionsComponent
+from engine.render_queue import LAYER_EFFECTS, LAYER_WORLD
+from utils.utils import CONFETTI_COLORS
 
 class ParticleSystem:
     """
-    Manages the lifecycle and movement of all particles in the ECS world.
+    Manages the lifecycle and movement of all particles.
+
+    Particles live in a fixed-capacity ParticlePool; emission, gravity integration and
+    lifetime culling are vectorized, and rendering submits a single batch of
+    pre-rasterized dot sprites to the render queue.
 
     Attributes:
-        world: Reference to the ECS world.
+        pool (ParticlePool): Storage for every live particle.
+        palette (list): RGB colours; particles store an index into it.
+        gravity (float): Downward acceleration in pixels per second squared.
+        quality: Optional QualityController; lowers the draw fidelity under load.
 
     Methods:
+        emit(x, y, count, speed_range, lifetime_range):
+            Spawns a burst of particles at the given position.
+
         update(dt):
             Moves particles and removes them if their lifetime has expired.
 
-        draw(screen):
-            Draws all active particles on the given Pygame surface.
+        draw(render_queue, lag):
+            Submits all active particles to the render queue in one batch.
+
+        clear():
+            Removes every particle.
     """
-    def __init__(self, world):
-        self.world = world
+    def __init__(self, quality=None, capacity=16384, palette=CONFETTI_COLORS, gravity=150.0, seed=None):
+        self.pool = ParticlePool(capacity)
+        self.palette = list(palette)
+        self.gravity = gravity
+        self.quality = quality
+        self._rng = np.random.default_rng(seed)
+        self._dots = [self._rasterize_dot(color) for color in self.palette]
+        self._squares = [self._rasterize_square(color) for color in self.palette]
+        # Arrays de trabajo de update(), del tamaño del pool: el frame no crea arrays temporales
+        self._step = np.empty_like(self.pool.velocity)
+        self._alive = np.empty(len(self.pool.age), dtype=bool)
+
+    def _rasterize_dot(self, color):
+        """Pre-rasterizes the dot sprite (radius 3) used at full quality."""
+        dot = pygame.Surface((7, 7))
+        dot.set_colorkey((0, 0, 0))
+        pygame.draw.circle(dot, color, (3, 3), 3)
+        return dot.convert() if pygame.display.get_surface() is not None else dot
+
+    def _rasterize_square(self, color):
+        """Pre-rasterizes the cheaper 4x4 square (no colorkey) used under load."""
+        square = pygame.Surface((4, 4))
+        square.fill(color)
+        return square.convert() if pygame.display.get_surface() is not None else square
+
+    def emit(self, x, y, count, speed_range=(50, 200), lifetime_range=(0.5, 1.5)):
+        """
+        Spawns a burst of particles at the given position, in random directions.
+        If the pool is full the burst is truncated.
+
+        Args:
+            x (float): X coordinate of the burst.
+            y (float): Y coordinate of the burst.
+            count (int): Number of particles.
+            speed_range (tuple): Minimum and maximum speed in pixels per second.
+            lifetime_range (tuple): Minimum and maximum lifetime in seconds.
+
+        Returns:
+            int: Number of particles actually spawned.
+        """
+        pool = self.pool
+        count = min(count, pool.capacity - pool.count)
+        if count <= 0: return 0
+        start, end = pool.count, pool.count + count
+        angle = self._rng.uniform(0, 2 * np.pi, count)
+        speed = self._rng.uniform(speed_range[0], speed_range[1], count)
+        pool.position[start:end] = (x, y)
+        pool.velocity[start:end, 0] = np.cos(angle) * speed
+        pool.velocity[start:end, 1] = np.sin(angle) * speed
+        pool.age[start:end] = 0
+        pool.lifetime[start:end] = self._rng.uniform(lifetime_range[0], lifetime_range[1], count)
+        pool.color[start:end] = self._rng.integers(0, len(self.palette), count)
+        pool.count = end
+        return count
 
     def update(self, dt):
         """
         Moves particles and removes them if their lifetime has expired.
 
         Args:
-            dt (float): Delta time since last frame.
+            dt (float): Delta time since last update.
         """
-        current_time = pygame.time.get_ticks()
-        entities_to_remove = []
-        
-        for entity in self.world.get_entities_with_components(ParticleComponent, PositionComponent):
-            particle_data = self.world.get_component(entity, ParticleComponent)
-            pos = self.world.get_component(entity, PositionComponent)
-            
-            if current_time > particle_data.born_time + particle_data.lifetime:
-                entities_to_remove.append(entity)
-            else:
-                # Aplicar una física simple (gravedad)
-                particle_data.velocity = (particle_data.velocity[0], particle_data.velocity[1] + 150 * dt)
-                pos.x += particle_data.velocity[0] * dt
-                pos.y += particle_data.velocity[1] * dt
-        
-        for entity in entities_to_remove:
-            self.world.remove_entity(entity)
-            
-    def draw(self, screen):
+        pool = self.pool
+        n = pool.count
+        if not n: return
+        # Aplicar una física simple (gravedad) a todas las partículas a la vez
+        pool.velocity[:n, 1] += self.gravity * dt
+        step = np.multiply(pool.velocity[:n], dt, out=self._step[:n])
+        pool.position[:n] += step
+        pool.age[:n] += dt
+
+        alive = np.less(pool.age[:n], pool.lifetime[:n], out=self._alive[:n])
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n: return
+        # Compactar: las partículas vivas quedan al principio del pool
+        for column in (pool.position, pool.velocity, pool.age, pool.lifetime, pool.color):
+            column[:alive_count] = column[:n][alive]
+        pool.count = alive_count
+
+    def draw(self, render_queue, lag=0.0):
         """
-        Draws all active particles.
+        Submits all active particles to the render queue as one batch. Under load
+        (quality level 2+) particles are drawn as small squares without a colorkey,
+        and at the lowest level only every other particle is drawn.
 
         Args:
-            screen: The Pygame surface to draw on.
+            render_queue (RenderQueue): Queue the dot sprites are submitted to.
+            lag (float): Seconds since the last update; positions are extrapolated by
+                this amount when the system runs below the frame rate.
         """
-        for entity in self.world.get_entities_with_components(ParticleComponent, PositionComponent):
-            pos = self.world.get_component(entity, PositionComponent)
-            data = self.world.get_component(entity, ParticleComponent)
-            pygame.draw.circle(screen, data.color, (pos.x, pos.y), 3)
+        n = self.pool.count
+        if not n: return
+        level = self.quality.level if self.quality else 0
+        step = 2 if level >= 3 else 1
+        sprites, offset = (self._squares, 2) if level >= 2 else (self._dots, 3)
+        positions = (self.pool.position[:n:step] + self.pool.velocity[:n:step] * lag - offset).astype(np.int32)
+        # Iteradores perezosos de enteros: las tuplas se crean y liberan una a una durante el blit,
+        # sin miles de listas vivas que disparen el recolector
+        sprite_sequence = map(sprites.__getitem__, self.pool.color[:n:step].tolist())
+        coords = zip(positions[:, 0].tolist(), positions[:, 1].tolist())
+        render_queue.submit_batch(LAYER_EFFECTS, zip(sprite_sequence, coords))
+
+    def clear(self):
+        """Removes every particle."""
+        self.pool.count = 0
+
+class TrailSystem:
+    """
+    Records the recent positions of entities with a TrailComponent (the balls) and draws
+    a fading afterimage behind them. Positions are sampled once per frame, so the trail
+    gets longer as the ball speeds up.
 
+    Trail segments are drawn with pre-faded, pre-shrunk sprites cached per (colour, size,
+    length): one opaque surface with per-surface alpha for each segment, so drawing a
+    trail is only blits and nothing is rasterized per frame.
+
+    Attributes:
+        world: Reference to the ECS world.
+        color (tuple): RGB colour of the trail.
+        quality: Optional QualityController; fewer segments are drawn under load.
+        max_alpha (int): Alpha of the segment closest to the entity.
+        max_jump (float): A position further than this from the previous one (a ball reset)
+            restarts the trail instead of joining both points.
+
+    Methods:
+        record():
+            Stores the current position of every entity with a trail.
+
+        draw(render_queue):
+            Submits the trail segments to the render queue, below the world layer.
+    """
+    def __init__(self, world, color, quality=None, max_alpha=140, max_jump=200):
+        self.world = world
+        self.color = color
+        self.quality = quality
+        self.max_alpha = max_alpha
+        self.max_jump = max_jump
+        self._sprites = {}
+        self._blits = {}  # entidad -> lista de blits de su estela, reutilizada cada frame
+
+    def record(self):
+        """Stores the current position of every entity with a trail in its ring buffer."""
+        for entity in self.world.query(TrailComponent, PositionComponent):
+            trail, pos = self.world.get_component(entity, TrailComponent), self.world.get_component(entity, PositionComponent)
+            if trail.count:
+                last = trail.head - 1
+                if abs(pos.x - trail.xs[last]) > self.max_jump or abs(pos.y - trail.ys[last]) > self.max_jump:
+                    trail.count = 0
+            trail.xs[trail.head] = pos.x
+            trail.ys[trail.head] = pos.y
+            trail.head = (trail.head + 1) % trail.length
+            if trail.count < trail.length: trail.count += 1
+
+    def _segment_sprites(self, width, height, length):
+        """
+        Returns the cached (sprite, dx, dy) list for a trail: segment k is smaller and more
+        transparent the older it is, and (dx, dy) centres it on the recorded position.
+        """
+        key = (width, height, length)
+        sprites = self._sprites.get(key)
+        if sprites is None:
+            sprites = []
+            for k in range(length):
+                fade = 1 - k / length
+                size = (max(1, round(width * (0.5 + 0.5 * fade))), max(1, round(height * (0.5 + 0.5 * fade))))
+                sprite = pygame.Surface(size)
+                sprite.fill(self.color)
+                if pygame.display.get_surface() is not None: sprite = sprite.convert()
+                sprite.set_alpha(int(self.max_alpha * fade))
+                sprites.append((sprite, (width - size[0]) // 2, (height - size[1]) // 2))
+            self._sprites[key] = sprites
+        return sprites
+
+    def draw(self, render_queue):
+        """
+        Submits the trail segments of every entity to the render queue, below the world
+        layer so the entity itself is drawn on top. The newest position is skipped: it is
+        covered by the entity. Each trail is one batch, drawn oldest segment first.
+
+        Args:
+            render_queue (RenderQueue): Queue the segment sprites are submitted to.
+        """
+        for entity in self.world.query(TrailComponent, PositionComponent, DimensionsComponent):
+            trail, dim = self.world.get_component(entity, TrailComponent), self.world.get_component(entity, DimensionsComponent)
+            segments = min(trail.count, self.quality.scaled(trail.length) if self.quality else trail.length)
+            if segments < 2: continue
+            sprites = self._segment_sprites(dim.width, dim.height, trail.length)
+            # Un lote ordenado del segmento más viejo al más nuevo: los segmentos translúcidos se
+            # solapan y la cola no debe reordenarlos por material
+            blits = self._blits.get(entity)
+            if blits is None: self._blits[entity] = blits = []
+            blits.clear()
+            for k in range(segments - 1, 0, -1):
+                slot = (trail.head - 1 - k) % trail.length
+                sprite, dx, dy = sprites[k]
+                blits.append((sprite, (trail.xs[slot] + dx, trail.ys[slot] + dy)))
+            render_queue.submit_batch(LAYER_WORLD - 1, blits)
@@ -7,30 +7,53 @@ Classes:
     BallBoundarySystem: Handles ball collisions with the top and bottom boundaries of the screen.
 """
 
-from components.game_components import BallComponent, VelocityComponent
-from components.menu_components import DimensionsComponent, PositionComponent
-
-
 class BallBoundarySystem:
     """
-    Handles ball collisions with the top and bottom boundaries of the screen.
+    Handles ball collisions with the top and bottom boundaries of the screen. The balls
+    are moved by BallMovementSystem, which asks this system when a ball reaches a wall
+    within the step (so no step is long enough to cross it) and lets it bounce the ball.
 
     Attributes:
         world: Reference to the ECS world.
         sh (int): Screen height.
 
     Methods:
-        process():
-            Checks each ball entity and inverts its vertical velocity if it hits the top or bottom edge.
+        time_of_impact(y, height, dy) -> tuple:
+            Returns when a ball moving by dy first touches the top or bottom edge.
+
+        bounce(pos, vel, dim, ny):
+            Puts a ball against the wall it hit and inverts its vertical velocity.
     """
     def __init__(self, world, screen_height):
         self.world, self.sh = world, screen_height
-    def process(self):
+    def time_of_impact(self, y, height, dy):
+        """
+        Returns when a ball moving by dy during a step first touches the top or bottom edge.
+
+        Args:
+            y (float): Top of the ball at the start of the step.
+            height (float): Height of the ball.
+            dy (float): Vertical displacement over the step.
+
+        Returns:
+            tuple: (toi, ny), the fraction of the step at which it touches and the wall's
+                normal (1 for the top edge, -1 for the bottom one), or None. A ball already
+                past an edge and still moving outwards touches it at toi 0.
         """
-        Checks each ball entity and inverts its vertical velocity if it hits the top or bottom edge.
+        if dy < 0:
+            toi = max(0.0, -y / dy)
+            return (toi, 1) if toi < 1 else None
+        if dy > 0:
+            toi = max(0.0, (self.sh - height - y) / dy)
+            return (toi, -1) if toi < 1 else None
+        return None
+    def bounce(self, pos, vel, dim, ny):
+        """
+        Puts a ball against the wall it hit and inverts its vertical velocity.
+
+        Args:
+            pos, vel, dim: Position, velocity and dimensions components of the ball.
+            ny (int): Normal of the wall (see time_of_impact).
         """
-        for ball_id in self.world.get_entities_with_components(BallComponent, PositionComponent, VelocityComponent, DimensionsComponent):
-            b_pos, b_vel, b_dim = self.world.get_component(ball_id, PositionComponent), self.world.get_component(ball_id, VelocityComponent), self.world.get_component(ball_id, DimensionsComponent)
-            if not all([b_pos, b_vel, b_dim]): continue
-            if (b_pos.y <= 0 and b_vel.vy < 0) or (b_pos.y >= self.sh - b_dim.height and b_vel.vy > 0):
-                b_vel.vy *= -1
+        pos.y = 0 if ny > 0 else self.sh - dim.height
+        if vel.vy * ny < 0: vel.vy *= -1
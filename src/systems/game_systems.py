@@ -6,25 +6,34 @@ scoring, and rendering.
 
 Classes:
     MovementSystem: Updates entity positions based on velocity.
+    BallMovementSystem: Moves the balls with continuous (swept) collision against walls and paddles.
     PlayerInputSystem: Handles player input for paddle movement.
     AISystem: Controls AI paddle movement.
-    BallBoundarySystem: Handles ball collisions with screen boundaries.
+    BroadphaseSystem: Keeps a spatial hash of the entities with a ColliderComponent.
     PaddleCollisionSystem: Handles ball and paddle collisions, including shrink mode.
-    ScoringSystem: Manages scoring, ball resets, and win conditions.
     GameRenderSystem: Renders paddles, ball, powerups, and scores.
+
+BallBoundarySystem (systems.environment) and ScoringSystem (systems.score) are
+re-exported here so scenes importing this module get a single implementation.
 """
 
-import pygame
 import random
+import pygame
 from components.menu_components import PositionComponent, DimensionsComponent
 from components.game_components import *
 from components.powerup_components import *
-from components.effects_components import ParticleComponent
 from utils.utils import *
+from engine.text_cache import GlyphAtlas
+from engine.render_queue import LAYER_WORLD, LAYER_HUD
+from engine.spatial_hash import SpatialHash
+from engine.collision import sweep_aabb
+from engine.input_sources import InputSnapshot, KeyboardInputSource, GamepadInputSource
+from systems.environment import BallBoundarySystem
+from systems.score import ScoringSystem
 
 class MovementSystem:
     """
-    Updates entity positions based on their velocity.
+    Updates entity positions based on their velocity. Balls are left to BallMovementSystem.
 
     Attributes:
         world: Reference to the ECS world.
@@ -37,9 +46,9 @@ class MovementSystem:
         self.world = world
         self.screen_height = screen_height
     def process(self, dt):
-        for entity in self.world.get_entities_with_components(PositionComponent, VelocityComponent):
+        for entity in self.world.query(PositionComponent, VelocityComponent):
             pos, vel = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, VelocityComponent)
-            if not all([pos, vel]): continue
+            if pos is None or vel is None or self.world.get_component(entity, BallComponent): continue
             pos.x += vel.vx * dt
             pos.y += vel.vy * dt
             if self.world.get_component(entity, PaddleComponent) or self.world.get_component(entity, AIControlledComponent):
@@ -51,223 +60,382 @@ class PlayerInputSystem:
     """
     Handles player input for paddle movement.
 
+    Every frame the input sources fill one InputSnapshot from the frame's events
+    (KEYDOWN/KEYUP through the compiled key map, gamepad events, or a replay), and each
+    player's paddle moves at its axis times the paddle speed. Any source can stand in
+    for another: a replay drives the paddles exactly as the keyboard did.
+
     Attributes:
         world: Reference to the ECS world.
         config_manager: Reference to the ConfigManager.
         paddle_speed (int): Speed of paddle movement.
+        snapshot (InputSnapshot): Input of the current frame.
+        sources (list): Input sources, polled in order (keyboard and gamepads by default).
 
     Methods:
-        process(events): Updates paddle velocity based on key presses.
+        process(events): Updates the snapshot and the paddle velocities from the frame's events.
+        resync(): Resynchronizes the sources after events were missed (pause menu).
     """
-    def __init__(self, world, config_manager):
+    def __init__(self, world, config_manager, sources=None):
         self.world, self.config_manager, self.paddle_speed = world, config_manager, 400
+        self.snapshot = InputSnapshot()
+        if sources is None:
+            sources = [KeyboardInputSource(config_manager)]
+            gamepad = config_manager.gamepad
+            if gamepad['enabled']: sources.append(GamepadInputSource(gamepad['axis'], gamepad['deadzone']))
+        self.sources = sources
     def process(self, events):
-        keys = pygame.key.get_pressed()
-        for entity in self.world.get_entities_with_components(VelocityComponent, PaddleComponent):
+        snapshot = self.snapshot
+        snapshot.begin_frame()
+        for source in self.sources: source.poll(events, snapshot)
+        for entity in self.world.query(VelocityComponent, PaddleComponent):
             vel, paddle = self.world.get_component(entity, VelocityComponent), self.world.get_component(entity, PaddleComponent)
-            if not all([vel, paddle]): continue
-            if paddle.player_number == 1:
-                key_up, key_down = self.config_manager.get_p1_key('up'), self.config_manager.get_p1_key('down')
-                if keys[key_up]: vel.vy = -self.paddle_speed
-                elif keys[key_down]: vel.vy = self.paddle_speed
-                else: vel.vy = 0
-            elif paddle.player_number == 2:
-                key_up, key_down = self.config_manager.get_p2_key('up'), self.config_manager.get_p2_key('down')
-                if keys[key_up]: vel.vy = -self.paddle_speed
-                elif keys[key_down]: vel.vy = self.paddle_speed
-                else: vel.vy = 0
+            if vel is None or paddle is None: continue
+            vel.vy = snapshot.axis(paddle.player_number) * self.paddle_speed
+    def resync(self):
+        """Resynchronizes every source with its device (the key events seen by another scene are lost)."""
+        for source in self.sources: source.resync()
 
 class AISystem:
     """
-    Controls AI paddle movement to follow the ball.
+    Predictive AI: moves each AI paddle towards the point where the ball will reach it.
+
+    The intercept is computed in closed form: the ball's straight path is unfolded
+    across the top and bottom walls (the y it would reach with no walls), then folded
+    back into the field, which accounts for any number of wall bounces. It only depends
+    on the ball's velocity, which changes only on bounces, hits and serves, so the
+    result is cached per (paddle, ball) until the velocity changes; the rest of the
+    frames are a cache lookup. With several balls the paddle goes for the one arriving
+    first; when no ball is coming it returns to the centre.
+
+    Difficulty comes from a preset of AI_DIFFICULTY: after a new intercept is computed
+    the paddle keeps going to its previous target for the reaction time, the intercept
+    gets a random aim error, and the paddle speed is limited.
 
     Attributes:
         world: Reference to the ECS world.
         screen_height (int): Height of the game screen.
+        reaction (float): Seconds before the paddle reacts to a new trajectory.
+        error (float): Maximum aim error in pixels.
         paddle_speed (int): Speed of AI paddle movement.
+        rng (random.Random): Source of the aim errors.
+        computed (int): Intercepts computed (cache misses), for profiling.
 
     Methods:
-        process(): Updates AI paddle velocity to track the ball.
+        process(dt): Updates AI paddle velocity towards the predicted intercept.
+        intercept(ball_pos, ball_vel, ball_dim, paddle_pos, paddle_dim) -> tuple:
+            Closed-form (time, y) at which a ball reaches a paddle, or None.
+
+        shutdown():
+            Releases background resources (none for this AI).
     """
-    def __init__(self, world, screen_height):
-        self.world, self.screen_height, self.paddle_speed = world, screen_height, 300
-    def process(self):
-        ball_entities = self.world.get_entities_with_components(PositionComponent, BallComponent)
-        ball_pos = next((self.world.get_component(e, PositionComponent) for e in ball_entities), None)
-        if not ball_pos: return
-        for entity in self.world.get_entities_with_components(PositionComponent, VelocityComponent, AIControlledComponent):
+    def __init__(self, world, screen_height, difficulty='normal', rng=None):
+        self.world, self.screen_height = world, screen_height
+        settings = AI_DIFFICULTY[difficulty]
+        self.reaction, self.error, self.paddle_speed = settings['reaction'], settings['error'], settings['speed']
+        self.rng = rng or random.Random()
+        self.computed = 0
+        self._clock = 0.0
+        self._intercepts = {}   # pala -> {pelota: [vx, vy, llegada, y objetivo, visible desde]}
+        self._targets = {}      # pala -> y objetivo que está siguiendo
+
+    def intercept(self, ball_pos, ball_vel, ball_dim, paddle_pos, paddle_dim):
+        """
+        Returns when and where a ball will reach the face of a paddle, bouncing off the
+        top and bottom walls on the way.
+
+        Returns:
+            tuple: (time in seconds, y of the ball's centre), or None if the ball is not
+                moving towards the paddle.
+        """
+        if ball_vel.vx > 0 and ball_pos.x < paddle_pos.x: distance = paddle_pos.x - ball_dim.width - ball_pos.x
+        elif ball_vel.vx < 0 and ball_pos.x > paddle_pos.x: distance = paddle_pos.x + paddle_dim.width - ball_pos.x
+        else: return None
+        time = max(0.0, distance / ball_vel.vx)
+        # Recorrido "desplegado" sin paredes, plegado de vuelta al campo (periodo de ida y vuelta 2L)
+        span = self.screen_height - ball_dim.height
+        if span <= 0: return time, ball_pos.y + ball_dim.height / 2
+        folded = (ball_pos.y + ball_vel.vy * time) % (2 * span)
+        if folded > span: folded = 2 * span - folded
+        return time, folded + ball_dim.height / 2
+
+    def _target_for(self, paddle, pos, dim, balls):
+        """Returns the y the paddle should go to, using the cached intercepts of the given ball entities."""
+        best = None
+        intercepts = self._intercepts.get(paddle)
+        if intercepts is None: self._intercepts[paddle] = intercepts = {}
+        for ball in balls:
+            ball_vel = self.world.get_component(ball, VelocityComponent)
+            entry = intercepts.get(ball)
+            if entry is None or entry[0] != ball_vel.vx or entry[1] != ball_vel.vy:
+                self.computed += 1
+                hit = self.intercept(self.world.get_component(ball, PositionComponent), ball_vel, self.world.get_component(ball, DimensionsComponent), pos, dim)
+                if hit is None: entry = [ball_vel.vx, ball_vel.vy, None, None, self._clock]
+                else: entry = [ball_vel.vx, ball_vel.vy, self._clock + hit[0], hit[1] + self.rng.uniform(-self.error, self.error), self._clock + self.reaction]
+                intercepts[ball] = entry
+            if entry[2] is not None and (best is None or entry[2] < best[2]): best = entry
+        if best is None: return self.screen_height / 2
+        # Hasta que pasa el tiempo de reacción se sigue yendo al objetivo anterior
+        if self._clock < best[4]: return self._targets.get(paddle, self.screen_height / 2)
+        return best[3]
+
+    def process(self, dt=0.0):
+        """
+        Updates AI paddle velocity towards the predicted intercept.
+
+        Args:
+            dt (float): Time since the last call, for the reaction delay.
+        """
+        self._clock += dt
+        balls = self.world.query(PositionComponent, VelocityComponent, DimensionsComponent, BallComponent)
+        for entity in self.world.query(PositionComponent, VelocityComponent, AIControlledComponent):
             pos, vel, dim = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, VelocityComponent), self.world.get_component(entity, DimensionsComponent)
-            if not all([pos, vel, dim]): continue
-            paddle_center = pos.y + dim.height / 2
-            if ball_pos.y < paddle_center - 10: vel.vy = -self.paddle_speed
-            elif ball_pos.y > paddle_center + 10: vel.vy = self.paddle_speed
-            else: vel.vy = 0
+            if pos is None or vel is None or dim is None: continue
+            intercepts = self._intercepts.get(entity)
+            if intercepts and len(intercepts) > 4 * (len(balls) + 1):
+                # Pelotas que ya no existen (cambio de modo, saques en multi-bola)
+                self._intercepts[entity] = {ball: intercepts[ball] for ball in balls if ball in intercepts}
+            target = self._target_for(entity, pos, dim, balls)
+            self._targets[entity] = target
+            # Proporcional a la distancia (sin oscilar alrededor del objetivo), limitado a la velocidad del nivel
+            vel.vy = clamp((target - (pos.y + dim.height / 2)) * 8, -self.paddle_speed, self.paddle_speed)
 
-class BallBoundarySystem:
+    def shutdown(self):
+        """Releases background resources; the predictive AI has none."""
+        pass
+
+class BroadphaseSystem:
     """
-    Handles ball collisions with the top and bottom boundaries of the screen.
+    Keeps a SpatialHash of every entity with a ColliderComponent, so collision systems
+    only run narrow-phase tests on nearby pairs instead of on every ball x target.
+    Runs after movement; entities that leave the world are dropped from the grid.
 
     Attributes:
         world: Reference to the ECS world.
-        sh (int): Screen height.
+        grid (SpatialHash): Boxes of the collidable entities, keyed by entity ID.
 
     Methods:
-        process(): Inverts ball vertical velocity if it hits the top or bottom edge.
+        process(): Moves every collider to its current box in the grid.
+        sync(entity): Updates one entity's box after a system moved it.
+        pairs(layer_a, layer_b) -> list: Overlapping (a, b) entity pairs of two layers.
     """
-    def __init__(self, world, screen_height):
-        self.world, self.sh = world, screen_height
+    def __init__(self, world, cell_size=64, field=None):
+        self.world = world
+        self.grid = SpatialHash(cell_size)
+        # Celdas del campo (y una de margen, por donde salen las pelotas) creadas de antemano
+        if field: self.grid.reserve(-cell_size, -cell_size, field[0] + 2 * cell_size, field[1] + 2 * cell_size)
     def process(self):
-        for ball_id in self.world.get_entities_with_components(BallComponent, PositionComponent, VelocityComponent, DimensionsComponent):
-            b_pos, b_vel, b_dim = self.world.get_component(ball_id, PositionComponent), self.world.get_component(ball_id, VelocityComponent), self.world.get_component(ball_id, DimensionsComponent)
-            if not all([b_pos, b_vel, b_dim]): continue
-            if (b_pos.y <= 0 and b_vel.vy < 0) or (b_pos.y >= self.sh - b_dim.height and b_vel.vy > 0):
-                b_vel.vy *= -1
+        entities = self.world.query(ColliderComponent, PositionComponent, DimensionsComponent)
+        for entity in entities: self.sync(entity)
+        if len(self.grid) > len(entities): self.grid.retain(set(entities))
+    def sync(self, entity):
+        """Updates the entity's box in the grid from its position and dimensions."""
+        pos, dim, collider = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, DimensionsComponent), self.world.get_component(entity, ColliderComponent)
+        self.grid.update(entity, pos.x, pos.y, dim.width, dim.height, collider.layer, collider.mask)
+    def pairs(self, layer_a, layer_b):
+        """
+        Returns the overlapping (a, b) entity pairs between two collision layers.
+
+        Args:
+            layer_a (int): Layer of the first entity of each pair.
+            layer_b (int): Layer of the second entity.
+        """
+        return self.grid.pairs(layer_a, layer_b)
 
 class PaddleCollisionSystem:
     """
     Handles ball and paddle collisions, including shrink mode and hit effects.
+    BallMovementSystem asks it for the first paddle a ball touches during a step (swept
+    test against the paddles the broadphase finds along the ball's path) and lets it
+    resolve the hit, so any number of balls can be in play at any speed.
 
     Attributes:
         world: Reference to the ECS world.
+        broadphase (BroadphaseSystem): Grid with the current paddle boxes.
         game_mode (str): Current game mode.
 
     Methods:
-        process(powerup_collision_system): Handles collision logic and effects.
-        calculate_bounce_vy(ball_rect, paddle_rect): Calculates new ball vertical velocity after collision.
+        time_of_impact(box, dx, dy) -> tuple: First paddle touched by a ball moving by (dx, dy).
+        resolve(ball_entity, paddle_id, nx, ny, powerup_collision_system): Bounces a ball off a paddle.
+        calculate_bounce_vy(ball_box, paddle_box): Calculates new ball vertical velocity after collision.
     """
-    def __init__(self, world, game_mode='classic'):
-        self.world, self.game_mode = world, game_mode
-    def process(self, powerup_collision_system):
-        ball_entities = self.world.get_entities_with_components(BallComponent)
-        ball_entity = next(iter(ball_entities), None)
-        if not ball_entity: return
+    def __init__(self, world, broadphase, game_mode='classic'):
+        self.world, self.broadphase, self.game_mode = world, broadphase, game_mode
+        self._flashes = {}  # pala -> su HitFlashComponent, reutilizado en cada golpe
+    def time_of_impact(self, box, dx, dy):
+        """
+        Returns the first paddle a ball touches while moving by (dx, dy).
+
+        Args:
+            box (tuple): Ball box (x, y, width, height) at the start of the motion.
+            dx, dy (float): Displacement of the ball.
+
+        Returns:
+            tuple: (toi, nx, ny, paddle_id), with toi the fraction of the displacement at
+                the contact and (nx, ny) the normal of the paddle side, or None.
+        """
+        # La broadphase solo devuelve las palas que tocan el recorrido completo de la pelota
+        x, y = min(box[0], box[0] + dx), min(box[1], box[1] + dy)
+        first = None
+        for paddle_id in self.broadphase.grid.query(x, y, box[2] + abs(dx), box[3] + abs(dy), COLLIDE_PADDLE):
+            hit = sweep_aabb(box, dx, dy, self.broadphase.grid.bounds(paddle_id))
+            if hit and (first is None or hit[0] < first[0]): first = (hit[0], hit[1], hit[2], paddle_id)
+        return first
+    def resolve(self, ball_entity, paddle_id, nx, ny, powerup_collision_system):
+        """
+        Puts a ball against the paddle side it touched and bounces it. Hitting the face
+        of a paddle speeds the ball up, aims it by the hit position and triggers the hit
+        effects; touching the top or bottom end only inverts its vertical velocity.
+
+        Args:
+            ball_entity: Entity ID of the ball.
+            paddle_id: Entity ID of the paddle.
+            nx, ny (int): Normal of the paddle side that was touched.
+            powerup_collision_system (PowerupCollisionSystem): Told which paddle hit last.
+        """
         b_pos, b_vel, b_dim = self.world.get_component(ball_entity, PositionComponent), self.world.get_component(ball_entity, VelocityComponent), self.world.get_component(ball_entity, DimensionsComponent)
-        if not all([b_pos, b_vel, b_dim]): return
-        ball_rect = pygame.Rect(b_pos.x, b_pos.y, b_dim.width, b_dim.height)
-        paddles_and_ai = list(self.world.get_entities_with_components(PaddleComponent)) + list(self.world.get_entities_with_components(AIControlledComponent))
-        for paddle_id in paddles_and_ai:
-            p_pos, p_dim = self.world.get_component(paddle_id, PositionComponent), self.world.get_component(paddle_id, DimensionsComponent)
-            if not all([p_pos, p_dim]): continue
-            paddle_rect = pygame.Rect(p_pos.x, p_pos.y, p_dim.width, p_dim.height)
-            if ball_rect.colliderect(paddle_rect):
-                if (b_vel.vx < 0 and ball_rect.left < paddle_rect.right) or (b_vel.vx > 0 and ball_rect.right > paddle_rect.left):
-                    if b_vel.vx < 0: b_pos.x = paddle_rect.right
-                    else: b_pos.x = paddle_rect.left - b_dim.width
-                    b_vel.vx *= -1.1
-                    b_vel.vy = self.calculate_bounce_vy(ball_rect, paddle_rect)
-                    self.world.add_component(paddle_id, HitFlashComponent(150))
-                    if self.game_mode == 'shrink':
-                        if p_dim and p_dim.height > 20: p_dim.height -= 5
-                    powerup_collision_system.last_paddle_hit = paddle_id
-                    break
-    def calculate_bounce_vy(self, ball_rect, paddle_rect):
+        paddle_box = self.broadphase.grid.bounds(paddle_id)
+        self.world.get_component(ball_entity, BallComponent).last_paddle_hit = paddle_id
+        powerup_collision_system.last_paddle_hit = paddle_id
+        if ny:
+            b_pos.y = paddle_box[1] + paddle_box[3] if ny > 0 else paddle_box[1] - b_dim.height
+            if b_vel.vy * ny < 0: b_vel.vy *= -1
+            return
+        b_pos.x = paddle_box[0] + paddle_box[2] if nx > 0 else paddle_box[0] - b_dim.width
+        if b_vel.vx * nx >= 0: return
+        b_vel.vx *= -1.1
+        b_vel.vy = self.calculate_bounce_vy((b_pos.x, b_pos.y, b_dim.width, b_dim.height), paddle_box)
+        flash = self._flashes.get(paddle_id)
+        if flash is None: self._flashes[paddle_id] = flash = HitFlashComponent(150)
+        flash.activation_time = pygame.time.get_ticks()
+        self.world.add_component(paddle_id, flash)
+        if self.game_mode == 'shrink':
+            p_dim = self.world.get_component(paddle_id, DimensionsComponent)
+            if p_dim and p_dim.height > 20: p_dim.height -= 5
+    def calculate_bounce_vy(self, ball_box, paddle_box):
         """
         Calculates new ball vertical velocity after collision.
 
         Args:
-            ball_rect (pygame.Rect): Ball rectangle.
-            paddle_rect (pygame.Rect): Paddle rectangle.
+            ball_box: Ball box as (x, y, width, height) (a pygame.Rect also works).
+            paddle_box: Paddle box as (x, y, width, height).
 
         Returns:
             float: New vertical velocity for the ball.
         """
-        relative_intersect = (paddle_rect.centery - ball_rect.centery) / (paddle_rect.height / 2)
+        relative_intersect = ((paddle_box[1] + paddle_box[3] / 2) - (ball_box[1] + ball_box[3] / 2)) / (paddle_box[3] / 2)
         return -relative_intersect * 400
 
-class ScoringSystem:
+class BallMovementSystem:
     """
-    Manages scoring, ball resets, and win conditions.
+    Moves the balls with continuous collision detection. Each ball travels its step in
+    segments: the wall and paddle systems report the earliest time of impact along the
+    remaining displacement, the ball advances exactly to that contact, the hit is
+    resolved (changing its velocity) and the rest of the step continues with the new
+    velocity. A ball therefore never passes through a paddle or a wall, whatever its
+    speed or the length of the step, so simulations can take large steps instead of
+    sub-stepping. Paddles are moved (and put in the broadphase) before the balls.
 
     Attributes:
         world: Reference to the ECS world.
-        sw (int): Screen width.
-        sh (int): Screen height.
-        waiting_to_reset (bool): True if waiting to reset the ball.
-        reset_timer (int): Time to reset the ball.
-        ball_to_reset: Entity ID of the ball to reset.
+        boundary_system (BallBoundarySystem): Top and bottom walls.
+        paddle_collision_system (PaddleCollisionSystem): Paddles.
+        max_contacts (int): Contacts resolved per ball and step; a ball trapped between
+            a paddle and a wall stops at its last contact instead of looping.
 
     Methods:
-        process(): Handles scoring and ball reset logic.
-        handle_score(ball_id, scoring_player): Updates score and triggers confetti.
-        create_confetti(x, y): Spawns confetti particles.
-        reset_ball(ball_id): Resets ball position and velocity.
+        process(dt, powerup_collision_system): Moves every ball through the step.
     """
-    def __init__(self, world, screen_width, screen_height):
-        self.world, self.sw, self.sh = world, screen_width, screen_height
-        self.waiting_to_reset = False
-        self.reset_timer = 0
-        self.ball_to_reset = None
-    def process(self):
-        if self.waiting_to_reset and pygame.time.get_ticks() >= self.reset_timer:
-            self.reset_ball(self.ball_to_reset)
-            self.waiting_to_reset = False
-            self.ball_to_reset = None
-        if not self.waiting_to_reset:
-            for ball_id in self.world.get_entities_with_components(BallComponent, PositionComponent):
-                b_pos, b_dim = self.world.get_component(ball_id, PositionComponent), self.world.get_component(ball_id, DimensionsComponent)
-                if not all([b_pos, b_dim]): continue
-                if b_pos.x <= -b_dim.width: self.handle_score(ball_id, 2); break
-                if b_pos.x >= self.sw: self.handle_score(ball_id, 1); break
-    def handle_score(self, ball_id, scoring_player):
-        for score_entity in self.world.get_entities_with_components(ScoreComponent):
-            score_comp = self.world.get_component(score_entity, ScoreComponent)
-            if score_comp and score_comp.player_number == scoring_player:
-                score_comp.score += 1
-                if score_comp.score >= WINNING_SCORE:
-                    print(f"JUGADOR {scoring_player} GANA!")
-                    # Aquí podrías cambiar a una escena de fin de juego
-                break
-        b_pos = self.world.get_component(ball_id, PositionComponent)
-        b_vel = self.world.get_component(ball_id, VelocityComponent)
-        if b_pos: self.create_confetti(b_pos.x, b_pos.y)
-        if b_vel: b_vel.vx, b_vel.vy = 0, 0
-        self.waiting_to_reset = True
-        self.reset_timer = pygame.time.get_ticks() + 1000
-        self.ball_to_reset = ball_id
-    def create_confetti(self, x, y):
-        for _ in range(30):
-            entity = self.world.create_entity()
-            self.world.add_component(entity, PositionComponent(x, y))
-            velocity = (pygame.math.Vector2(1, 0).rotate(random.uniform(0, 360))) * random.uniform(50, 200)
-            self.world.add_component(entity, ParticleComponent(random.randint(500, 1500), velocity, random.choice(CONFETTI_COLORS)))
-    def reset_ball(self, ball_id):
-        b_pos, b_vel = self.world.get_component(ball_id, PositionComponent), self.world.get_component(ball_id, VelocityComponent)
-        if not all([b_pos, b_vel]): return
-        b_pos.x, b_pos.y = self.sw / 2 - 10, self.sh / 2 - 10
-        b_vel.vx, b_vel.vy = 300 * random.choice([-1, 1]), 300 * random.choice([-1, 1])
+    def __init__(self, world, boundary_system, paddle_collision_system, max_contacts=16):
+        self.world = world
+        self.boundary_system = boundary_system
+        self.paddle_collision_system = paddle_collision_system
+        self.max_contacts = max_contacts
+        self._box = [0.0, 0.0, 0.0, 0.0]  # caja de la pelota, reutilizada en cada tramo
+    def process(self, dt, powerup_collision_system):
+        broadphase = self.paddle_collision_system.broadphase
+        box = self._box
+        for ball in self.world.query(BallComponent, PositionComponent, VelocityComponent, DimensionsComponent):
+            pos, vel, dim = self.world.get_component(ball, PositionComponent), self.world.get_component(ball, VelocityComponent), self.world.get_component(ball, DimensionsComponent)
+            remaining = dt
+            for _ in range(self.max_contacts):
+                dx, dy = vel.vx * remaining, vel.vy * remaining
+                wall = self.boundary_system.time_of_impact(pos.y, dim.height, dy)
+                box[0], box[1], box[2], box[3] = pos.x, pos.y, dim.width, dim.height
+                paddle = self.paddle_collision_system.time_of_impact(box, dx, dy)
+                if wall is None and paddle is None:
+                    pos.x += dx
+                    pos.y += dy
+                    break
+                if paddle is None: toi = wall[0]
+                elif wall is None: toi = paddle[0]
+                else: toi = min(wall[0], paddle[0])
+                pos.x += dx * toi
+                pos.y += dy * toi
+                remaining *= 1 - toi
+                if paddle is not None and paddle[0] == toi: self.paddle_collision_system.resolve(ball, paddle[3], paddle[1], paddle[2], powerup_collision_system)
+                else: self.boundary_system.bounce(pos, vel, dim, wall[1])
+            if ball in broadphase.grid: broadphase.sync(ball)
 
 class GameRenderSystem:
     """
-    Renders paddles, ball, powerups, and scores.
+    Renders paddles, ball, powerups, and scores by submitting draw commands to a RenderQueue.
+
+    Paddles are drawn from the player_1 / player_2 sprites and the ball from the ball sprite
+    (mirrored when it travels left), all through a SpriteCache so their changing sizes never
+    scale an image per frame. Without a sprite cache, or before the assets are loaded, they
+    are drawn as flat rects.
 
     Attributes:
         world: Reference to the ECS world.
-        screen: Pygame surface to draw on.
-        font: Font for rendering scores.
+        render_queue (RenderQueue): Queue the draw commands are submitted to.
+        sprites (SpriteCache): Scaled sprites, or None to draw flat rects.
+        score_atlas (GlyphAtlas): Pre-rendered ARCADECLASSIC digits used to draw the scores.
 
     Methods:
-        process(): Draws all game entities and scores.
+        process(): Submits all game entities and scores to the render queue.
     """
-    def __init__(self, world, screen):
-        self.world, self.screen, self.font = world, screen, pygame.font.Font(None, 74)
+    def __init__(self, world, render_queue, sprites=None):
+        self.world, self.render_queue, self.sprites = world, render_queue, sprites
+        self.score_atlas = GlyphAtlas(74, COLOR_WHITE, ARCADE_FONT_PATH)
+        self._score_layouts = {}  # (marcador, x, y) -> secuencia de glifos, para no maquetar cada frame
+    def submit_sprite(self, asset_key, color, pos, dim, flip_x=False):
+        """
+        Submits an entity drawn with a cached sprite of the asset, centred on its rect,
+        or a flat rect of the given colour if the asset is not available.
+        """
+        if self.sprites is None or not self.sprites.assets.is_loaded(asset_key):
+            self.render_queue.submit_rect(LAYER_WORLD, color, (pos.x, pos.y, dim.width, dim.height))
+            return
+        sprite = self.sprites.get(asset_key, dim.width, dim.height, flip_x)
+        width, height = sprite.get_size()
+        self.render_queue.submit_sprite(LAYER_WORLD, sprite, (pos.x + (dim.width - width) / 2, pos.y + (dim.height - height) / 2))
     def process(self):
         current_time = pygame.time.get_ticks()
-        for entity in self.world.get_entities_with_components(PositionComponent, DimensionsComponent):
+        for entity in self.world.query(PositionComponent, DimensionsComponent):
             pos, dim = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, DimensionsComponent)
-            if not all([pos, dim]): continue
+            if pos is None or dim is None: continue
             if self.world.get_component(entity, PaddleComponent) or self.world.get_component(entity, AIControlledComponent):
-                color = COLOR_PADDLE
                 hit_flash = self.world.get_component(entity, HitFlashComponent)
                 if hit_flash:
-                    if current_time < hit_flash.activation_time + hit_flash.duration: color = COLOR_HIT_FLASH
-                    else: self.world.remove_component(entity, HitFlashComponent)
-                pygame.draw.rect(self.screen, color, (pos.x, pos.y, dim.width, dim.height))
+                    if current_time < hit_flash.activation_time + hit_flash.duration:
+                        self.render_queue.submit_rect(LAYER_WORLD, COLOR_HIT_FLASH, (pos.x, pos.y, dim.width, dim.height))
+                        continue
+                    self.world.remove_component(entity, HitFlashComponent)
+                paddle = self.world.get_component(entity, PaddleComponent)
+                self.submit_sprite('player_1' if paddle and paddle.player_number == 1 else 'player_2', COLOR_PADDLE, pos, dim)
             elif self.world.get_component(entity, BallComponent):
-                pygame.draw.rect(self.screen, COLOR_BALL, (pos.x, pos.y, dim.width, dim.height))
+                vel = self.world.get_component(entity, VelocityComponent)
+                self.submit_sprite('ball', COLOR_BALL, pos, dim, flip_x=bool(vel and vel.vx < 0))
             elif self.world.get_component(entity, PowerupComponent):
-                pygame.draw.rect(self.screen, COLOR_POWERUP, (pos.x, pos.y, dim.width, dim.height))
-        for entity in self.world.get_entities_with_components(PositionComponent, ScoreComponent):
+                self.render_queue.submit_rect(LAYER_WORLD, COLOR_POWERUP, (pos.x, pos.y, dim.width, dim.height))
+        for entity in self.world.query(PositionComponent, ScoreComponent):
             pos, score = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, ScoreComponent)
-            if not all([pos, score]): continue
-            text_surf = self.font.render(str(score.score), True, COLOR_WHITE)
-            self.screen.blit(text_surf, text_surf.get_rect(center=(pos.x, pos.y)))
+            if pos is None or score is None: continue
+            key = (score.score, pos.x, pos.y)
+            layout = self._score_layouts.get(key)
+            if layout is None:
+                if len(self._score_layouts) > 64: self._score_layouts.clear()
+                self._score_layouts[key] = layout = self.score_atlas.layout(str(score.score), (pos.x, pos.y))
+            for glyph, dest in layout:
+                self.render_queue.submit_sprite(LAYER_HUD, glyph, dest)
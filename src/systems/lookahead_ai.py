@@ -0,0 +1,259 @@
+"""
+lookahead_ai.py
+---------------
+Expert AI that chooses its moves by simulating the match a little ahead.
+
+Classes:
+    RolloutPlanner: Scores candidate paddle targets with rollouts in forked worlds.
+    LookaheadAISystem: Predictive AI refined by a RolloutPlanner running in a worker process.
+"""
+
+import multiprocessing
+import os
+import time
+from components.menu_components import PositionComponent, DimensionsComponent
+from components.game_components import *
+from components.powerup_components import PowerupComponent, ActivePowerupComponent
+from systems.environment import BallBoundarySystem
+from systems.game_systems import AISystem, MovementSystem, BroadphaseSystem, PaddleCollisionSystem, BallMovementSystem
+from systems.powerup_systems import PowerupCollisionSystem, PowerupEffectSystem
+from utils.utils import clamp
+
+# Columnas que la simulación modifica (se copian) y las que solo lee (se comparten)
+FORK_COPIED = (PositionComponent, VelocityComponent, DimensionsComponent, BallComponent, ActivePowerupComponent)
+FORK_SHARED = (PaddleComponent, AIControlledComponent, ColliderComponent, PowerupComponent)
+
+# Valor de cada resultado de una simulación, desde el punto de vista de la pala que planifica
+ROLLOUT_SCORES = {
+    'conceded': -1000,
+    'scored': 200,
+    'hit': 50,
+    'powerup': 150
+}
+
+def _coarse_to_fine(reach, levels):
+    """Offsets in [-reach, reach]: 0 and both ends, then the midpoints of each previous level."""
+    offsets, points = [0.0, -reach, reach], [-reach, 0.0, reach]
+    for _ in range(levels):
+        midpoints = [(a + b) / 2 for a, b in zip(points, points[1:])]
+        offsets += sorted(midpoints, key=lambda offset: (abs(offset), offset))
+        points = sorted(points + midpoints)
+    return tuple(offsets)
+
+# Candidatos: desplazamientos del punto de impacto sobre la pala, en fracciones de su media altura.
+# Van de grueso a fino (33 en total, más de los que caben en 8 ms): si el presupuesto se agota a medias,
+# los ya probados cubren toda la pala
+CANDIDATE_OFFSETS = _coarse_to_fine(0.95, 4)
+
+def _planner_loop(planner, connection):
+    """Body of the worker process: answers each (snapshot, paddles, signature) request with a plan."""
+    # El worker solo usa la CPU que el juego deja libre (el tiempo que duerme en clock.tick):
+    # en un solo núcleo, despertarlo al enviar una petición no le quita el turno al bucle
+    if hasattr(os, 'sched_setscheduler'):
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    elif hasattr(os, 'nice'):
+        os.nice(10)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None: return
+        connection.send(planner.make_plan(*request))
+
+class RolloutPlanner:
+    """
+    Scores candidate targets for the AI paddles by simulating ahead.
+
+    Each candidate is a target for the paddle's centre: the analytic intercept shifted
+    by CANDIDATE_OFFSETS, which makes the ball leave the paddle at different angles. There
+    are more candidates than the budget usually allows (a rollout takes 0.3-0.5 ms), ordered
+    from coarse to fine, so the budget alone decides how finely the paddle is searched. A
+    rollout simulates the horizon in a fork of the snapshot (ECSWorld.fork: only the
+    columns the physics needs, the read-only ones shared) with the real movement,
+    swept-collision and powerup systems, so it sees walls, paddle speed-ups, shrinking
+    paddles in shrink mode and powerups collected by the ball. Outcomes are scored with
+    ROLLOUT_SCORES, plus how close the paddle ends to the next incoming ball.
+
+    The planner holds only settings, so it can be sent to a worker process.
+
+    Attributes:
+        screen_width, screen_height (int): Size of the field.
+        game_mode (str): Game mode simulated ('classic', 'shrink', ...).
+        paddle_speed (int): Speed of the simulated AI paddle.
+        budget (float): Seconds of simulation per plan; the analytic intercept is always scored.
+        horizon (float): Seconds simulated by each rollout.
+        step (float): Time step of the rollouts (large steps are safe with swept collision).
+
+    Methods:
+        make_plan(snapshot, paddles, signature) -> tuple:
+            Returns ({paddle: target}, signature, rollouts run).
+
+        rollout(snapshot, paddle, target) -> float:
+            Simulates the horizon with the paddle heading for target and returns its score.
+    """
+    def __init__(self, screen_width, screen_height, game_mode, paddle_speed, budget=0.008, horizon=0.8, step=1 / 15):
+        self.screen_width, self.screen_height = screen_width, screen_height
+        self.game_mode = game_mode
+        self.paddle_speed = paddle_speed
+        self.budget, self.horizon, self.step = budget, horizon, step
+        self._predictor = AISystem(None, screen_height)
+
+    def make_plan(self, snapshot, paddles, signature):
+        """
+        Picks the best candidate target of each paddle within the budget.
+
+        Args:
+            snapshot (ECSWorld): Fork of the world when the plan was requested.
+            paddles (list): (paddle entity, analytic target) pairs.
+            signature (tuple): Ball velocities the plan is valid for; returned as is.
+
+        Returns:
+            tuple: ({paddle: target}, signature, number of rollouts).
+        """
+        deadline = time.perf_counter() + self.budget
+        plan, rollouts = {}, 0
+        for paddle, base_target in paddles:
+            reach = snapshot.get_component(paddle, DimensionsComponent).height / 2 - 4
+            best_score, best_target = None, base_target
+            # El primer candidato es la intercepción: si no da tiempo a más, se queda ella
+            for offset in CANDIDATE_OFFSETS:
+                if best_score is not None and time.perf_counter() > deadline: break
+                target = base_target + offset * reach
+                score = self.rollout(snapshot, paddle, target)
+                rollouts += 1
+                if best_score is None or score > best_score: best_score, best_target = score, target
+            plan[paddle] = best_target
+        return plan, signature, rollouts
+
+    def rollout(self, snapshot, paddle, target):
+        """Simulates the horizon in a fork where the paddle heads for target; returns its score."""
+        world = snapshot.fork(FORK_COPIED, FORK_SHARED)
+        broadphase = BroadphaseSystem(world)
+        paddle_collision = PaddleCollisionSystem(world, broadphase, self.game_mode)
+        powerup_collision = PowerupCollisionSystem(world, broadphase)
+        movement = MovementSystem(world, self.screen_height)
+        ball_movement = BallMovementSystem(world, BallBoundarySystem(world, self.screen_height), paddle_collision)
+        powerup_effect = PowerupEffectSystem(world)
+        pos, vel, dim = world.get_component(paddle, PositionComponent), world.get_component(paddle, VelocityComponent), world.get_component(paddle, DimensionsComponent)
+        right_side = pos.x > self.screen_width / 2
+        had_powerup = world.get_component(paddle, ActivePowerupComponent) is not None
+        score, elapsed = 0.0, 0.0
+        live = set(world.get_entities_with_components(BallComponent))
+        returned = set()
+        while elapsed < self.horizon and live:
+            vel.vy = clamp((target - (pos.y + dim.height / 2)) * 8, -self.paddle_speed, self.paddle_speed)
+            movement.process(self.step)
+            broadphase.process()
+            ball_movement.process(self.step, powerup_collision)
+            powerup_collision.process()
+            powerup_effect.process()
+            elapsed += self.step
+            for ball in list(live):
+                ball_pos, ball_vel = world.get_component(ball, PositionComponent), world.get_component(ball, VelocityComponent)
+                if ball not in returned and world.get_component(ball, BallComponent).last_paddle_hit == paddle and (ball_vel.vx < 0) == right_side:
+                    returned.add(ball)
+                # Los goles pesan más cuanto antes llegan
+                urgency = 1 - 0.5 * elapsed / self.horizon
+                if ball_pos.x >= self.screen_width or ball_pos.x <= -world.get_component(ball, DimensionsComponent).width:
+                    conceded = (ball_pos.x >= self.screen_width) == right_side
+                    score += urgency * ROLLOUT_SCORES['conceded' if conceded else 'scored']
+                    live.discard(ball)
+        score += ROLLOUT_SCORES['hit'] * len(returned)
+        if not had_powerup and world.get_component(paddle, ActivePowerupComponent) is not None: score += ROLLOUT_SCORES['powerup']
+        # Desempate: lo bien colocada que queda la pala para la siguiente pelota que venga
+        for ball in live:
+            hit = self._predictor.intercept(world.get_component(ball, PositionComponent), world.get_component(ball, VelocityComponent), world.get_component(ball, DimensionsComponent), pos, dim)
+            if hit: score -= abs(hit[1] - (pos.y + dim.height / 2)) / self.screen_height
+        return score
+
+class LookaheadAISystem(AISystem):
+    """
+    Expert AI: the predictive AI of AISystem, refined by a RolloutPlanner.
+
+    When a plan is due, the main thread takes a snapshot fork of the world (about 10 us
+    for a match) and sends it through a pipe to a worker process, where the planner runs
+    its rollouts within its budget. A process rather than a thread, so the rollouts never
+    hold the interpreter lock during a frame; it runs at idle priority where the OS
+    allows it, so on a single core it only uses the time the loop sleeps.
+
+    The plan is used while the balls keep the velocities it was made for. A new one is
+    requested when they change (or every replan_interval seconds), and until it arrives
+    the paddle follows the analytic intercept, so the frame never waits for the worker.
+
+    Attributes:
+        planner (RolloutPlanner): Settings of the rollouts.
+        replan_interval (float): Seconds after which a plan is refreshed anyway.
+        plans (int): Plans completed.
+        rollouts (int): Rollouts simulated by the worker.
+
+    Methods:
+        process(dt): Steers the AI paddles with the current plan and requests new ones.
+        shutdown(): Stops the worker process.
+    """
+    def __init__(self, world, screen_height, difficulty='expert', rng=None, screen_width=800, game_mode='classic', replan_interval=0.5, **planner_options):
+        super().__init__(world, screen_height, difficulty, rng)
+        self.planner = RolloutPlanner(screen_width, screen_height, game_mode, self.paddle_speed, **planner_options)
+        self.replan_interval = replan_interval
+        self.plans = 0
+        self.rollouts = 0
+        # 'spawn': el worker no hereda el estado de SDL del proceso del juego. Un Pipe sin hilos
+        # auxiliares: el hilo principal solo envía y sondea, nunca compite por el GIL
+        context = multiprocessing.get_context('spawn')
+        self._connection, worker_end = context.Pipe()
+        self._worker = context.Process(target=_planner_loop, args=(self.planner, worker_end), name='lookahead-ai', daemon=True)
+        self._worker.start()
+        worker_end.close()
+        self._pending = False
+        self._plan = {}            # pala -> objetivo elegido
+        self._plan_signature = None
+        self._planned_at = -1.0
+
+    def _signature(self, balls):
+        return tuple((ball, self.world.get_component(ball, VelocityComponent).vx, self.world.get_component(ball, VelocityComponent).vy) for ball in sorted(balls))
+
+    def process(self, dt=0.0):
+        """
+        Steers the AI paddles towards the planned targets (or the analytic intercept while
+        there is no valid plan) and hands a snapshot to the worker when a new plan is due.
+
+        Args:
+            dt (float): Time since the last call.
+        """
+        self._clock += dt
+        balls = self.world.query(PositionComponent, VelocityComponent, DimensionsComponent, BallComponent)
+        signature = self._signature(balls)
+        if self._pending and self._connection.poll():
+            self._plan, self._plan_signature, rollouts = self._connection.recv()
+            self._pending = False
+            self.plans += 1
+            self.rollouts += rollouts
+        paddles = []
+        for entity in self.world.query(PositionComponent, VelocityComponent, AIControlledComponent):
+            pos, vel, dim = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, VelocityComponent), self.world.get_component(entity, DimensionsComponent)
+            if pos is None or vel is None or dim is None: continue
+            target = self._target_for(entity, pos, dim, balls)
+            paddles.append((entity, target))
+            if self._plan_signature == signature and entity in self._plan: target = self._plan[entity]
+            self._targets[entity] = target
+            vel.vy = clamp((target - (pos.y + dim.height / 2)) * 8, -self.paddle_speed, self.paddle_speed)
+        stale = signature != self._plan_signature or self._clock - self._planned_at >= self.replan_interval
+        if paddles and balls and stale and not self._pending and self._worker.is_alive():
+            # La instantánea se toma aquí; el worker recibe su copia serializada
+            self._connection.send((self.world.fork(FORK_COPIED, FORK_SHARED), paddles, signature))
+            self._planned_at = self._clock
+            self._pending = True
+
+    def shutdown(self):
+        """Stops the worker process (the plan being computed, if any, is discarded)."""
+        if self._worker.is_alive():
+            try:
+                self._connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._worker.join(timeout=0.5)
+            if self._worker.is_alive():
+                self._worker.terminate()
+                self._worker.join()
+        self._connection.close()
+        self._pending = False
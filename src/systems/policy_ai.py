@@ -0,0 +1,125 @@
+"""
+policy_ai.py
+------------
+AI that plays from a policy table precomputed offline by tools/train_ai_policy.py.
+
+Classes:
+    PolicyGrid: Discretization of the state an AI paddle sees, shared by the trainer and the AI.
+    TabularAISystem: Moves each AI paddle to the target read from the policy table.
+"""
+
+import numpy as np
+from components.menu_components import PositionComponent, DimensionsComponent
+from components.game_components import *
+from systems.game_systems import AISystem
+from utils.utils import clamp, AI_POLICY_PATH
+
+# Dimensiones del estado, en el orden de los ejes de la tabla: (mínimo, máximo, casillas)
+POLICY_DIMENSIONS = ('distance', 'ball_y', 'speed', 'ball_vy', 'paddle_y', 'paddle_height')
+POLICY_RANGES = (
+    (0, 700, 12),       # distancia de la pelota a la cara de la pala (px)
+    (0, 600, 12),       # y de la pelota (borde superior)
+    (0, 1600, 8),       # velocidad hacia la pala (px/s); la casilla 0 incluye las que se alejan
+    (-800, 800, 12),    # velocidad vertical de la pelota
+    (0, 600, 16),       # y del centro de la pala
+    (20, 110, 3)        # alto de la pala (modo shrink y powerups)
+)
+
+class PolicyGrid:
+    """
+    Uniform discretization of the state of one AI paddle facing one ball. The state is
+    seen from the paddle's side (distance to its face and speed towards it), so the
+    same table serves both paddles. Values outside a range fall in its first or last
+    cell.
+
+    Attributes:
+        ranges (tuple): (low, high, cells) of each dimension, in POLICY_DIMENSIONS order.
+        shape (tuple): Shape of the policy table.
+
+    Methods:
+        index(distance, ball_y, speed, ball_vy, paddle_y, paddle_height) -> tuple:
+            Returns the table index of a state.
+
+        edges(dimension) -> np.ndarray:
+            Returns the lower edge of every cell of a dimension.
+    """
+    def __init__(self, ranges=POLICY_RANGES):
+        self.ranges = tuple((float(low), float(high), int(cells)) for low, high, cells in ranges)
+        self.shape = tuple(cells for _, _, cells in self.ranges)
+        # Precalculado para index(): (mínimo, casillas por px, última casilla)
+        self._scales = tuple((low, cells / (high - low), cells - 1) for low, high, cells in self.ranges)
+
+    def index(self, *state):
+        """
+        Returns the table index of a state.
+
+        Args:
+            *state (float): distance, ball_y, speed, ball_vy, paddle_y and paddle_height.
+
+        Returns:
+            tuple: One cell per dimension.
+        """
+        return tuple(min(last, max(0, int((value - low) * scale))) for value, (low, scale, last) in zip(state, self._scales))
+
+    def edges(self, dimension):
+        """Returns the lower edge of every cell of a dimension (by name or axis)."""
+        if isinstance(dimension, str): dimension = POLICY_DIMENSIONS.index(dimension)
+        low, high, cells = self.ranges[dimension]
+        return low + np.arange(cells) * (high - low) / cells
+
+class TabularAISystem(AISystem):
+    """
+    AI that acts from a precomputed policy table: each frame, every AI paddle takes the
+    ball that will reach it first, and one indexed read of the table gives the y its
+    centre should go to. There is no prediction or search at run time; the table
+    (tools/train_ai_policy.py) was optimized offline over many simulated rallies, and
+    it also chooses where on the paddle to take the ball to make the return hard.
+
+    The aim error and reaction of the difficulty preset do not apply; its paddle speed does.
+
+    Attributes:
+        table (np.ndarray): Target y (int16) for every cell of the grid.
+        grid (PolicyGrid): Discretization the table was built with.
+        screen_width (int): Width of the field, to know which side each paddle is on.
+        reads (int): Table reads, for profiling.
+
+    Methods:
+        process(dt): Sets each AI paddle's velocity towards its table target.
+    """
+    def __init__(self, world, screen_height, difficulty='master', rng=None, screen_width=800, path=AI_POLICY_PATH):
+        super().__init__(world, screen_height, difficulty, rng)
+        with np.load(path) as data:
+            self.table = data['targets']
+            self.grid = PolicyGrid(data['ranges'].tolist())
+            field = tuple(int(size) for size in data['field'])
+        if field != (screen_width, screen_height):
+            raise ValueError(f"Policy table {path} was built for a {field[0]}x{field[1]} field")
+        self.screen_width = screen_width
+        self.reads = 0
+
+    def process(self, dt=0.0):
+        """
+        Sets each AI paddle's velocity towards the target read from the table.
+
+        Args:
+            dt (float): Time since the last call (unused; the table has no reaction delay).
+        """
+        balls = self.world.query(PositionComponent, VelocityComponent, DimensionsComponent, BallComponent)
+        for entity in self.world.query(PositionComponent, VelocityComponent, AIControlledComponent):
+            pos, vel, dim = self.world.get_component(entity, PositionComponent), self.world.get_component(entity, VelocityComponent), self.world.get_component(entity, DimensionsComponent)
+            if pos is None or vel is None or dim is None: continue
+            right_side = pos.x > self.screen_width / 2
+            # La pelota que llegará antes, vista desde el lado de esta pala
+            best, best_time = None, None
+            for ball in balls:
+                ball_pos, ball_vel, ball_dim = self.world.get_component(ball, PositionComponent), self.world.get_component(ball, VelocityComponent), self.world.get_component(ball, DimensionsComponent)
+                if right_side: distance, speed = pos.x - (ball_pos.x + ball_dim.width), ball_vel.vx
+                else: distance, speed = ball_pos.x - (pos.x + dim.width), -ball_vel.vx
+                if speed <= 0 or distance < 0: continue
+                if best is None or distance / speed < best_time: best, best_time = (distance, ball_pos.y, speed, ball_vel.vy), distance / speed
+            centre = pos.y + dim.height / 2
+            if best is None: target = self.screen_height / 2
+            else:
+                target = self.table[self.grid.index(*best, centre, dim.height)]
+                self.reads += 1
+            vel.vy = clamp((target - centre) * 8, -self.paddle_speed, self.paddle_speed)
@@ -6,14 +6,14 @@ and applying/removing powerup effects.
 
 Classes:
     PowerupSpawningSystem: Handles spawning powerup items on the field.
-    PowerupCollisionSystem: Detects when the ball collects a powerup.
+    PowerupCollisionSystem: Detects when a ball collects a powerup.
     PowerupEffectSystem: Applies and removes active powerup effects.
 """
 
 import pygame
 import random
 from components.menu_components import PositionComponent, DimensionsComponent
-from components.game_components import BallComponent
+from components.game_components import BallComponent, ColliderComponent, COLLIDE_BALL, COLLIDE_POWERUP
 from components.powerup_components import PowerupComponent, ActivePowerupComponent
 
 class PowerupSpawningSystem:
@@ -26,19 +26,21 @@ class PowerupSpawningSystem:
         sh (int): Screen height.
         last_spawn_time (int): Last time a powerup was spawned.
         spawn_interval (int): Interval between spawns in milliseconds.
+        max_powerups (int): Powerups that can be on the field at once.
 
     Methods:
-        process(): Spawns a powerup if none exist and interval has passed.
+        process(): Spawns a powerup if there is room for one and the interval has passed.
     """
-    def __init__(self, world, screen_width, screen_height):
+    def __init__(self, world, screen_width, screen_height, spawn_interval=10000, max_powerups=1):
         self.world = world
         self.sw, self.sh = screen_width, screen_height
         self.last_spawn_time = pygame.time.get_ticks()
-        self.spawn_interval = 10000 # 10 segundos
+        self.spawn_interval = spawn_interval # 10 segundos por defecto
+        self.max_powerups = max_powerups
 
     def process(self):
         current_time = pygame.time.get_ticks()
-        if any(self.world.get_entities_with_components(PowerupComponent)):
+        if len(self.world.query(PowerupComponent)) >= self.max_powerups:
             return
             
         if current_time > self.last_spawn_time + self.spawn_interval:
@@ -49,44 +51,42 @@ class PowerupSpawningSystem:
             self.world.add_component(entity_id, PositionComponent(x, y))
             self.world.add_component(entity_id, DimensionsComponent(30, 30))
             self.world.add_component(entity_id, PowerupComponent('BIG_PADDLE'))
+            self.world.add_component(entity_id, ColliderComponent(COLLIDE_POWERUP, COLLIDE_BALL))
 
 class PowerupCollisionSystem:
     """
-    Detects when the ball collects a powerup and applies it to the last paddle hit.
+    Detects when a ball collects a powerup and applies it to the last paddle that hit
+    that ball. Only the ball-powerup pairs reported by the broadphase are checked.
 
     Attributes:
         world: Reference to the ECS world.
-        last_paddle_hit: Entity ID of the last paddle that hit the ball.
+        broadphase (BroadphaseSystem): Source of the candidate pairs.
+        last_paddle_hit: Entity ID of the last paddle that hit any ball.
 
     Methods:
-        process(): Checks for collisions between the ball and powerups.
+        process(): Collects the powerups touched by a ball.
     """
-    def __init__(self, world):
+    def __init__(self, world, broadphase):
         self.world = world
+        self.broadphase = broadphase
         self.last_paddle_hit = None
+        self._collected = set()  # reutilizado en cada frame
 
     def process(self):
-        # CORRECCIÓN: Usamos next(iter(...), None) para obtener la pelota de forma segura.
-        ball_entities = self.world.get_entities_with_components(BallComponent)
-        ball_entity = next(iter(ball_entities), None)
-        if not ball_entity: return
-        
-        b_pos = self.world.get_component(ball_entity, PositionComponent)
-        b_dim = self.world.get_component(ball_entity, DimensionsComponent)
-        if not all([b_pos, b_dim]): return
-        ball_rect = pygame.Rect(b_pos.x, b_pos.y, b_dim.width, b_dim.height)
-
-        for powerup_id in list(self.world.get_entities_with_components(PowerupComponent)):
-            p_pos = self.world.get_component(powerup_id, PositionComponent)
-            p_dim = self.world.get_component(powerup_id, DimensionsComponent)
-            if not all([p_pos, p_dim]): continue
-            powerup_rect = pygame.Rect(p_pos.x, p_pos.y, p_dim.width, p_dim.height)
-
-            if ball_rect.colliderect(powerup_rect):
-                powerup_data = self.world.get_component(powerup_id, PowerupComponent)
-                if self.last_paddle_hit:
-                    self.world.add_component(self.last_paddle_hit, ActivePowerupComponent(powerup_data.type, 5000))
-                self.world.remove_entity(powerup_id)
+        collected = self._collected
+        collected.clear()
+        for ball_entity, powerup_id in self.broadphase.pairs(COLLIDE_BALL, COLLIDE_POWERUP):
+            # Dos pelotas pueden tocar el mismo poder en el mismo frame: solo cuenta la primera
+            if powerup_id in collected: continue
+            powerup_data = self.world.get_component(powerup_id, PowerupComponent)
+            if not powerup_data: continue
+            ball = self.world.get_component(ball_entity, BallComponent)
+            paddle = ball.last_paddle_hit if ball and ball.last_paddle_hit is not None else self.last_paddle_hit
+            if paddle is not None:
+                self.world.add_component(paddle, ActivePowerupComponent(powerup_data.type, 5000))
+            self.world.remove_entity(powerup_id)
+            self.broadphase.grid.remove(powerup_id)
+            collected.add(powerup_id)
 
 class PowerupEffectSystem:
     """
@@ -104,7 +104,8 @@ class PowerupEffectSystem:
 
     def process(self):
         current_time = pygame.time.get_ticks()
-        for entity in list(self.world.get_entities_with_components(ActivePowerupComponent)):
+        # query() devuelve una tupla: quitar el componente durante el recorrido no la altera
+        for entity in self.world.query(ActivePowerupComponent):
             powerup = self.world.get_component(entity, ActivePowerupComponent)
             if not powerup: continue
             
@@ -11,9 +11,9 @@ Classes:
 import random
 import pygame
 
-from components.effects_components import ParticleComponent
 from components.game_components import BallComponent, ScoreComponent, VelocityComponent
 from components.menu_components import DimensionsComponent, PositionComponent
+from utils.utils import WINNING_SCORE
 
 
 class ScoringSystem:
@@ -27,6 +27,11 @@ class ScoringSystem:
         waiting_to_reset (bool): True if waiting to reset the ball after a score.
         reset_timer (int): Time (ms) to reset the ball.
         ball_to_reset: Entity ID of the ball to reset.
+        gc_policy: Optional GCPolicy; the pause after a goal is used as a safe point to collect.
+        quality: Optional QualityController; scales the number of confetti particles.
+        particle_system: Optional ParticleSystem that emits the confetti bursts.
+        pause_on_score (bool): If True, play stops for a second after each goal; if False
+            (multi-ball mode), the ball that scored is served again right away.
 
     Methods:
         process(): Checks for scoring events and manages ball reset timing.
@@ -34,11 +39,15 @@ class ScoringSystem:
         create_confetti(x, y): Spawns confetti particles at the given position.
         reset_ball(ball_id): Resets ball position and velocity after a score.
     """
-    def __init__(self, world, screen_width, screen_height):
+    def __init__(self, world, screen_width, screen_height, gc_policy=None, quality=None, particle_system=None, pause_on_score=True):
         self.world, self.sw, self.sh = world, screen_width, screen_height
+        self.pause_on_score = pause_on_score
         self.waiting_to_reset = False
         self.reset_timer = 0
         self.ball_to_reset = None
+        self.gc_policy = gc_policy
+        self.quality = quality
+        self.particle_system = particle_system
 
     def process(self):
         """
@@ -50,12 +59,14 @@ class ScoringSystem:
             self.ball_to_reset = None
         
         if not self.waiting_to_reset:
-            for ball_id in self.world.get_entities_with_components(BallComponent, PositionComponent):
+            for ball_id in self.world.query(BallComponent, PositionComponent):
                 b_pos, b_dim = self.world.get_component(ball_id, PositionComponent), self.world.get_component(ball_id, DimensionsComponent)
-                if not all([b_pos, b_dim]): continue
-                # CORRECCIÓN: Usamos 'break' para salir del bucle de la pelota (solo hay una).
-                if b_pos.x <= -b_dim.width: self.handle_score(ball_id, 2); break
-                if b_pos.x >= self.sw: self.handle_score(ball_id, 1); break
+                if b_pos is None or b_dim is None: continue
+                scoring_player = 2 if b_pos.x <= -b_dim.width else 1 if b_pos.x >= self.sw else None
+                if scoring_player is None: continue
+                self.handle_score(ball_id, scoring_player)
+                # Tras un gol con pausa el resto de pelotas espera al saque
+                if self.waiting_to_reset: break
                 
     def handle_score(self, ball_id, scoring_player):
         """
@@ -65,36 +76,41 @@ class ScoringSystem:
             ball_id: Entity ID of the ball.
             scoring_player (int): Player number who scored.
         """
-        for score_entity in self.world.get_entities_with_components(ScoreComponent):
+        for score_entity in self.world.query(ScoreComponent):
             score_comp = self.world.get_component(score_entity, ScoreComponent)
             if score_comp and score_comp.player_number == scoring_player:
                 score_comp.score += 1
+                if score_comp.score >= WINNING_SCORE:
+                    print(f"JUGADOR {scoring_player} GANA!")
+                    # Aquí podrías cambiar a una escena de fin de juego
                 break
         
         b_pos = self.world.get_component(ball_id, PositionComponent)
         b_vel = self.world.get_component(ball_id, VelocityComponent)
         if b_pos: self.create_confetti(b_pos.x, b_pos.y)
+        if not self.pause_on_score:
+            self.reset_ball(ball_id)
+            return
         if b_vel: b_vel.vx, b_vel.vy = 0, 0
         
         self.waiting_to_reset = True
         self.reset_timer = pygame.time.get_ticks() + 1000
         self.ball_to_reset = ball_id
+        # La pelota queda quieta durante un segundo: momento seguro para recolectar
+        if self.gc_policy: self.gc_policy.collect(reason='post_goal')
 
     def create_confetti(self, x, y):
         """
-        Spawns confetti particles at the given position.
+        Emits a burst of confetti particles at the given position. The amount is
+        reduced when the quality controller has lowered the quality level.
 
         Args:
             x (float): X coordinate for confetti spawn.
             y (float): Y coordinate for confetti spawn.
         """
-        for _ in range(30):
-            entity = self.world.create_entity()
-            self.world.add_component(entity, PositionComponent(x, y))
-            velocity = (pygame.math.Vector2(1, 0).rotate(random.uniform(0, 360))) * random.uniform(50, 200)
-            lifetime = random.randint(500, 1500)
-            color = random.choice([(255, 192, 203), (173, 216, 230), (255, 255, 0), (144, 238, 144)])
-            self.world.add_component(entity, ParticleComponent(lifetime, velocity, color))
+        if not self.particle_system: return
+        count = self.quality.scaled(30) if self.quality else 30
+        self.particle_system.emit(x, y, count)
 
     def reset_ball(self, ball_id):
         """
@@ -104,6 +120,6 @@ class ScoringSystem:
             ball_id: Entity ID of the ball to reset.
         """
         b_pos, b_vel = self.world.get_component(ball_id, PositionComponent), self.world.get_component(ball_id, VelocityComponent)
-        if not all([b_pos, b_vel]): return
+        if b_pos is None or b_vel is None: return
         b_pos.x, b_pos.y = self.sw / 2 - 10, self.sh / 2 - 10
         b_vel.vx, b_vel.vy = 300 * random.choice([-1, 1]), 300 * random.choice([-1, 1])
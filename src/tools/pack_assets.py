@@ -0,0 +1,94 @@
+"""
+pack_assets.py
+--------------
+Build step that packs src/assets into the single archive read by the AssetManager.
+
+Usage (from src/):
+    python -m tools.pack_assets             # writes assets/assets.pak
+    python -m tools.pack_assets --compare   # also times startup loading against loose files
+    python -m tools.pack_assets --compare --cold   # cold runs: drops the whole system's page cache
+
+The comparison runs every measurement in a fresh interpreter, with the files in the
+page cache (warm runs). With --cold, and only when run as root on Linux, the page cache
+of the whole machine is dropped before every run so both paths are measured from a cold
+start; that slows down every other process until their files are read again.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.asset_archive import pack_assets
+from utils.utils import ASSETS_DIR, ASSET_ARCHIVE_PATH
+
+# Se ejecuta en un intérprete nuevo: carga el manifiesto de arranque y mide el tiempo
+_LOAD_SNIPPET = """
+import os, sys, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+from engine.asset_manager import AssetManager
+from engine.asset_archive import AssetArchive
+from utils.utils import ASSETS_DIR, ASSET_MANIFEST
+archive = AssetArchive({archive!r}, ASSETS_DIR) if {archive!r} else None
+assets = AssetManager(archive=archive)
+for key, (kind, path, options) in ASSET_MANIFEST.items(): assets.load(key, kind, path, **options)
+print(time.perf_counter() - start)
+"""
+
+def _drop_page_cache():
+    """Drops the OS page cache if allowed; returns True if it was dropped."""
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f: f.write('3\n')
+        return True
+    except OSError:
+        return False
+
+def _time_startup(archive, cold):
+    """Loads the startup manifest in a fresh interpreter and returns the seconds it took."""
+    if cold: _drop_page_cache()
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = _LOAD_SNIPPET.format(src=src, archive=archive)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+def compare(archive_path, runs=5, cold=False):
+    """
+    Prints the median startup loading time from loose files and from the archive.
+
+    Args:
+        archive_path (str): Archive to time.
+        runs (int): Runs per measurement.
+        cold (bool): Drop the system's page cache before every run (needs root).
+    """
+    if cold:
+        cold = _drop_page_cache()
+        if not cold: print("Could not drop the page cache (needs root on Linux); measuring warm runs")
+    print(f"Page cache {'dropped before every run' if cold else 'not dropped (warm runs)'}")
+    for label, archive in (('loose files', None), ('archive', archive_path)):
+        times = sorted(_time_startup(archive, cold) for _ in range(runs))
+        print(f"{label:>12}: median {times[runs // 2] * 1000:.1f} ms (min {times[0] * 1000:.1f}, max {times[-1] * 1000:.1f})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the game assets into a single archive.")
+    parser.add_argument('--output', default=ASSET_ARCHIVE_PATH, help="Archive to write")
+    parser.add_argument('--compare', action='store_true', help="Time startup loading against loose files")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per measurement for --compare")
+    parser.add_argument('--cold', action='store_true', help="With --compare, drop the whole system's page cache before every run (root only)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = pack_assets(ASSETS_DIR, args.output)
+    size = os.path.getsize(args.output)
+    print(f"Packed {len(index)} assets into {args.output} ({size / 1e6:.1f} MB) in {time.perf_counter() - start:.2f} s")
+    if args.compare: compare(args.output, args.runs, args.cold)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+train_ai_policy.py
+------------------
+Offline step that builds the policy table of the 'master' AI (systems.policy_ai).
+
+Usage (from src/):
+    python -m tools.train_ai_policy               # writes assets/ai/policy.npz
+    python -m tools.train_ai_policy --evaluate 60 # also plays the new table against the real systems
+    python -m tools.train_ai_policy --evaluate 60 --evaluate-only
+                                                  # plays the existing table, without retraining
+
+For every cell of the PolicyGrid, random states inside the cell are drawn and each is
+played as a rally against every candidate target: the ball flies to the paddle (with
+its wall bounces), the paddle moves towards the target as the AI's control drives it, and if
+it gets there in time the ball is returned with the game's bounce rules and flies to the
+opponent, who starts from the centre. A rally scores -1000 if the paddle misses, and
+otherwise by how far out of the opponent's reach the return lands. Each cell keeps
+the target with the best mean score. The whole batch (about 500 million rallies) is
+evaluated with NumPy, one paddle position and height cell at a time, in under a minute.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from systems.policy_ai import PolicyGrid
+from utils.utils import AI_DIFFICULTY, AI_POLICY_PATH, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Geometría de la partida (GameScene): pelota de 20 px, palas de 15 px a 50 px del borde
+BALL_SIZE = 20
+PADDLE_WIDTH = 15
+PADDLE_MARGIN = 50
+OPPONENT_HEIGHT = 100
+# Ganancia del control de las palas de la IA: vy = (objetivo - centro) * 8, limitada a su velocidad
+PADDLE_GAIN = 8
+
+# Puntuación de cada peloteo
+MISS_SCORE = -1000
+HIT_SCORE = 100
+REACH_CLIP = 200
+
+def fold(y, span):
+    """Folds an unbounded y back into [0, span], as the ball bouncing off both walls does."""
+    folded = np.mod(y, 2 * span)
+    return np.where(folded > span, 2 * span - folded, folded)
+
+def paddle_after(paddle, target, elapsed, speed):
+    """
+    Where a paddle centre heading for target is after some time with the AI's control:
+    full speed while far, then closing in exponentially within speed / PADDLE_GAIN of it.
+    """
+    gap = np.abs(target - paddle)
+    band = speed / PADDLE_GAIN
+    saturated = np.maximum(0.0, (gap - band) / speed)
+    moved = np.where(elapsed < saturated, speed * elapsed, gap - np.minimum(gap, band) * np.exp(-PADDLE_GAIN * np.maximum(0.0, elapsed - saturated)))
+    return paddle + np.sign(target - paddle) * moved
+
+def _cell_samples(grid, axis, samples, rng, shape):
+    """Random values inside every cell of one dimension, broadcast along the other ball axes."""
+    low, high, cells = grid.ranges[axis]
+    view = [1] * len(shape)
+    view[axis] = cells
+    return low + (np.arange(cells).reshape(view + [1]) + rng.random(tuple(shape) + (samples,))) * (high - low) / cells
+
+def train(grid, samples=24, candidates=31, seed=0, paddle_speed=400, opponent_speed=400, field=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    """
+    Optimizes the target of every cell of the grid by simulated rallies.
+
+    Args:
+        grid (PolicyGrid): Discretization of the table.
+        samples (int): Random states drawn in every cell.
+        candidates (int): Targets tried, evenly spread over the field.
+        seed (int): Seed of the sampling.
+        paddle_speed (int): Speed of the AI paddle.
+        opponent_speed (int): Speed assumed for the opponent's paddle.
+        field (tuple): Width and height of the field.
+
+    Returns:
+        tuple: (int16 table of target y, rallies simulated).
+    """
+    width, height = field
+    rng = np.random.default_rng(seed)
+    n_distance, n_y, n_speed, n_vy, n_paddle, n_height = grid.shape
+    ball_shape = (n_distance, n_y, n_speed, n_vy)
+    span = height - BALL_SIZE
+    # Estados de pelota: (distancia, y, velocidad, vy, muestra)
+    distance = _cell_samples(grid, 0, samples, rng, ball_shape)
+    ball_y = np.clip(_cell_samples(grid, 1, samples, rng, ball_shape), 0, span)
+    speed = np.maximum(_cell_samples(grid, 2, samples, rng, ball_shape), 1.0)
+    ball_vy = _cell_samples(grid, 3, samples, rng, ball_shape)
+    arrival_time = distance / speed
+    arrival = fold(ball_y + ball_vy * arrival_time, span) + BALL_SIZE / 2
+    # Devolución: sale de la cara de esta pala hacia la del rival, 1.1 veces más rápida
+    return_time = (width - 2 * (PADDLE_MARGIN + PADDLE_WIDTH) - BALL_SIZE) / (1.1 * speed)
+    targets = np.linspace(BALL_SIZE / 2, height - BALL_SIZE / 2, candidates)
+    arrival, arrival_time, return_time = arrival[..., None], arrival_time[..., None], return_time[..., None]
+    table = np.empty(grid.shape, dtype=np.int16)
+    for h_index, paddle_height in enumerate(grid.edges('paddle_height') + (grid.ranges[5][1] - grid.ranges[5][0]) / n_height / 2):
+        for p_index in range(n_paddle):
+            low, high, cells = grid.ranges[4]
+            paddle = low + (p_index + rng.random((samples, 1))) * (high - low) / cells
+            final = paddle_after(paddle, targets, arrival_time, paddle_speed)
+            offset = final - arrival
+            hit = np.abs(offset) < paddle_height / 2 + BALL_SIZE / 2
+            # Misma regla que PaddleCollisionSystem.calculate_bounce_vy
+            return_vy = -offset / (paddle_height / 2) * 400
+            landing = fold(arrival - BALL_SIZE / 2 + return_vy * return_time, span) + BALL_SIZE / 2
+            out_of_reach = np.abs(landing - height / 2) - (OPPONENT_HEIGHT + BALL_SIZE) / 2 - opponent_speed * return_time
+            score = np.where(hit, HIT_SCORE + np.clip(out_of_reach, -REACH_CLIP, REACH_CLIP), MISS_SCORE).mean(axis=-2)
+            table[:, :, :, :, p_index, h_index] = targets[np.argmax(score, axis=-1)].round()
+    # Casilla de velocidad 0: pelotas que se alejan o casi paradas, la pala vuelve al centro
+    table[:, :, 0] = height // 2
+    return table, table.size * samples * candidates
+
+def save(path, table, grid, field):
+    """Writes the table, its grid and the field size to a compressed .npz file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, targets=table, ranges=np.array(grid.ranges), field=np.array(field))
+
+def evaluate(path, seconds, opponent='hard', seed=3):
+    """
+    Plays the table against another AI preset with the real game systems, once on each
+    side, and prints the points each one won and its cost per frame.
+
+    Args:
+        path (str): Policy table to play.
+        seconds (int): Length of each match.
+        opponent (str): AI_DIFFICULTY preset of the other paddle.
+        seed (int): Seed of the serves and of the opponent's aim errors.
+    """
+    from engine.ecs_world import ECSWorld
+    from components.menu_components import PositionComponent
+    from components.game_components import VelocityComponent, AIControlledComponent
+    from scenes.game_scene import create_paddle, create_ball
+    from systems.game_systems import AISystem, MovementSystem, BroadphaseSystem, PaddleCollisionSystem, BallMovementSystem, BallBoundarySystem
+    from systems.policy_ai import TabularAISystem
+    from systems.powerup_systems import PowerupCollisionSystem
+    for players in (('master', opponent), (opponent, 'master')):
+        rng = random.Random(seed)
+        world = ECSWorld()
+        # Las mismas entidades que crea GameScene
+        paddles = [create_paddle(world, x, SCREEN_HEIGHT / 2 - 50, AIControlledComponent()) for x in (PADDLE_MARGIN, SCREEN_WIDTH - PADDLE_MARGIN - PADDLE_WIDTH)]
+        ball = create_ball(world, SCREEN_WIDTH / 2 - 10, SCREEN_HEIGHT / 2 - 10, 0, 0)
+        broadphase = BroadphaseSystem(world)
+        ball_movement = BallMovementSystem(world, BallBoundarySystem(world, SCREEN_HEIGHT), PaddleCollisionSystem(world, broadphase, 'classic'))
+        movement, powerups = MovementSystem(world, SCREEN_HEIGHT), PowerupCollisionSystem(world, broadphase)
+        ais = [TabularAISystem(world, SCREEN_HEIGHT, name, screen_width=SCREEN_WIDTH, path=path) if AI_DIFFICULTY[name].get('policy') else AISystem(world, SCREEN_HEIGHT, name, random.Random(seed)) for name in players]
+        velocities = [world.get_component(paddle, VelocityComponent) for paddle in paddles]
+        pos, vel = world.get_component(ball, PositionComponent), world.get_component(ball, VelocityComponent)
+        points, ai_time, frames = [0, 0], [0.0, 0.0], seconds * 60
+        def serve():
+            pos.x, pos.y = SCREEN_WIDTH / 2 - 10, rng.uniform(100, 480)
+            vel.vx, vel.vy = rng.choice([-1, 1]) * rng.uniform(250, 400), rng.uniform(-350, 350)
+        serve()
+        for _ in range(frames):
+            # Cada IA mueve las dos palas; la izquierda se queda con lo que decidió la primera
+            for side, ai in enumerate(ais):
+                start = time.perf_counter()
+                ai.process(1 / 60)
+                ai_time[side] += time.perf_counter() - start
+                if side == 0: left_vy = velocities[0].vy
+            velocities[0].vy = left_vy
+            movement.process(1 / 60)
+            broadphase.process()
+            ball_movement.process(1 / 60, powerups)
+            if pos.x < -BALL_SIZE or pos.x > SCREEN_WIDTH:
+                points[0 if pos.x > SCREEN_WIDTH else 1] += 1
+                serve()
+            # Las pelotas se aceleran en cada golpe: un peloteo eterno se vuelve a sacar
+            elif abs(vel.vx) > 1500: serve()
+        print(f"{players[0]:>7} {points[0]:3d} - {points[1]:<3d} {players[1]:<7} in {seconds} s "
+              f"(AI {ai_time[0] / frames * 1e6:.1f} / {ai_time[1] / frames * 1e6:.1f} us/frame)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the policy table of the 'master' AI by simulated rallies.")
+    parser.add_argument('--output', default=AI_POLICY_PATH, help="Table to write")
+    parser.add_argument('--samples', type=int, default=24, help="Random states per cell")
+    parser.add_argument('--candidates', type=int, default=31, help="Targets tried per state")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the sampling")
+    parser.add_argument('--evaluate', type=int, default=0, metavar='SECONDS', help="Play the table against the real systems")
+    parser.add_argument('--evaluate-only', action='store_true', help="Evaluate the existing --output table without retraining it")
+    args = parser.parse_args()
+    if args.evaluate_only:
+        if not args.evaluate: parser.error("--evaluate-only needs --evaluate SECONDS")
+        # La tabla incluida en el repositorio se juega tal cual, sin sobrescribirla
+        evaluate(args.output, args.evaluate)
+        return
+
+    grid = PolicyGrid()
+    field = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    start = time.perf_counter()
+    table, rallies = train(grid, args.samples, args.candidates, args.seed, AI_DIFFICULTY['master']['speed'], AI_DIFFICULTY['hard']['speed'], field)
+    save(args.output, table, grid, field)
+    size = os.path.getsize(args.output)
+    print(f"Simulated {rallies / 1e6:.0f}M rallies in {time.perf_counter() - start:.1f} s; "
+          f"{table.size} cells written to {args.output} ({size / 1e3:.0f} KB)")
+    if args.evaluate: evaluate(args.output, args.evaluate)
+
+if __name__ == '__main__':
+    main()
@@ -6,10 +6,12 @@ class GameState(Enum):
     Using Enum ensures type safety and readability.
     """
     # Using auto() is a clean way to assign unique values automatically
+    CARGANDO = auto()
     MENU_PRINCIPAL = auto()
     JUGANDO_SINGLE_PLAYER = auto()
     JUGANDO_TWO_PLAYERS = auto()
     JUGANDO_SHRINK_MODE = auto()
+    JUGANDO_MULTI_BALL = auto()
     OPCIONES = auto()
     PAUSA = auto()
     SALIR = auto()
\ No newline at end of file
@@ -4,9 +4,20 @@ utils.py
 Contains global constants, helper functions, and utility code for the game.
 
 Constants:
+    ASSETS_DIR (str): Absolute path of the bundled assets directory.
+    ARCADE_FONT_PATH (str): Path of the bundled ARCADECLASSIC font.
+    IMAGES_DIR (str): Directory of the bundled images.
+    ASSET_ARCHIVE_PATH (str): Packed assets written by tools/pack_assets.py (used if present).
+    AI_POLICY_PATH (str): Policy table written by tools/train_ai_policy.py for the 'master' AI.
+    ASSET_MANIFEST (dict): Assets preloaded by the loading scene, as key -> (kind, path, options).
+
     SCREEN_WIDTH (int): Width of the game window.
     SCREEN_HEIGHT (int): Height of the game window.
     WINNING_SCORE (int): Score required to win the game.
+    TARGET_FPS (int): Frame rate the game loop is limited to.
+    AI_DIFFICULTY (dict): AI presets by name: reaction time (s), aim error (px), paddle speed (px/s)
+        and whether the AI plans with lookahead rollouts (systems.lookahead_ai) or plays
+        from the precomputed policy table (systems.policy_ai).
 
     COLOR_BACKGROUND (tuple): RGB color for the background.
     COLOR_WHITE (tuple): RGB color for white elements.
@@ -27,11 +38,38 @@ Functions:
     clamp(value, min_val, max_val): Clamps a value between a minimum and maximum.
 """
 
+import os
+
+# --- Asset Paths ---
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+ARCADE_FONT_PATH = os.path.join(ASSETS_DIR, 'fonts', 'arcadeclassic', 'ARCADECLASSIC.TTF')
+IMAGES_DIR = os.path.join(ASSETS_DIR, 'images')
+ASSET_ARCHIVE_PATH = os.path.join(ASSETS_DIR, 'assets.pak')
+AI_POLICY_PATH = os.path.join(ASSETS_DIR, 'ai', 'policy.npz')
+
+# Recursos que se cargan al arrancar, detrás de la pantalla de carga
+ASSET_MANIFEST = {
+    'player_1': ('image', os.path.join(IMAGES_DIR, 'player_1.png'), {'alpha': True, 'trim': True}),
+    'player_2': ('image', os.path.join(IMAGES_DIR, 'player_2.png'), {'alpha': True, 'trim': True}),
+    'ball': ('image', os.path.join(IMAGES_DIR, 'player_bullet.png'), {'alpha': True, 'trim': True}),
+    'font_score': ('font', ARCADE_FONT_PATH, {'size': 74}),
+    'font_menu': ('font', None, {'size': 40}),
+}
 
 # --- Dimension and Game Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 WINNING_SCORE = 5
+TARGET_FPS = 60
+
+# Niveles de la IA: cuánto tarda en reaccionar a un cambio de trayectoria, cuánto falla y lo rápida que es
+AI_DIFFICULTY = {
+    'easy': {'reaction': 0.30, 'error': 45, 'speed': 260},
+    'normal': {'reaction': 0.15, 'error': 20, 'speed': 320},
+    'hard': {'reaction': 0.05, 'error': 4, 'speed': 400},
+    'expert': {'reaction': 0.0, 'error': 0, 'speed': 400, 'lookahead': True},
+    'master': {'reaction': 0.0, 'error': 0, 'speed': 400, 'policy': True}
+}
 
 # --- Color Constants ---
 COLOR_BACKGROUND = (21, 33, 44)
@@ -0,0 +1,292 @@
+"""
+golden_harness.py
+-----------------
+Headless golden-frame regression harness.
+
+Each scenario builds a scene at a fixed state with the SDL dummy driver, renders one
+frame off-screen and compares it with a stored golden image in tests/golden/. Frames
+are compared by hash first; when the hashes differ a perceptual diff decides: both
+images are averaged over 4x4 blocks (so antialiasing noise and one-pixel shifts do not
+count) and the frame fails if too many blocks differ visibly. Failing frames are
+written to tests/golden/_failures/ together with a diff image.
+
+Scenarios run in parallel in a process pool; every worker creates one Game and loads
+the startup assets once, then renders the scenarios it is given.
+
+Usage:
+    python tests/golden_harness.py            # compare every scenario
+    python tests/golden_harness.py --update   # (re)write the golden images
+    python tests/golden_harness.py menu pause # only some scenarios
+
+Functions:
+    run_scenarios(names, update, workers) -> list: Renders and checks scenarios in parallel.
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(TESTS_DIR), 'src')
+GOLDEN_DIR = os.path.join(TESTS_DIR, 'golden')
+FAILURES_DIR = os.path.join(GOLDEN_DIR, '_failures')
+
+BLOCK = 4                 # Lado de los bloques promediados en la comparación perceptual
+BLOCK_THRESHOLD = 12      # Diferencia media (0-255) a partir de la cual un bloque cuenta como distinto
+MAX_BAD_RATIO = 0.002     # Fracción de bloques distintos tolerada
+
+SCENARIOS = {}
+_game = None
+
+def scenario(function):
+    """Registers a scenario: a function that receives the Game and leaves a frame on its screen."""
+    SCENARIOS[function.__name__] = function
+    return function
+
+# --- Helpers used by the scenarios (run inside the workers) ---
+
+def _enter(game, state):
+    """Makes a state's scene the only active one, as Game.run does on a state change."""
+    game.game_state_manager.state = game.game_state_manager.previous_state = state
+    game.scene_stack.replace(game.scenes[state])
+    game.current_scene = game.scene_stack.top
+    return game.current_scene
+
+def _draw(game):
+    """Draws the current scene the way one iteration of Game.run does."""
+    from utils.utils import COLOR_BACKGROUND
+    if not game.current_scene.covers_screen: game.screen.fill(COLOR_BACKGROUND)
+    game.current_scene.draw(game.screen)
+
+def _mouse(kind, pos):
+    import pygame
+    if kind == pygame.MOUSEMOTION: return pygame.event.Event(kind, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+    return pygame.event.Event(kind, pos=pos, button=1)
+
+def _click(pos):
+    import pygame
+    return [_mouse(pygame.MOUSEMOTION, pos), _mouse(pygame.MOUSEBUTTONDOWN, pos), _mouse(pygame.MOUSEBUTTONUP, pos)]
+
+def _place_match(game, scene, ball=(300, 250), velocity=(300, -200), scores=(3, 2), paddle_heights=None):
+    """Puts paddles, ball (with its trail) and scores of a game scene at a fixed state."""
+    from components.menu_components import PositionComponent, DimensionsComponent
+    from components.game_components import BallComponent, PaddleComponent, AIControlledComponent, ScoreComponent, VelocityComponent
+    world = game.world
+    paddles = sorted(list(world.get_entities_with_components(PaddleComponent)) + list(world.get_entities_with_components(AIControlledComponent)))
+    for i, (entity, y) in enumerate(zip(paddles, (180, 320))):
+        world.get_component(entity, PositionComponent).y = y
+        if paddle_heights: world.get_component(entity, DimensionsComponent).height = paddle_heights[i]
+    for entity in world.get_entities_with_components(ScoreComponent):
+        score = world.get_component(entity, ScoreComponent)
+        score.score = scores[score.player_number - 1]
+    for entity in world.get_entities_with_components(BallComponent):
+        pos, vel = world.get_component(entity, PositionComponent), world.get_component(entity, VelocityComponent)
+        vel.vx, vel.vy = velocity
+        # Recorrer unos frames hacia la posición final para que la estela sea determinista
+        for step in range(7, -1, -1):
+            pos.x, pos.y = ball[0] - velocity[0] * step / 60, ball[1] - velocity[1] * step / 60
+            scene.trail_system.record()
+
+# --- Scenarios ---
+
+@scenario
+def menu(game):
+    _enter(game, _states().MENU_PRINCIPAL)
+    _draw(game)
+
+@scenario
+def menu_pressed(game):
+    import pygame
+    scene = _enter(game, _states().MENU_PRINCIPAL)
+    scene.handle_events([_mouse(pygame.MOUSEMOTION, (400, 180)), _mouse(pygame.MOUSEBUTTONDOWN, (400, 180))])
+    _draw(game)
+
+@scenario
+def options(game):
+    _enter(game, _states().OPCIONES)
+    _draw(game)
+
+@scenario
+def options_listening(game):
+    scene = _enter(game, _states().OPCIONES)
+    scene.handle_events(_click((400, 320)))
+    _draw(game)
+
+@scenario
+def game_classic(game):
+    scene = _enter(game, _states().JUGANDO_SINGLE_PLAYER)
+    _place_match(game, scene)
+    _draw(game)
+
+@scenario
+def game_shrink(game):
+    scene = _enter(game, _states().JUGANDO_SHRINK_MODE)
+    _place_match(game, scene, ball=(520, 400), velocity=(-450, 120), scores=(0, 4), paddle_heights=(55, 80))
+    _draw(game)
+
+@scenario
+def game_confetti(game):
+    import numpy as np
+    scene = _enter(game, _states().JUGANDO_TWO_PLAYERS)
+    _place_match(game, scene, scores=(1, 1))
+    scene.particle_system._rng = np.random.default_rng(1234)
+    scene.particle_system.emit(400, 300, 400)
+    for _ in range(10): scene.particle_system.update(1 / 30)
+    _draw(game)
+
+@scenario
+def game_multiball(game):
+    from components.menu_components import PositionComponent, DimensionsComponent
+    from components.powerup_components import PowerupComponent, HitFlashComponent
+    from components.game_components import ColliderComponent, COLLIDE_POWERUP, COLLIDE_BALL
+    import random
+    scene = _enter(game, _states().JUGANDO_MULTI_BALL)
+    scene.ai_system.rng = random.Random(7)
+    for x, y in ((300, 150), (460, 380), (380, 260)):
+        powerup = game.world.create_entity()
+        game.world.add_component(powerup, PositionComponent(x, y))
+        game.world.add_component(powerup, DimensionsComponent(30, 30))
+        game.world.add_component(powerup, PowerupComponent('BIG_PADDLE'))
+        game.world.add_component(powerup, ColliderComponent(COLLIDE_POWERUP, COLLIDE_BALL))
+    # Medio segundo de simulación con paso fijo, sin los sistemas que dependen del reloj o del azar
+    for _ in range(40):
+        scene.ai_system.process(1 / 60)
+        scene.movement_system.process(1 / 60)
+        scene.broadphase_system.process()
+        scene.ball_movement_system.process(1 / 60, scene.powerup_collision_system)
+        scene.trail_system.record()
+        scene.powerup_collision_system.process()
+    for entity in list(game.world.get_entities_with_components(HitFlashComponent)): game.world.remove_component(entity, HitFlashComponent)
+    _draw(game)
+
+@scenario
+def pause(game):
+    states = _states()
+    game_classic(game)
+    # Igual que Game.run: la pausa se apila sobre el último frame, oscurecido
+    game.previous_game_state = states.JUGANDO_SINGLE_PLAYER
+    game.game_state_manager.state = states.PAUSA
+    game.scene_stack.push(game.scenes[states.PAUSA], game.screen, overlay=True, dim=180)
+    game.current_scene = game.scene_stack.top
+    _draw(game)
+
+@scenario
+def pause_hover(game):
+    import pygame
+    pause(game)
+    game.current_scene.handle_events([_mouse(pygame.MOUSEMOTION, (400, 335))])
+    _draw(game)
+
+def _states():
+    from utils.game_state import GameState
+    return GameState
+
+# --- Workers ---
+
+def _init_worker():
+    """Creates the worker's Game with the dummy video driver and loads the startup assets."""
+    global _game
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    sys.path.insert(0, SRC_DIR)
+    import contextlib, io
+    with contextlib.redirect_stdout(io.StringIO()):
+        from scenes.game import Game
+        from utils.utils import ASSET_MANIFEST
+        _game = Game()
+        for key, (kind, path, options) in ASSET_MANIFEST.items():
+            _game.assets.load(key, kind, path, **options)
+
+def _block_means(pixels, np):
+    height, width = pixels.shape[0] // BLOCK * BLOCK, pixels.shape[1] // BLOCK * BLOCK
+    blocks = pixels[:height, :width].astype(np.float32).reshape(height // BLOCK, BLOCK, width // BLOCK, BLOCK, 3)
+    return blocks.mean(axis=(1, 3))
+
+def run_scenario(name, update=False):
+    """
+    Renders one scenario and compares it with its golden image (or writes it with update).
+
+    Returns:
+        dict: name, status ('pass', 'fail', 'missing' or 'updated'), hash, bad_ratio and ms.
+    """
+    import contextlib, io
+    import numpy as np
+    import pygame
+    from config.config_manager import ConfigManager
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Cada escenario parte de la configuración por defecto y de una escena limpia
+        _game.config_manager.controls = ConfigManager().controls
+        SCENARIOS[name](_game)
+        frame = _game.screen.copy()
+        _game.scene_stack.replace(_game.scenes[_states().MENU_PRINCIPAL])
+    pixels = pygame.surfarray.array3d(frame).transpose(1, 0, 2)
+    digest = hashlib.sha1(pixels.tobytes()).hexdigest()
+    result = {'name': name, 'hash': digest, 'bad_ratio': 0.0}
+    golden_path = os.path.join(GOLDEN_DIR, f'{name}.png')
+    if update:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        pygame.image.save(frame, golden_path)
+        result['status'] = 'updated'
+    elif not os.path.exists(golden_path):
+        result['status'] = 'missing'
+    else:
+        golden = pygame.surfarray.array3d(pygame.image.load(golden_path)).transpose(1, 0, 2)
+        if golden.shape != pixels.shape:
+            result.update(status='fail', bad_ratio=1.0)
+        elif hashlib.sha1(golden.tobytes()).hexdigest() == digest:
+            result['status'] = 'pass'
+        else:
+            difference = np.abs(_block_means(pixels, np) - _block_means(golden, np)).max(axis=2)
+            result['bad_ratio'] = float((difference > BLOCK_THRESHOLD).mean())
+            result['status'] = 'pass' if result['bad_ratio'] <= MAX_BAD_RATIO else 'fail'
+        if result['status'] == 'fail':
+            os.makedirs(FAILURES_DIR, exist_ok=True)
+            pygame.image.save(frame, os.path.join(FAILURES_DIR, f'{name}.png'))
+            if golden.shape == pixels.shape:
+                diff = np.abs(pixels.astype(np.int16) - golden.astype(np.int16)).astype(np.uint8)
+                pygame.image.save(pygame.surfarray.make_surface((diff * 4).clip(0, 255).astype(np.uint8).transpose(1, 0, 2)), os.path.join(FAILURES_DIR, f'{name}_diff.png'))
+    result['ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+def run_scenarios(names=None, update=False, workers=None):
+    """
+    Renders and checks scenarios in parallel.
+
+    Args:
+        names (list): Scenario names, or None for all of them.
+        update (bool): Write the golden images instead of comparing.
+        workers (int): Worker processes (default: one per CPU, at most one per scenario).
+
+    Returns:
+        list: One result dict per scenario (see run_scenario), in the order requested.
+    """
+    names = list(names or SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown: raise KeyError(f"Unknown scenarios: {', '.join(unknown)}")
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    # 'spawn': cada worker arranca SDL desde cero, sin heredar el estado del proceso padre
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        return list(pool.map(run_scenario, names, [update] * len(names)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-frame regression harness.")
+    parser.add_argument('names', nargs='*', help="Scenarios to run (default: all)")
+    parser.add_argument('--update', action='store_true', help="Write the golden images")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    results = run_scenarios(args.names, args.update, args.workers)
+    for result in results:
+        print(f"{result['status']:>8}  {result['name']:<18} {result['ms']:7.1f} ms  bad={result['bad_ratio']:.4f}  {result['hash'][:12]}")
+    print(f"{len(results)} scenarios in {time.perf_counter() - start:.2f} s")
+    return 0 if all(result['status'] in ('pass', 'updated') for result in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from engine.asset_archive import AssetArchive, pack_assets
+
+class TestAssetArchive(unittest.TestCase):
+    """Packed entries are only used while they match their loose files."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, 'assets')
+        os.makedirs(os.path.join(self.root, 'images'))
+        self.path = os.path.join(self.root, 'images', 'ball.png')
+        with open(self.path, 'wb') as image: image.write(b'empaquetado')
+        self.pak = os.path.join(self.directory.name, 'assets.pak')
+        pack_assets(self.root, self.pak)
+        self.archive = AssetArchive(self.pak, self.root)
+
+    def tearDown(self):
+        self.archive.close()
+        self.directory.cleanup()
+
+    def read(self):
+        reader = self.archive.open(self.path)
+        if reader is None: return None
+        data = reader.read()
+        reader.close()
+        return data
+
+    def test_packed_entry_is_used(self):
+        self.assertEqual(self.read(), b'empaquetado')
+        # Sin archivo suelto la copia empaquetada sigue sirviendo
+        os.remove(self.path)
+        self.assertEqual(self.read(), b'empaquetado')
+
+    def test_edited_asset_is_not_shadowed(self):
+        packed_at = os.stat(self.path).st_mtime_ns
+        with open(self.path, 'wb') as image: image.write(b'editado')
+        os.utime(self.path, ns=(packed_at + 10**9, packed_at + 10**9))
+        self.assertIsNone(self.read())
+        self.assertEqual(self.archive.stale, {'images/ball.png'})
+        # Mismo tamaño pero más reciente: también se usa el archivo suelto
+        with open(self.path, 'wb') as image: image.write(b'EMPAQUETADO')
+        os.utime(self.path, ns=(packed_at + 2 * 10**9, packed_at + 2 * 10**9))
+        self.assertIsNone(self.read())
+
+if __name__ == '__main__':
+    unittest.main()
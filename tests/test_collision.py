@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from engine.collision import sweep_aabb
+from engine.ecs_world import ECSWorld
+from components.menu_components import PositionComponent
+from components.game_components import VelocityComponent
+from scenes.game_scene import create_paddle, create_ball
+from systems.game_systems import BroadphaseSystem, PaddleCollisionSystem, BallMovementSystem, BallBoundarySystem
+from systems.powerup_systems import PowerupCollisionSystem
+
+PADDLE = (50, 200, 15, 100)
+
+class TestSweepAABB(unittest.TestCase):
+    """Entry time and contact normal of a box moving against a static one."""
+
+    def test_face_hit(self):
+        # Caja de 20 px a 35 px de la cara derecha de la pala, moviéndose 70 px hacia ella
+        toi, nx, ny = sweep_aabb((100, 240, 20, 20), -70, 0, PADDLE)
+        self.assertAlmostEqual(toi, 0.5)
+        self.assertEqual((nx, ny), (1, 0))
+
+    def test_top_and_bottom_ends(self):
+        toi, nx, ny = sweep_aabb((50, 160, 20, 20), 0, 40, PADDLE)
+        self.assertAlmostEqual(toi, 0.5)
+        self.assertEqual((nx, ny), (0, -1))
+        toi, nx, ny = sweep_aabb((50, 320, 20, 20), 0, -40, PADDLE)
+        self.assertAlmostEqual(toi, 0.5)
+        self.assertEqual((nx, ny), (0, 1))
+
+    def test_starting_overlapped(self):
+        # Solapada por la derecha: sale por el lado más cercano con toi 0
+        toi, nx, ny = sweep_aabb((60, 240, 20, 20), -10, 0, PADDLE)
+        self.assertEqual(toi, 0.0)
+        self.assertEqual((nx, ny), (1, 0))
+
+    def test_moving_away_or_missing(self):
+        self.assertIsNone(sweep_aabb((100, 240, 20, 20), 70, 0, PADDLE))
+        self.assertIsNone(sweep_aabb((100, 240, 20, 20), -30, 0, PADDLE))
+        self.assertIsNone(sweep_aabb((100, 20, 20, 20), -70, 0, PADDLE))
+        # Tocar solo el borde no es colisión
+        self.assertIsNone(sweep_aabb((100, 240, 20, 20), -35, 0, PADDLE))
+
+class TestBallMovement(unittest.TestCase):
+    """Swept ball movement gives the same rally at any step length and never tunnels."""
+
+    def make_world(self, ball, velocity):
+        world = ECSWorld()
+        create_paddle(world, PADDLE[0], PADDLE[1])
+        create_paddle(world, 735, 200)
+        entity = create_ball(world, *ball, *velocity)
+        broadphase = BroadphaseSystem(world)
+        movement = BallMovementSystem(world, BallBoundarySystem(world, 600), PaddleCollisionSystem(world, broadphase))
+        powerups = PowerupCollisionSystem(world, broadphase)
+        def step(dt):
+            broadphase.process()
+            movement.process(dt, powerups)
+        return step, world.get_component(entity, PositionComponent), world.get_component(entity, VelocityComponent)
+
+    def rally(self, dt, seconds=2.0):
+        # Rebota en la pared de arriba, golpea la pala izquierda y vuelve hacia la derecha
+        step, pos, vel = self.make_world((390, 20), (-400, -300))
+        for _ in range(round(seconds / dt)): step(dt)
+        return pos.x, pos.y, vel.vx, vel.vy
+
+    def test_rally_is_the_same_at_any_step(self):
+        reference = self.rally(1 / 480)
+        self.assertGreater(reference[2], 0, "the reference rally should include a paddle hit")
+        for dt in (1 / 60, 0.25, 0.5, 2.0):
+            with self.subTest(dt=dt):
+                for value, expected in zip(self.rally(dt), reference):
+                    self.assertAlmostEqual(value, expected, places=6)
+
+    def test_fast_ball_does_not_tunnel_through_a_paddle(self):
+        # 100 px por frame a 60 FPS: más que el ancho de la pala y de la pelota juntos
+        step, pos, vel = self.make_world((120, 240), (-6000, 0))
+        step(1 / 60)
+        self.assertGreater(vel.vx, 0)
+        self.assertGreaterEqual(pos.x, PADDLE[0] + PADDLE[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# CPython guarda floats y marcos liberados en listas libres propias: unos pocos bloques
+# pueden aparecer como reservados sin que el frame conserve ningún objeto nuevo
+FREE_LIST_TOLERANCE = 16
+
+class TestFrameAllocations(unittest.TestCase):
+    """Plays a steady classic rally between two AI paddles and checks the frame path does not grow the heap."""
+
+    @classmethod
+    def setUpClass(cls):
+        from scenes.game import Game
+        from utils.game_state import GameState
+        from utils.utils import ASSET_MANIFEST
+        from components.game_components import PaddleComponent, AIControlledComponent
+        cls.game = game = Game()
+        for key, (kind, path, options) in ASSET_MANIFEST.items(): game.assets.load(key, kind, path, **options)
+        state = GameState.JUGANDO_SINGLE_PLAYER
+        game.game_state_manager.state = game.game_state_manager.previous_state = state
+        game.scene_stack.replace(game.scenes[state])
+        cls.scene = scene = game.current_scene = game.scene_stack.top
+        # Dos palas de la IA con errores reproducibles y sin powerups: solo el peloteo
+        for entity in list(game.world.get_entities_with_components(PaddleComponent)):
+            game.world.remove_component(entity, PaddleComponent)
+            game.world.add_component(entity, AIControlledComponent())
+        scene.ai_system.rng = random.Random(1)
+        scene.powerup_spawning_system.spawn_interval = float('inf')
+        random.seed(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Sin pygame.quit(): las fuentes de engine.text_cache quedarían inválidas para las pruebas siguientes
+        cls.scene.ai_system.shutdown()
+
+    def frame(self):
+        self.scene.handle_events([])
+        self.scene.update(1 / 60)
+        self.game.screen.fill((0, 0, 0))
+        self.scene.draw(self.game.screen)
+
+    def test_steady_rally_does_not_grow_the_heap(self):
+        from engine.alloc_counter import AllocationCounter
+        # Calentamiento: cachés de sprites, consultas del mundo y buffers de los sistemas
+        for _ in range(300): self.frame()
+        counter = AllocationCounter()
+        for _ in range(600):
+            counter.begin_frame()
+            self.frame()
+            counter.end_frame()
+        self.assertEqual(counter.frames, 600)
+        counter.assert_no_growth(FREE_LIST_TOLERANCE)
+
+if __name__ == '__main__':
+    unittest.main()
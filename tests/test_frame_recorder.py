@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import pygame
+from engine.frame_recorder import FrameRecorder
+
+class FailingFile:
+    """Stands in for frames.rgb on a full disk."""
+    def __init__(self): self.closed = False
+    def write(self, data): raise OSError(28, 'No space left on device')
+    def close(self): self.closed = True
+
+class TestFrameRecorder(unittest.TestCase):
+    """Buffers always return to the pool and stop() always finishes the recording."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_raw_recording_writes_frames_and_metadata(self):
+        recorder = FrameRecorder(self.directory.name, (32, 32), 'raw', max_queue=2)
+        surface = pygame.Surface((32, 32), depth=32)
+        for _ in range(3):
+            recorder.capture(surface)
+        recorder.stop()
+        with open(os.path.join(self.directory.name, 'frames.json')) as metadata: info = json.load(metadata)
+        self.assertEqual(info['frames'] + info['dropped'], 3)
+        self.assertEqual(os.path.getsize(os.path.join(self.directory.name, 'frames.rgb')), info['frames'] * 32 * 32 * 3)
+
+    def test_wrong_size_keeps_the_buffer_in_the_pool(self):
+        recorder = FrameRecorder(self.directory.name, (32, 32), 'raw', max_queue=1)
+        with self.assertRaises(ValueError): recorder.capture(pygame.Surface((64, 48), depth=32))
+        self.assertTrue(recorder.capture(pygame.Surface((32, 32), depth=32)))
+        recorder.stop()
+
+    def test_encoder_error_is_recorded_and_stop_finishes(self):
+        recorder = FrameRecorder(self.directory.name, (32, 32), 'raw', max_queue=2)
+        recorder._raw.close()
+        failing = recorder._raw = FailingFile()
+        surface = pygame.Surface((32, 32), depth=32)
+        recorder.capture(surface)
+        recorder.stop()
+        self.assertIsInstance(recorder.error, OSError)
+        self.assertTrue(failing.closed)
+        with open(os.path.join(self.directory.name, 'frames.json')) as metadata: info = json.load(metadata)
+        self.assertEqual(info['frames'], 0)
+        self.assertIn('error', info)
+        self.assertIn('error', recorder.stats())
+        # Tras el error los frames se descartan sin bloquear
+        self.assertFalse(recorder.capture(surface))
+
+    def test_every_frame_is_written_or_counted_as_dropped(self):
+        # Tras el error los dos hilos descartan frames a la vez: no se debe perder ninguno en la cuenta
+        recorder = FrameRecorder(self.directory.name, (32, 32), 'raw', max_queue=4)
+        recorder._raw.close()
+        recorder._raw = FailingFile()
+        surface = pygame.Surface((32, 32), depth=32)
+        for _ in range(500):
+            recorder.capture(surface)
+        recorder.stop()
+        with open(os.path.join(self.directory.name, 'frames.json')) as metadata: info = json.load(metadata)
+        self.assertEqual(info['frames'] + info['dropped'], 500)
+        self.assertEqual(recorder.stats()['dropped'], info['dropped'])
+
+if __name__ == '__main__':
+    unittest.main()
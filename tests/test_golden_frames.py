@@ -0,0 +1,23 @@
+import unittest
+import golden_harness
+
+class TestGoldenFrames(unittest.TestCase):
+    """Renders every golden scenario headless (in parallel) and compares it with tests/golden/."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = {result['name']: result for result in golden_harness.run_scenarios()}
+
+    def test_scenarios_match_golden_frames(self):
+        for name, result in self.results.items():
+            with self.subTest(scenario=name):
+                self.assertNotEqual(result['status'], 'missing', f"No golden image for {name}; run golden_harness.py --update")
+                self.assertEqual(result['status'], 'pass', f"{name} differs from its golden image (see tests/golden/_failures/)")
+
+    def test_scenarios_do_not_leak_state(self):
+        # En un mismo worker, repetir un escenario después de otros debe dar los mismos píxeles
+        first, _, again = golden_harness.run_scenarios(['game_confetti', 'game_multiball', 'game_confetti'], workers=1)
+        self.assertEqual(first['hash'], again['hash'])
+
+if __name__ == '__main__':
+    unittest.main()
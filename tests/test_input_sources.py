@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import pygame
+from config.config_manager import ConfigManager
+from engine.ecs_world import ECSWorld
+from engine.input_sources import InputSnapshot, KeyboardInputSource, ReplayInputSource
+from components.game_components import PaddleComponent, VelocityComponent
+from systems.game_systems import PlayerInputSystem
+
+def key(kind, code):
+    return pygame.event.Event(kind, key=code, scancode=0, mod=0, unicode='')
+
+class TestInputSources(unittest.TestCase):
+    """Keyboard bindings compiled by ConfigManager and the per-frame input snapshot."""
+
+    def setUp(self):
+        self.config = ConfigManager()
+        self.world = ECSWorld()
+        self.paddles = {}
+        for player in (1, 2):
+            entity = self.world.create_entity()
+            self.world.add_component(entity, PaddleComponent(player))
+            self.world.add_component(entity, VelocityComponent(0, 0))
+            self.paddles[player] = self.world.get_component(entity, VelocityComponent)
+
+    def test_key_map_follows_set_key(self):
+        self.assertEqual(self.config.key_map[pygame.K_w], ((1, 'up'),))
+        self.assertEqual(self.config.key_map[pygame.K_DOWN], ((2, 'down'),))
+        self.config.set_key('player1', 'up', pygame.K_z)
+        self.assertEqual(self.config.key_map[pygame.K_z], ((1, 'up'),))
+        self.assertNotIn(pygame.K_w, self.config.key_map)
+
+    def test_key_bound_to_two_actions_drives_both(self):
+        self.config.set_key('player2', 'up', pygame.K_w)
+        self.assertEqual(set(self.config.key_map[pygame.K_w]), {(1, 'up'), (2, 'up')})
+        system = PlayerInputSystem(self.world, self.config, [KeyboardInputSource(self.config)])
+        system.process([key(pygame.KEYDOWN, pygame.K_w)])
+        self.assertEqual((self.paddles[1].vy, self.paddles[2].vy), (-400, -400))
+        system.process([key(pygame.KEYUP, pygame.K_w)])
+        self.assertEqual((self.paddles[1].vy, self.paddles[2].vy), (0, 0))
+
+    def test_paddles_follow_key_events(self):
+        system = PlayerInputSystem(self.world, self.config, [KeyboardInputSource(self.config)])
+        system.process([key(pygame.KEYDOWN, pygame.K_s), key(pygame.KEYDOWN, pygame.K_UP)])
+        self.assertEqual((self.paddles[1].vy, self.paddles[2].vy), (400, -400))
+        # Sin eventos nuevos las teclas siguen pulsadas
+        system.process([])
+        self.assertEqual((self.paddles[1].vy, self.paddles[2].vy), (400, -400))
+        # Con las dos teclas pulsadas gana 'up', como con los controles originales
+        system.process([key(pygame.KEYDOWN, pygame.K_w), key(pygame.KEYUP, pygame.K_UP)])
+        self.assertEqual((self.paddles[1].vy, self.paddles[2].vy), (-400, 0))
+        system.process([key(pygame.KEYUP, pygame.K_w), key(pygame.KEYUP, pygame.K_s)])
+        self.assertEqual(self.paddles[1].vy, 0)
+
+    def test_replay_drives_paddles_like_the_keyboard(self):
+        keyboard = PlayerInputSystem(self.world, self.config, [KeyboardInputSource(self.config)])
+        frames = [[key(pygame.KEYDOWN, pygame.K_w)], [], [key(pygame.KEYUP, pygame.K_w), key(pygame.KEYDOWN, pygame.K_DOWN)], []]
+        recording, played = [], []
+        for events in frames:
+            keyboard.process(events)
+            recording.append(tuple(keyboard.snapshot.axes))
+            played.append((self.paddles[1].vy, self.paddles[2].vy))
+        replay = PlayerInputSystem(self.world, self.config, [ReplayInputSource(recording)])
+        for expected in played:
+            replay.process([])
+            self.assertEqual((self.paddles[1].vy, self.paddles[2].vy), expected)
+        self.assertTrue(replay.sources[0].finished())
+
+    def test_snapshot_clamps_combined_sources(self):
+        snapshot = InputSnapshot()
+        snapshot.begin_frame()
+        snapshot.push(1, 1.0)
+        snapshot.push(1, 0.5)
+        snapshot.push(3, 1.0)
+        self.assertEqual(snapshot.axis(1), 1.0)
+        self.assertEqual(snapshot.axis(3), 0.0)
+        snapshot.begin_frame()
+        self.assertEqual(snapshot.axis(1), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
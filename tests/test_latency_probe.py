@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import pygame
+from engine.latency_probe import InputLatencyProbe
+
+class TestInputLatencyProbe(unittest.TestCase):
+    """Input events are timed to the next flip; other events are ignored."""
+
+    def test_events_are_timed_to_the_next_flip(self):
+        probe = InputLatencyProbe(max_samples=8)
+        probe.sample([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_w), pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0))])
+        time.sleep(0.01)
+        probe.presented()
+        # Un flip sin entradas nuevas no añade muestras
+        probe.sample([])
+        probe.presented()
+        stats = probe.stats()
+        self.assertEqual(stats['events'], 1)
+        self.assertGreaterEqual(stats['p50_ms'], 10)
+        self.assertGreaterEqual(stats['read_p50_ms'], 10)
+
+    def test_percentiles_are_ordered(self):
+        probe = InputLatencyProbe(max_samples=64)
+        for _ in range(20):
+            probe.sample([pygame.event.Event(pygame.KEYUP, key=pygame.K_s)])
+            probe.presented()
+        stats = probe.stats()
+        self.assertEqual(stats['events'], 20)
+        self.assertLessEqual(stats['p50_ms'], stats['p90_ms'])
+        self.assertLessEqual(stats['p90_ms'], stats['p99_ms'])
+        self.assertLessEqual(stats['p99_ms'], stats['max_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
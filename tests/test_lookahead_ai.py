@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from engine.ecs_world import ECSWorld
+from components.menu_components import PositionComponent, DimensionsComponent
+from components.game_components import *
+from systems.lookahead_ai import RolloutPlanner, LookaheadAISystem, FORK_COPIED, FORK_SHARED, CANDIDATE_OFFSETS
+from scenes.game_scene import create_paddle, create_ball
+
+def make_match():
+    """World with the human paddle, the AI paddle and a ball heading for the AI."""
+    world = ECSWorld()
+    create_paddle(world, 50, 250, PaddleComponent(1))
+    ai = create_paddle(world, 735, 250, PaddleComponent(2), AIControlledComponent())
+    ball = create_ball(world, 390, 290, 400, 120)
+    return world, ai, ball
+
+class TestWorldFork(unittest.TestCase):
+    """ECSWorld.fork gives the rollouts a world whose changes never reach the original."""
+
+    def test_fork_does_not_write_back(self):
+        world, ai, ball = make_match()
+        fork = world.fork(FORK_COPIED, FORK_SHARED)
+        original = {(entity, cls): dict(vars(world.get_component(entity, cls))) for entity in (ai, ball) for cls in (PositionComponent, VelocityComponent, DimensionsComponent)}
+        for entity in (ai, ball):
+            for cls in (PositionComponent, VelocityComponent, DimensionsComponent):
+                self.assertIsNot(fork.get_component(entity, cls), world.get_component(entity, cls))
+        fork.get_component(ball, PositionComponent).x = -100
+        fork.get_component(ball, VelocityComponent).vx *= -1.1
+        fork.get_component(ai, DimensionsComponent).height = 40
+        fork.get_component(ball, BallComponent).last_paddle_hit = ai
+        fork.remove_component(ball, VelocityComponent)
+        extra = fork.create_entity()
+        fork.add_component(extra, BallComponent())
+        for (entity, cls), values in original.items():
+            self.assertEqual(vars(world.get_component(entity, cls)), values)
+        self.assertIsNone(world.get_component(ball, BallComponent).last_paddle_hit)
+        self.assertEqual(set(world.get_entities_with_components(BallComponent)), {ball})
+        self.assertNotIn(extra, (ai, ball))
+        # Las columnas de solo lectura son las mismas instancias
+        self.assertIs(fork.get_component(ai, PaddleComponent), world.get_component(ai, PaddleComponent))
+
+class TestRolloutPlanner(unittest.TestCase):
+    """RolloutPlanner.make_plan stays within its simulation budget."""
+
+    def make_planner(self, budget):
+        planner = RolloutPlanner(800, 600, 'classic', 400, budget=budget)
+        durations = []
+        rollout = planner.rollout
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return rollout(*args)
+            finally:
+                durations.append(time.perf_counter() - start)
+        planner.rollout = timed
+        return planner, durations
+
+    def test_zero_budget_scores_only_the_intercept(self):
+        world, ai, ball = make_match()
+        planner, durations = self.make_planner(0.0)
+        plan, signature, rollouts = planner.make_plan(world.fork(FORK_COPIED, FORK_SHARED), [(ai, 300.0)], 'firma')
+        self.assertEqual((plan, signature, rollouts), ({ai: 300.0}, 'firma', 1))
+
+    def test_plan_stays_within_budget(self):
+        world, ai, ball = make_match()
+        snapshot = world.fork(FORK_COPIED, FORK_SHARED)
+        budget = 0.004
+        planner, durations = self.make_planner(budget)
+        start = time.perf_counter()
+        plan, signature, rollouts = planner.make_plan(snapshot, [(ai, 300.0)], None)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(rollouts, len(durations))
+        self.assertLessEqual(rollouts, len(CANDIDATE_OFFSETS))
+        # El plazo se comprueba antes de cada simulación: solo la última puede pasarse de él
+        self.assertLessEqual(elapsed, budget + max(durations) + 0.002)
+        self.assertIn(ai, plan)
+
+    def test_candidates_go_from_coarse_to_fine(self):
+        self.assertEqual(len(set(CANDIDATE_OFFSETS)), len(CANDIDATE_OFFSETS))
+        self.assertEqual(CANDIDATE_OFFSETS[:3], (0.0, -0.95, 0.95))
+        # Con todo el tiempo del mundo se prueban todos
+        world, ai, ball = make_match()
+        planner = RolloutPlanner(800, 600, 'classic', 400, budget=60.0)
+        self.assertEqual(planner.make_plan(world.fork(FORK_COPIED, FORK_SHARED), [(ai, 300.0)], None)[2], len(CANDIDATE_OFFSETS))
+
+class TestLookaheadAISystem(unittest.TestCase):
+    """The worker process answers plan requests, and plans only apply to the velocities they were made for."""
+
+    def test_worker_plans_and_shuts_down(self):
+        world, ai, ball = make_match()
+        # Sin replanificación periódica: solo un cambio de velocidad invalida el plan
+        system = LookaheadAISystem(world, 600, screen_width=800, replan_interval=float('inf'))
+        self.addCleanup(system.shutdown)
+        deadline = time.perf_counter() + 60
+        while not system.plans and time.perf_counter() < deadline:
+            system.process(1 / 60)
+            time.sleep(0.005)
+        self.assertGreater(system.plans, 0)
+        self.assertGreater(system.rollouts, 0)
+        pos, dim, vel = world.get_component(ai, PositionComponent), world.get_component(ai, DimensionsComponent), world.get_component(ai, VelocityComponent)
+        # Mientras las pelotas conservan la velocidad del plan, la pala sigue el objetivo planificado
+        system._plan[ai] = 100.0
+        system.process(1 / 60)
+        self.assertEqual(system._targets[ai], 100.0)
+        self.assertEqual(vel.vy, -system.paddle_speed)
+        # Con otra velocidad el plan ya no vale y la pala vuelve a la intercepción analítica
+        world.get_component(ball, VelocityComponent).vy = -120
+        system.process(1 / 60)
+        self.assertNotEqual(system._targets[ai], 100.0)
+        hit = system.intercept(world.get_component(ball, PositionComponent), world.get_component(ball, VelocityComponent), world.get_component(ball, DimensionsComponent), pos, dim)
+        self.assertAlmostEqual(system._targets[ai], hit[1])
+        system.shutdown()
+        self.assertFalse(system._worker.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
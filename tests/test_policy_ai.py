@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import contextlib
+import io
+import unittest
+from unittest import mock
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from config.config_manager import ConfigManager
+from engine.ecs_world import ECSWorld
+from systems.game_systems import AISystem
+from systems.policy_ai import TabularAISystem, PolicyGrid
+from utils.utils import SCREEN_WIDTH, SCREEN_HEIGHT, AI_POLICY_PATH
+
+class TestPolicyTable(unittest.TestCase):
+    """The policy table shipped in assets/ai matches the grid and field of the game."""
+
+    def test_shipped_table_loads(self):
+        system = TabularAISystem(ECSWorld(), SCREEN_HEIGHT, screen_width=SCREEN_WIDTH)
+        self.assertEqual(system.table.shape, PolicyGrid().shape)
+        self.assertEqual(system.grid.shape, PolicyGrid().shape)
+        with np.load(AI_POLICY_PATH) as data:
+            self.assertEqual(tuple(int(size) for size in data['field']), (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def test_table_for_another_field_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TabularAISystem(ECSWorld(), SCREEN_HEIGHT, screen_width=SCREEN_WIDTH + 100, path=AI_POLICY_PATH)
+
+class TestGameSceneAI(unittest.TestCase):
+    """A match against the 'master' AI starts at any internal resolution."""
+
+    def test_other_resolution_falls_back_to_the_predictive_ai(self):
+        from scenes.game import Game
+        from utils.game_state import GameState
+        config = ConfigManager()
+        config.graphics['internal_resolution'] = (1024, 768)
+        config.ai['difficulty'] = 'master'
+        output = io.StringIO()
+        with mock.patch('scenes.game.ConfigManager', return_value=config), contextlib.redirect_stdout(output):
+            game = Game()
+            self.addCleanup(game.assets.shutdown)
+            # Como LoadingScene: la partida empieza con los recursos de arranque ya cargados
+            while game.assets.poll() < 1.0: time.sleep(0.01)
+            scene = game.scenes[GameState.JUGANDO_SINGLE_PLAYER]
+            scene.setup()
+            self.addCleanup(scene.cleanup)
+        self.assertEqual((game.screen_width, game.screen_height), (1024, 768))
+        self.assertIs(type(scene.ai_system), AISystem)
+        self.assertIn('IA predictiva', output.getvalue())
+        scene.ai_system.process(1 / 60)
+
+if __name__ == '__main__':
+    unittest.main()